@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Compare the gh CLI and REST API GitHub backends on a create + update round trip.
+
+Both run offline: the gh backend against the gh stand-in from tests/stubs, the API
+backend against the in-process fake from tests/fake_github_api.py. `--latency` adds
+a per-request server delay to the API fake to approximate a real network.
+
+Usage: python benchmarks/bench_github_api.py [--features 20] [--latency 0.0]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tests.fake_github_api import FakeGitHubAPI
+from utils import github_issue_manager_py
+from utils.issue_manager_py import get_issue_manager
+from utils.repo_context_py import RepoContext
+
+ROOT = Path(__file__).parent.parent
+
+
+async def round_trips(manager, specs: Path, features: int) -> None:
+    """Create features one by one and comment on each, like a scripted session."""
+    for index in range(features):
+        slug = f"feature-{index}"
+        feature_id = await manager.create_issue(slug, f"Feature {index}", specs, ["bench"], "Body")
+        folder = f"{feature_id:05d}-{slug}"
+        await manager.update_issue(feature_id, folder, specs / folder, ["reviewed"], "Update")
+
+
+def run(manager_type: str, features: int, tmp: Path) -> float:
+    github_issue_manager_py._label_caches.clear()
+    specs = tmp / manager_type / "specs"
+    context = RepoContext(root=tmp, config={"user.name": "Bench", "user.email": "b@example.com"})
+    manager = get_issue_manager(manager_type, context)
+    start = time.perf_counter()
+    with contextlib.redirect_stderr(io.StringIO()):
+        asyncio.run(round_trips(manager, specs, features))
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--features", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0, help="API fake delay per request (s)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="cwai-bench-gh-") as tmp_name:
+        tmp = Path(tmp_name)
+        os.environ["CWAI_CACHE_DIR"] = str(tmp / "cache")
+        os.environ["CWAI_LABEL_CACHE_TTL"] = "0"
+        os.environ["FAKE_GH_STATE"] = str(tmp / "gh-state")
+        os.environ["PATH"] = f"{ROOT / 'tests' / 'stubs'}{os.pathsep}{os.environ['PATH']}"
+
+        gh_seconds = run("github", args.features, tmp)
+
+        server = FakeGitHubAPI(latency=args.latency).start()
+        os.environ.update(CWAI_GITHUB_API_URL=server.url, GH_TOKEN="bench", GH_REPO="bench/repo")
+        try:
+            api_seconds = run("github-api", args.features, tmp)
+        finally:
+            server.stop()
+
+    def per_feature(seconds: float) -> float:
+        return seconds / args.features * 1000
+
+    print(f"{'backend':<12} {'total s':>9} {'ms/feature':>11}")
+    print(f"{'github':<12} {gh_seconds:>9.3f} {per_feature(gh_seconds):>11.1f}")
+    print(f"{'github-api':<12} {api_seconds:>9.3f} {per_feature(api_seconds):>11.1f}")
+    print(f"API requests: {len(server.calls)}, TCP connections: {server.connections}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Benchmark feature ID allocation against specs folders of growing size.
+
+Usage: python benchmarks/bench_id_allocator.py [--sizes 10,1000,10000,100000] [--rounds 200]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils.helpers_py import padd_feature_id
+from utils.id_allocator_py import FeatureIdAllocator
+
+
+def populate(specs_dir: Path, count: int) -> None:
+    """Create count empty feature folders."""
+    specs_dir.mkdir(parents=True, exist_ok=True)
+    for feature_id in range(1, count + 1):
+        (specs_dir / f"{padd_feature_id(feature_id)}-feature").mkdir()
+
+
+def run(size: int, rounds: int) -> dict:
+    """Measure the first allocation (a full scan) and the steady-state allocation cost."""
+    with tempfile.TemporaryDirectory(prefix="cwai-bench-ids-") as tmp:
+        specs_dir = Path(tmp) / "specs"
+        populate(specs_dir, size)
+
+        allocator = FeatureIdAllocator(specs_dir)
+        start = time.perf_counter()
+        first_id = allocator.allocate()
+        scan = time.perf_counter() - start
+        assert first_id == size + 1
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            allocator.allocate()
+        per_call = (time.perf_counter() - start) / rounds
+
+    return {"size": size, "scan_ms": scan * 1000, "allocate_us": per_call * 1e6}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10,1000,10000,100000")
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'features':>10} {'first scan (ms)':>16} {'allocate (us)':>15}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        row = run(size, args.rounds)
+        print(f"{row['size']:>10} {row['scan_ms']:>16.2f} {row['allocate_us']:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
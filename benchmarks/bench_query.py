@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Benchmark the issue index: initial build, no-op refresh and label/date queries.
+
+Usage: python benchmarks/bench_query.py [--size 100000] [--rounds 50]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils.helpers_py import padd_feature_id
+from utils.issue_index_py import IssueIndex
+
+LABELS = ["ui", "backend", "auth", "docs", "bug", "perf", "infra", "api"]
+
+
+def populate(specs_dir: Path, count: int) -> None:
+    """Create count features spread over a year with two labels each."""
+    specs_dir.mkdir(parents=True, exist_ok=True)
+    for feature_id in range(1, count + 1):
+        folder = specs_dir / f"{padd_feature_id(feature_id)}-feature"
+        folder.mkdir()
+        day = 1 + feature_id % 365
+        stamp = f"2024-{1 + day // 31 % 12:02d}-{1 + day % 28:02d}T12:00:00Z"
+        issue = {
+            "author": "Bench <bench@example.com>",
+            "id": feature_id,
+            "title": f"Feature {feature_id}",
+            "description": "",
+            "labels": [LABELS[feature_id % 8], LABELS[feature_id * 7 % 8]],
+            "created_at": stamp,
+            "updated_at": stamp,
+            "comments": [],
+        }
+        (folder / "issue.json").write_text(json.dumps(issue))
+
+
+def timed(fn, rounds: int) -> float:
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="cwai-bench-query-") as tmp:
+        specs_dir = Path(tmp) / "specs"
+        populate(specs_dir, args.size)
+
+        index = IssueIndex(specs_dir)
+        start = time.perf_counter()
+        index.refresh()
+        build = (time.perf_counter() - start) * 1000
+
+        print(f"features: {args.size}")
+        print(f"initial build:        {build:9.1f} ms")
+        print(f"mtime check:          {timed(index.refresh, 5):9.1f} ms")
+        print(f"full re-read:         {timed(lambda: index.refresh(full=True), 3):9.1f} ms")
+        queries = [
+            ("label, limit 50:", lambda: index.query(["auth"], limit=50)),
+            (
+                "label + week:",
+                lambda: index.query(["auth"], since="2024-03-01", until="2024-03-08"),
+            ),
+            ("two labels, limit 50:", lambda: index.query(["auth", "ui"], limit=50)),
+        ]
+        for name, query in queries:
+            print(f"{name:<21} {timed(query, args.rounds):9.3f} ms")
+        index.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Benchmark the full-text search index on a synthetic corpus.
+
+Builds features with a few markdown documents each plus their issues, then times the
+initial build, a no-change refresh, an incremental refresh and top-k queries.
+
+Usage: python benchmarks/bench_search.py [--docs 50000] [--rounds 20]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils.helpers_py import padd_feature_id
+from utils.search_index_py import SearchIndex
+
+DOCS_PER_FEATURE = 4  # three markdown files plus the issue
+WORDS = [f"word{i}" for i in range(20000)] + (
+    "authentication login password database migration cache latency dashboard export "
+    "billing invoice payment search index queue"
+).split()
+
+
+def populate(specs_dir: Path, docs: int, rng: random.Random) -> None:
+    """Create docs / DOCS_PER_FEATURE features with Zipf-ish word frequencies."""
+    weights = [1 / (rank + 1) for rank in range(len(WORDS))]
+    for feature_id in range(1, docs // DOCS_PER_FEATURE + 1):
+        folder = specs_dir / f"{padd_feature_id(feature_id)}-feature"
+        folder.mkdir(parents=True)
+        for name in ("product-requirement.md", "high-level-design.md", "low-level-design.md"):
+            body = " ".join(rng.choices(WORDS, weights, k=300))
+            (folder / name).write_text(f"# {name[:-3]} {feature_id}\n\n{body}\n")
+        issue = {
+            "id": feature_id,
+            "title": f"Feature {feature_id} {rng.choice(WORDS[-15:])}",
+            "description": " ".join(rng.choices(WORDS, weights, k=40)),
+            "labels": [],
+            "comments": [],
+        }
+        (folder / "issue.json").write_text(json.dumps(issue))
+
+
+def timed(fn, rounds: int) -> float:
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=50000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory(prefix="cwai-bench-search-") as tmp:
+        specs_dir = Path(tmp) / "specs"
+        populate(specs_dir, args.docs, rng)
+
+        index = SearchIndex(specs_dir)
+        start = time.perf_counter()
+        index.refresh()
+        print(f"documents: {args.docs}")
+        print(f"initial build:        {(time.perf_counter() - start) * 1000:9.1f} ms")
+        print(f"no-change refresh:    {timed(index.refresh, 3):9.1f} ms")
+
+        edited = specs_dir / f"{padd_feature_id(7)}-feature" / "high-level-design.md"
+        edited.write_text(edited.read_text() + "\nextra paragraph about invoices\n")
+        print(f"one-file refresh:     {timed(index.refresh, 1):9.1f} ms")
+
+        for query in ("login password", "database migration latency", "word3 invoice", "word19999"):
+            elapsed = timed(lambda: index.search(query, 10), args.rounds)
+            print(f"query {query!r:30} {elapsed:7.2f} ms")
+        index.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Cold-start budget for the cwai-create-feature entry point.
+
+Measures, in fresh interpreters, how long importing commands.create_feature_py takes
+on top of the unavoidable asyncio and click imports (via `python -X importtime`), and
+checks that heavy optional modules stay unloaded until used. Exits non-zero when the
+median exceeds the budget or a lazy module is imported eagerly.
+
+Usage: python benchmarks/bench_startup.py [--runs 7] [--budget-ms 40]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+SRC = ROOT / "src"
+
+# Modules that must only be imported when they are actually used
+LAZY_MODULES = (
+    "rich",
+    "dotenv",
+    "questionary",
+    "sqlite3",
+    "utils.github_issue_manager_py",
+    "utils.issue_index_py",
+    "utils.duplicate_index_py",
+    "utils.outbox_py",
+)
+
+PROBE = (
+    "import sys; sys.path.insert(0, {src!r}); import asyncio, click; "
+    "import commands.create_feature_py; "
+    "print(','.join(m for m in {lazy!r} if m in sys.modules))"
+)
+
+
+def measure_import() -> tuple:
+    """Return (own import time in ms, eagerly loaded lazy modules) for one fresh run."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE.format(src=str(SRC), lazy=LAZY_MODULES)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    own_us = 0
+    for line in result.stderr.splitlines():
+        if line.rstrip().endswith("| commands.create_feature_py"):
+            own_us = int(line.split("|")[1])
+    eager = [m for m in result.stdout.strip().split(",") if m]
+    return own_us / 1000, eager
+
+
+def measure_help() -> float:
+    """Return the wall time in ms of `cwai-create-feature --help`."""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, str(ROOT / "bin" / "cwai-create-feature"), "--help"],
+        capture_output=True,
+        check=True,
+    )
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=float(os.environ.get("CWAI_STARTUP_BUDGET_MS", "40")),
+        help="Maximum median import time of the CwAI modules themselves",
+    )
+    args = parser.parse_args()
+
+    own_times, eager = [], set()
+    for _ in range(args.runs):
+        own_ms, loaded = measure_import()
+        own_times.append(own_ms)
+        eager.update(loaded)
+    help_times = [measure_help() for _ in range(args.runs)]
+
+    own_median = statistics.median(own_times)
+    budget = f"budget {args.budget_ms:.0f} ms"
+    print(f"CwAI import time (median of {args.runs}): {own_median:.1f} ms ({budget})")
+    print(f"cwai-create-feature --help wall time (median): {statistics.median(help_times):.1f} ms")
+
+    failed = False
+    if eager:
+        print(f"FAIL: lazily used modules imported at startup: {', '.join(sorted(eager))}")
+        failed = True
+    if own_median > args.budget_ms:
+        print("FAIL: cold start exceeds the budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
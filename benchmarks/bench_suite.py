@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""End-to-end benchmark suite: feature creation, issue managers and install.
+
+Every scenario runs in a fresh Python process against a generated git repository
+whose specs folder holds 10, 1k or 100k features. `git` and `gh` are stand-ins on
+PATH (benchmarks/stubs) that record each call, then run the real git or the gh
+fake from tests/stubs, so nothing touches the network. Per scenario and size the
+suite reports the median wall time of the operation, the subprocesses it spawned
+and the peak RSS of the process, and compares them with benchmarks/baseline.json.
+
+The first run of each scenario warms on-disk state (indexes, asset cache) and is
+not counted, so the numbers describe the steady state a user sees.
+
+Usage:
+    python benchmarks/bench_suite.py [--sizes 10,1000,100000] [--runs 3]
+                                     [--only create,update] [--json]
+                                     [--update-baseline] [--tolerance 0.25]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+ROOT = Path(__file__).parent.parent
+STUBS = Path(__file__).parent / "stubs"
+BASELINE = Path(__file__).parent / "baseline.json"
+
+# Wall-time increases below this many milliseconds are treated as noise
+NOISE_FLOOR_MS = 5.0
+
+LABELS = ["ui", "backend", "auth", "docs", "bug", "perf", "infra", "api"]
+WORDS = (
+    "login page billing invoice search export report dashboard user admin role "
+    "token cache queue webhook email audit upload image profile settings"
+).split()
+
+
+def git(repo: Path, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+
+def populate(repo: Path, count: int) -> None:
+    """Create a git repository whose specs folder holds count local features."""
+    from utils.helpers_py import padd_feature_id
+
+    repo.mkdir(parents=True)
+    git(repo, "init", "-q", "-b", "main")
+    git(repo, "config", "user.name", "Bench")
+    git(repo, "config", "user.email", "bench@example.com")
+    git(repo, "commit", "-q", "--allow-empty", "-m", "init")
+
+    specs = repo / "specs"
+    specs.mkdir()
+    for feature_id in range(1, count + 1):
+        folder = specs / f"{padd_feature_id(feature_id)}-feature"
+        folder.mkdir()
+        day = 1 + feature_id % 365
+        stamp = f"2024-{1 + day // 31 % 12:02d}-{1 + day % 28:02d}T12:00:00Z"
+        words = [WORDS[(feature_id * prime) % len(WORDS)] for prime in (3, 7, 11, 13, 17)]
+        issue = {
+            "author": "Bench <bench@example.com>",
+            "id": feature_id,
+            "title": f"Feature {feature_id}",
+            "description": f"Add {' '.join(words)} number {feature_id}",
+            "labels": [LABELS[feature_id % 8], LABELS[feature_id * 7 % 8]],
+            "created_at": stamp,
+            "updated_at": stamp,
+            "comments": [],
+        }
+        (folder / "issue.json").write_text(json.dumps(issue))
+    git(repo, "branch", f"{padd_feature_id(1)}-feature")
+
+    upstream = repo.parent / "upstream"
+    if not upstream.exists():
+        upstream.mkdir()
+        shutil.copytree(ROOT / ".cwai", upstream / ".cwai")
+        git(upstream, "init", "-q", "-b", "main")
+        git(upstream, "config", "user.name", "Bench")
+        git(upstream, "config", "user.email", "bench@example.com")
+        git(upstream, "add", "-A")
+        git(upstream, "commit", "-q", "-m", "assets")
+
+
+# --- scenarios (run inside the child process) -------------------------------------
+
+
+def unique_requirement() -> str:
+    return f"Add benchmark feature {time.time_ns()} with a distinct requirement"
+
+
+def scenario_create(repo: Path) -> Callable[[], None]:
+    from commands.create_feature_py import create_feature_command_async
+
+    requirement = unique_requirement()
+    return lambda: asyncio.run(
+        create_feature_command_async(requirement, True, "", ["product-requirement"], ["bench"])
+    )
+
+
+def scenario_update(repo: Path) -> Callable[[], None]:
+    from commands.create_feature_py import create_feature_command_async
+    from utils.helpers_py import padd_feature_id
+
+    requirement = f"{padd_feature_id(1)}-feature needs another review round"
+    return lambda: asyncio.run(create_feature_command_async(requirement, True, "", [], ["review"]))
+
+
+def issue_round_trip(manager_type: str, repo: Path) -> Callable[[], None]:
+    from utils.helpers_py import padd_feature_id
+    from utils.issue_manager_py import get_issue_manager
+    from utils.repo_context_py import get_repo_context
+
+    manager = get_issue_manager(manager_type, get_repo_context())
+    specs = repo / "specs"
+    slug = f"manager-{time.time_ns()}"
+
+    async def round_trip() -> None:
+        feature_id = await manager.create_issue(slug, "Manager", specs, ["bench"], "Body")
+        folder = f"{padd_feature_id(feature_id)}-{slug}"
+        await manager.update_issue(feature_id, folder, specs / folder, ["reviewed"], "Update")
+
+    return lambda: asyncio.run(round_trip())
+
+
+def scenario_localfs(repo: Path) -> Callable[[], None]:
+    return issue_round_trip("localfs", repo)
+
+
+def scenario_github(repo: Path) -> Callable[[], None]:
+    return issue_round_trip("github", repo)
+
+
+def install_into(repo: Path, offline: bool) -> Callable[[], None]:
+    from commands.install_py import install_command
+
+    target = repo.parent / "install-target"
+    target.mkdir(exist_ok=True)
+    args = ["--json", "-t", str(target), "-c", "vscode", "-c", "claude", "-c", "gemini"]
+    if offline:
+        args.insert(0, "--offline")
+    return lambda: install_command.main(args, standalone_mode=False)
+
+
+def scenario_install(repo: Path) -> Callable[[], None]:
+    return install_into(repo, offline=False)
+
+
+def scenario_install_offline(repo: Path) -> Callable[[], None]:
+    return install_into(repo, offline=True)
+
+
+# name -> (setup returning the timed operation, depends on the specs size)
+SCENARIOS: Dict[str, tuple] = {
+    "create": (scenario_create, True),
+    "update": (scenario_update, True),
+    "localfs-manager": (scenario_localfs, True),
+    "github-manager": (scenario_github, True),
+    "install": (scenario_install, False),
+    "install-offline": (scenario_install_offline, False),
+}
+
+
+def run_child(name: str, repo: Path) -> None:
+    """Run one scenario in this process and print its measurements as JSON."""
+    sys.path.insert(0, str(ROOT / "src"))
+    os.chdir(repo)
+    operation = SCENARIOS[name][0](repo)
+    calls = Path(os.environ["CWAI_BENCH_CALLS"])
+    calls_before = len(calls.read_text().splitlines()) if calls.exists() else 0
+
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        start = time.perf_counter()
+        operation()
+        wall_ms = (time.perf_counter() - start) * 1000
+
+    calls_after = len(calls.read_text().splitlines()) if calls.exists() else 0
+    print(json.dumps({"wall_ms": wall_ms, "subprocesses": calls_after - calls_before}))
+
+
+# --- driver -----------------------------------------------------------------------
+
+
+def bench_env(tmp: Path) -> Dict[str, str]:
+    real_git = shutil.which("git")
+    if not real_git:
+        raise SystemExit("git is required")
+    env = dict(os.environ)
+    for key in [k for k in env if k.startswith(("CWAI_", "GH_", "GITHUB_"))]:
+        del env[key]
+    env.update(
+        PATH=f"{STUBS}{os.pathsep}{env['PATH']}",
+        CWAI_BENCH_CALLS=str(tmp / "calls.log"),
+        CWAI_BENCH_REAL_GIT=real_git,
+        CWAI_BENCH_FAKE_GH=str(ROOT / "tests" / "stubs" / "gh"),
+        FAKE_GH_STATE=str(tmp / "gh-state"),
+        CWAI_CACHE_DIR=str(tmp / "cache"),
+        CWAI_ASSETS_URL=(tmp / "upstream").as_uri(),
+        CWAI_NO_DAEMON="1",
+    )
+    return env
+
+
+def measure(name: str, repo: Path, env: Dict[str, str]) -> dict:
+    """Run a scenario in a child process; returns its measurements and peak RSS."""
+    child_env = dict(env, CWAI_ISSUE_MANAGER="github" if name == "github-manager" else "localfs")
+    with tempfile.TemporaryFile(mode="w+") as stderr:
+        process = subprocess.Popen(
+            [sys.executable, __file__, "--child", name, "--repo", str(repo)],
+            env=child_env,
+            stdout=subprocess.PIPE,
+            stderr=stderr,
+            text=True,
+        )
+        stdout = process.stdout.read()
+        process.stdout.close()
+        # wait4 reports the resource usage of this child alone
+        _, status, usage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+        if process.returncode != 0:
+            stderr.seek(0)
+            raise RuntimeError(f"scenario {name} failed:\n{stderr.read()}")
+    result = json.loads(stdout.strip().splitlines()[-1])
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    result["peak_rss_mb"] = usage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    return result
+
+
+def run_scenario(name: str, repo: Path, env: Dict[str, str], runs: int) -> dict:
+    measure(name, repo, env)
+    samples = [measure(name, repo, env) for _ in range(runs)]
+    return {
+        "wall_ms": round(statistics.median(s["wall_ms"] for s in samples), 2),
+        "subprocesses": max(s["subprocesses"] for s in samples),
+        "peak_rss_mb": round(max(s["peak_rss_mb"] for s in samples), 1),
+    }
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """List regressions of results against the baseline."""
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        if result["subprocesses"] > base["subprocesses"]:
+            regressions.append(
+                f"{key}: {result['subprocesses']} subprocesses (baseline {base['subprocesses']})"
+            )
+        wall_limit = max(base["wall_ms"] * (1 + tolerance), base["wall_ms"] + NOISE_FLOOR_MS)
+        if result["wall_ms"] > wall_limit:
+            regressions.append(
+                f"{key}: {result['wall_ms']:.1f} ms (baseline {base['wall_ms']:.1f} ms)"
+            )
+        if result["peak_rss_mb"] > base["peak_rss_mb"] * (1 + tolerance):
+            regressions.append(
+                f"{key}: {result['peak_rss_mb']:.1f} MB peak RSS "
+                f"(baseline {base['peak_rss_mb']:.1f} MB)"
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10,1000,100000", help="Comma separated feature counts")
+    parser.add_argument("--runs", type=int, default=3, help="Measured runs per scenario")
+    parser.add_argument("--only", help="Comma separated scenario names")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--update-baseline", action="store_true", help="Store results as baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--repo", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, Path(args.repo))
+        return 0
+
+    sys.path.insert(0, str(ROOT / "src"))
+    names = args.only.split(",") if args.only else list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s) {', '.join(unknown)}; known: {', '.join(SCENARIOS)}")
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    results: Dict[str, dict] = {}
+    with tempfile.TemporaryDirectory(prefix="cwai-bench-suite-") as tmp_name:
+        tmp = Path(tmp_name)
+        env = bench_env(tmp)
+        for index, size in enumerate(sizes):
+            repo = tmp / f"repo-{size}"
+            start = time.perf_counter()
+            populate(repo, size)
+            elapsed = time.perf_counter() - start
+            print(f"generated {size} features in {elapsed:.1f} s", file=sys.stderr)
+            for name in names:
+                size_dependent = SCENARIOS[name][1]
+                if not size_dependent and index > 0:
+                    continue
+                key = f"{name}@{size}" if size_dependent else name
+                results[key] = run_scenario(name, repo, env, args.runs)
+                if not args.json:
+                    r = results[key]
+                    print(
+                        f"{key:<24} {r['wall_ms']:>10.1f} ms {r['subprocesses']:>5} procs "
+                        f"{r['peak_rss_mb']:>8.1f} MB",
+                        flush=True,
+                    )
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+
+    if args.update_baseline:
+        stored = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+        stored.update(results)
+        BASELINE.write_text(json.dumps(stored, indent=2, sort_keys=True) + "\n")
+        print(f"baseline written to {BASELINE}", file=sys.stderr)
+        return 0
+
+    if not BASELINE.exists():
+        print("no baseline stored; run with --update-baseline", file=sys.stderr)
+        return 0
+    regressions = compare(results, json.loads(BASELINE.read_text()), args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -105,7 +105,8 @@ async function createNewFeature(requirement, title, labels, templates, outputJso
   }
 
   // Copy templates
-  const copiedFilesCsv = await copyTemplates(featureDir, templates);
+  const variables = featureVariables(featureName, featureId, featureTitle, requirement);
+  const copiedFilesCsv = await copyTemplates(featureDir, templates, variables);
 
   // Output results
   const results = {
@@ -143,9 +144,6 @@ async function updateExistingFeature(featureName, labels, requirement, templates
   const issueManager = getIssueManager(issueManagerType);
   await issueManager.updateIssue(featureId, featureName, featureDir, labels, requirement);
 
-  // Copy templates
-  const copiedFilesCsv = await copyTemplates(featureDir, templates);
-
   // Get feature title
   let featureTitle = featureName;
   const issueJsonPath = path.join(featureDir, 'issue.json');
@@ -154,6 +152,10 @@ async function updateExistingFeature(featureName, labels, requirement, templates
     featureTitle = issueData.title || featureName;
   }
 
+  // Copy templates
+  const variables = featureVariables(featureName, featureId, featureTitle, requirement);
+  const copiedFilesCsv = await copyTemplates(featureDir, templates, variables);
+
   // Output results
   const results = {
     BRANCH_NAME: featureName,
@@ -167,7 +169,28 @@ async function updateExistingFeature(featureName, labels, requirement, templates
   outputResults(results, outputJson);
 }
 
-async function copyTemplates(featureDir, requestedTemplates) {
+// {{TITLE}}-style placeholders; unknown names are left in place for the AI to fill
+const PLACEHOLDER = /\{\{\s*([A-Z][A-Z0-9_]*)\s*\}\}/g;
+
+function featureVariables(featureName, issueNumber, title, requirement) {
+  const today = new Date();
+  const pad = (value) => String(value).padStart(2, '0');
+  return {
+    FEATURE_NAME: featureName,
+    ISSUE_NUMBER: String(issueNumber),
+    TITLE: title,
+    REQUIREMENT: requirement,
+    DATE: `${today.getFullYear()}-${pad(today.getMonth() + 1)}-${pad(today.getDate())}`
+  };
+}
+
+function renderTemplate(text, variables) {
+  return text.replace(PLACEHOLDER, (placeholder, name) =>
+    Object.prototype.hasOwnProperty.call(variables, name) ? String(variables[name]) : placeholder
+  );
+}
+
+async function copyTemplates(featureDir, requestedTemplates, variables = {}) {
   if (!requestedTemplates || requestedTemplates.length === 0) {
     logInfo('ℹ️  No templates specified. Only creating directory structure.');
     return '';
@@ -199,7 +222,8 @@ async function copyTemplates(featureDir, requestedTemplates) {
       continue;
     }
 
-    await fs.copy(sourcePath, destination);
+    const text = await fs.readFile(sourcePath, 'utf8');
+    await fs.writeFile(destination, renderTemplate(text, variables), { flag: 'wx' });
     copiedFiles.push(destination);
     logInfo(`📄 Copied template: ${path.basename(sourcePath)}`);
   }
@@ -0,0 +1,244 @@
+"""Resident create-feature server and its thin client, over a per-repo Unix socket."""
+
+import asyncio
+import contextlib
+import hashlib
+import io
+import json
+import os
+import signal
+import socket
+import stat
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from utils.helpers_py import get_cache_dir, load_environment
+from utils.issue_manager_py import get_issue_manager
+from utils.logger_py import flush_logs, log_debug, log_error, log_info
+from utils.repo_context_py import RepoContext
+from utils.trace_py import span, tracing
+
+# Settings a client may have set in its own environment; a daemon started with
+# different values must not serve that client.
+FORWARDED_SETTINGS = (
+    "CWAI_SPECS_FOLDER",
+    "CWAI_ISSUE_MANAGER",
+    "CWAI_DUPLICATE_THRESHOLD",
+    "CWAI_OUTBOX",
+    "CWAI_SPECS_LAYOUT",
+    "CWAI_WORKTREE",
+    "CWAI_WORKTREE_DIR",
+)
+
+# Unix socket paths are limited to ~104 bytes on macOS and 108 on Linux
+MAX_SOCKET_PATH = 100
+
+
+def _uid() -> int:
+    return os.getuid() if hasattr(os, "getuid") else 0
+
+
+def daemon_socket_path(context: RepoContext) -> Path:
+    """
+    Get the socket path of the daemon serving the given repository.
+    Sockets live in a directory only the current user can access: the cache's
+    daemon folder, or a per-user folder in the temp directory when that path
+    would be too long for a socket.
+    """
+    digest = hashlib.sha1(str(context.root).encode()).hexdigest()[:16]
+    path = get_cache_dir() / "daemon" / f"create-feature-{digest}.sock"
+    if len(str(path)) > MAX_SOCKET_PATH:
+        path = Path(tempfile.gettempdir()) / f"cwai-{_uid()}" / f"{digest}.sock"
+    return path
+
+
+def is_private_dir(path: Path) -> bool:
+    """Check that path is a real directory owned by the current user and closed to others."""
+    try:
+        info = os.lstat(path)
+    except OSError:
+        return False
+    return (
+        stat.S_ISDIR(info.st_mode)
+        and info.st_uid == _uid()
+        and not stat.S_IMODE(info.st_mode) & 0o077
+    )
+
+
+def is_own_socket(path: Path) -> bool:
+    """Check that path is a socket the current user created, in a private directory."""
+    try:
+        info = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(info.st_mode) and info.st_uid == _uid() and is_private_dir(path.parent)
+
+
+def make_private_dir(path: Path) -> None:
+    """Create path as a 0700 directory, refusing one another user could have prepared."""
+    path.mkdir(mode=0o700, parents=True, exist_ok=True)
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != _uid():
+        log_error(f"{path} is not a directory owned by you; refusing to use it for the daemon")
+    if stat.S_IMODE(info.st_mode) & 0o077:
+        os.chmod(path, 0o700)
+
+
+def forward_to_daemon(payload: dict, context: RepoContext) -> Optional[dict]:
+    """
+    Send a create-feature request to a running daemon.
+    Returns the daemon's reply, or None when no daemon can serve the request and the
+    caller should run it in-process.
+    """
+    if os.environ.get("CWAI_NO_DAEMON") or not hasattr(socket, "AF_UNIX"):
+        return None
+    path = daemon_socket_path(context)
+    if not path.exists():
+        return None
+    if not is_own_socket(path):
+        # Anyone could have put a socket in a shared folder; never send it requests
+        log_debug(f"Ignoring daemon socket {path}: not owned by you or not private")
+        return None
+
+    request = {
+        **payload,
+        "settings": {k: os.environ[k] for k in FORWARDED_SETTINGS if k in os.environ},
+    }
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(float(os.environ.get("CWAI_COMMAND_TIMEOUT", "120")) * 2)
+            client.connect(str(path))
+            client.sendall(json.dumps(request).encode() + b"\n")
+            with client.makefile("rb") as reply_stream:
+                reply_line = reply_stream.readline()
+    except OSError:
+        return None
+
+    try:
+        reply = json.loads(reply_line)
+        # A successful reply carries the results; without them it is of no use
+        if not reply.get("exit_code") and "results" not in reply:
+            raise KeyError("results")
+    except (json.JSONDecodeError, AttributeError, KeyError) as error:
+        # An empty, truncated or foreign reply: a daemon that died or is out of date
+        log_debug(f"Ignoring unusable reply from daemon {path}: {error!r}")
+        return None
+    return None if reply.get("fallback") else reply
+
+
+class CreateFeatureDaemon:
+    """Keeps repository context, settings and the issue manager warm between requests."""
+
+    def __init__(self, context: RepoContext):
+        self.context = context
+        load_environment(context.root)
+        self.specs_folder = os.environ.get("CWAI_SPECS_FOLDER", "specs")
+        issue_manager_type = os.environ.get("CWAI_ISSUE_MANAGER", "localfs")
+        self.issue_manager = get_issue_manager(issue_manager_type, context)
+        self.settings = {
+            "CWAI_SPECS_FOLDER": self.specs_folder,
+            "CWAI_ISSUE_MANAGER": issue_manager_type,
+            "CWAI_DUPLICATE_THRESHOLD": os.environ.get("CWAI_DUPLICATE_THRESHOLD"),
+            "CWAI_OUTBOX": os.environ.get("CWAI_OUTBOX"),
+            "CWAI_SPECS_LAYOUT": os.environ.get("CWAI_SPECS_LAYOUT"),
+            "CWAI_WORKTREE": os.environ.get("CWAI_WORKTREE"),
+            "CWAI_WORKTREE_DIR": os.environ.get("CWAI_WORKTREE_DIR"),
+        }
+        # Requests share the working tree and process-wide stderr, so run one at a time
+        self.lock = asyncio.Lock()
+
+    async def handle_request(self, request: dict) -> dict:
+        """Run one request and return results (or the exit code) plus its log output."""
+        from commands.create_feature_py import flush_outbox, process_feature_request
+
+        for key, value in request.get("settings", {}).items():
+            if self.settings.get(key) != value:
+                return {"fallback": True}
+
+        async with self.lock:
+            log = io.StringIO()
+            reply = {"exit_code": 0}
+            with (
+                contextlib.redirect_stderr(log),
+                tracing() as tracer,
+                span("create-feature", "command"),
+            ):
+                try:
+                    if not request.get("requirement"):
+                        log_error("Requirement is required. Provide the requirement as arguments.")
+                    await flush_outbox(self.issue_manager, self.context.root / self.specs_folder)
+                    reply["results"] = await process_feature_request(
+                        request["requirement"],
+                        request.get("title") or "",
+                        request.get("templates") or [],
+                        request.get("labels") or [],
+                        self.specs_folder,
+                        self.issue_manager,
+                        self.context,
+                        refuse_duplicates=bool(request.get("refuse_duplicates")),
+                        worktree=bool(request.get("worktree")),
+                    )
+                except SystemExit as error:
+                    reply["exit_code"] = error.code if isinstance(error.code, int) else 1
+                except Exception as error:
+                    reply["exit_code"] = 1
+                    print(f"❌ Feature creation failed: {error}", file=log)
+            flush_logs()
+            reply["log"] = log.getvalue()
+            reply["trace"] = tracer.events
+            return reply
+
+    async def handle_connection(self, reader, writer) -> None:
+        try:
+            line = await reader.readline()
+            if line:
+                reply = await self.handle_request(json.loads(line))
+                writer.write(json.dumps(reply).encode() + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self) -> None:
+        """Listen on the repository socket until cancelled."""
+        path = daemon_socket_path(self.context)
+        make_private_dir(path.parent)
+        if os.path.lexists(path):
+            if not is_own_socket(path):
+                log_error(f"{path} exists and is not your daemon socket; remove it first")
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                    probe.connect(str(path))
+                log_error(f"A create-feature daemon is already listening on {path}")
+            except ConnectionRefusedError:
+                # Left behind by a daemon that did not shut down cleanly
+                path.unlink()
+
+        # Stop cleanly (and remove the socket) on SIGTERM as well as Ctrl-C
+        with contextlib.suppress(NotImplementedError, RuntimeError, ValueError):
+            asyncio.get_running_loop().add_signal_handler(
+                signal.SIGTERM, asyncio.current_task().cancel
+            )
+
+        # Create the socket 0600 rather than tightening it after bind
+        umask = os.umask(0o177)
+        try:
+            server = await asyncio.start_unix_server(self.handle_connection, path=str(path))
+        finally:
+            os.umask(umask)
+        log_info(f"create-feature daemon for {self.context.root} listening on {path}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            path.unlink(missing_ok=True)
+
+
+def run_daemon(context: RepoContext) -> None:
+    """Run the daemon in the foreground."""
+    if not hasattr(socket, "AF_UNIX"):
+        log_error("The create-feature daemon needs Unix domain socket support")
+    try:
+        asyncio.run(CreateFeatureDaemon(context).serve())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        log_info("create-feature daemon stopped")
@@ -4,10 +4,10 @@
 import asyncio
 import json
 import os
-import shutil
 import sys
+from contextlib import nullcontext
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import click
 
@@ -20,17 +20,30 @@ from utils.helpers_py import (
     detect_feature_name,
     extract_feature_id,
     get_repo_root,
+    get_specs_root,
     git_branch_exists,
     git_checkout,
+    git_worktree,
     load_environment,
     output_results,
     padd_feature_id,
     parse_labels,
     requirement_to_title,
     title_to_slug,
+    worktree_enabled,
 )
-from utils.issue_manager_py import get_issue_manager
-from utils.logger_py import log_error, log_info, log_warn
+from utils.issue_manager_py import compact_issue, get_issue_manager, load_issue
+from utils.logger_py import get_console, log_debug, log_error, log_info, log_warn
+from utils.repo_context_py import RepoContext, get_repo_context
+from utils.specs_layout_py import (
+    LAYOUTS,
+    feature_path,
+    iter_feature_dirs,
+    migrate_specs_layout,
+    resolve_feature_dir,
+)
+from utils.templates_py import feature_variables, get_template_registry
+from utils.trace_py import Tracer, span, tracing
 
 
 async def create_feature_command_async(
@@ -39,55 +52,233 @@ async def create_feature_command_async(
     title: str,
     templates: List[str],
     labels: List[str],
+    context: Optional[RepoContext] = None,
+    refuse_duplicates: bool = False,
+    trace_file: Optional[str] = None,
+    worktree: bool = False,
 ) -> None:
-    """Main create feature command (async version)."""
-    repo_root = get_repo_root()
-    load_environment(repo_root)
+    """
+    Main create feature command (async version).
+    With JSON output or a trace file the command phases and subprocesses are traced;
+    JSON results then carry a per-span summary under TRACE.
+    """
+    tracer = Tracer() if output_json or trace_file else None
+    with tracing(tracer) if tracer else nullcontext():
+        with span("create-feature", "command"):
+            with span("load environment"):
+                context = context or get_repo_context()
+                load_environment(context.root)
+
+            if not requirement:
+                log_error("Requirement is required. Provide the requirement as arguments.")
+
+            specs_folder = os.environ.get("CWAI_SPECS_FOLDER", "specs")
+            issue_manager = get_issue_manager(
+                os.environ.get("CWAI_ISSUE_MANAGER", "localfs"), context
+            )
+            specs_root = get_specs_root(context, worktree or worktree_enabled())
+            await flush_outbox(issue_manager, specs_root / specs_folder)
+
+            results = await process_feature_request(
+                requirement,
+                title,
+                templates,
+                labels,
+                specs_folder,
+                issue_manager,
+                context,
+                refuse_duplicates=refuse_duplicates,
+                worktree=worktree,
+            )
+
+    if tracer:
+        report_trace(tracer, results, output_json, trace_file)
+    output_results(results, output_json)
 
-    if not requirement:
-        log_error("Requirement is required. Provide the requirement as arguments.")
 
-    specs_folder = os.environ.get("CWAI_SPECS_FOLDER", "specs")
-    issue_manager_type = os.environ.get("CWAI_ISSUE_MANAGER", "localfs")
+def report_trace(
+    tracer: Tracer, results: dict, output_json: bool, trace_file: Optional[str]
+) -> None:
+    """Write the Chrome trace file and add the span summary to JSON results."""
+    if trace_file:
+        tracer.write(Path(trace_file))
+        log_info(f"Trace written to {trace_file}")
+    if output_json:
+        results["TRACE"] = tracer.summary()
 
+
+async def flush_outbox(issue_manager, specs_dir: Path) -> None:
+    """Send the GitHub changes earlier commands queued (CWAI_OUTBOX=on)."""
+    if hasattr(issue_manager, "flush_queued"):
+        with span("flush outbox"):
+            await issue_manager.flush_queued(specs_dir)
+
+
+async def process_feature_request(
+    requirement: str,
+    title: str,
+    templates: List[str],
+    labels: List[str],
+    specs_folder: str,
+    issue_manager,
+    context: RepoContext,
+    git_lock: Optional[asyncio.Lock] = None,
+    refuse_duplicates: bool = False,
+    worktree: bool = False,
+) -> dict:
+    """
+    Create or update a single feature and return its results.
+    In worktree mode (--worktree or CWAI_WORKTREE) the feature branch gets its own
+    git worktree instead of being checked out in the repository's working tree.
+    """
+    worktree = worktree or worktree_enabled()
+    specs_root = get_specs_root(context, worktree)
     # Detect if this is an existing feature or new
     feature_name = detect_feature_name(requirement)
 
     if feature_name:
         log_info(f"Detected existing feature reference: {feature_name}")
-        await update_existing_feature(
+        return await update_existing_feature(
             feature_name,
             labels,
             requirement,
             templates,
-            output_json,
             specs_folder,
-            issue_manager_type,
-        )
-    else:
-        log_info("No existing feature reference found; creating new feature")
-        await create_new_feature(
-            requirement,
-            title,
-            labels,
-            templates,
-            output_json,
-            specs_folder,
-            issue_manager_type,
-            repo_root,
+            issue_manager,
+            specs_root,
+            git_lock,
+            worktree,
         )
 
+    log_info("No existing feature reference found; creating new feature")
+    return await create_new_feature(
+        requirement,
+        title,
+        labels,
+        templates,
+        specs_folder,
+        issue_manager,
+        specs_root,
+        git_lock,
+        refuse_duplicates,
+        worktree,
+    )
+
+
+async def create_features_batch(
+    lines: Iterable[str],
+    concurrency: int,
+    refuse_duplicates: bool = False,
+    trace_file: Optional[str] = None,
+    worktree: bool = False,
+) -> int:
+    """
+    Create or update one feature per JSON line and stream results as NDJSON.
+    Repository discovery, environment loading and the issue manager are shared by all
+    records. Lines are read as the workers take them, so a large or endless input
+    never sits in memory at once. Returns the number of records that failed.
+    """
+    if trace_file:
+        with tracing() as tracer:
+            with span("create-feature --batch", "command"):
+                failures = await create_features_batch(
+                    lines, concurrency, refuse_duplicates, worktree=worktree
+                )
+        report_trace(tracer, {}, False, trace_file)
+        return failures
+
+    context = get_repo_context()
+    load_environment(context.root)
+
+    specs_folder = os.environ.get("CWAI_SPECS_FOLDER", "specs")
+    issue_manager_type = os.environ.get("CWAI_ISSUE_MANAGER", "localfs")
+    issue_manager = get_issue_manager(issue_manager_type, context)
+    specs_root = get_specs_root(context, worktree or worktree_enabled())
+    await flush_outbox(issue_manager, specs_root / specs_folder)
+
+    # Only remote issue creation benefits from overlap; local IDs are allocated in order
+    remote = issue_manager_type in ("github", "github-api")
+    workers = max(1, concurrency) if remote else 1
+    queue: asyncio.Queue = asyncio.Queue(maxsize=workers)
+    git_lock = asyncio.Lock()
+    failures = 0
+
+    async def run_record(line_number: int, line: str) -> None:
+        nonlocal failures
+        try:
+            record = parse_batch_record(line)
+            results = await process_feature_request(
+                record["requirement"],
+                record["title"],
+                record["templates"],
+                record["labels"],
+                specs_folder,
+                issue_manager,
+                context,
+                git_lock,
+                refuse_duplicates,
+                worktree,
+            )
+            results = {"LINE": line_number, **results}
+        except (Exception, SystemExit) as error:
+            failures += 1
+            message = str(error) if isinstance(error, Exception) else "Feature creation failed"
+            log_warn(f"Batch record on line {line_number} failed: {message}")
+            results = {"LINE": line_number, "ERROR": message}
+        print(json.dumps(results), flush=True)
+
+    async def worker() -> None:
+        while (item := await queue.get()) is not None:
+            await run_record(*item)
+
+    tasks = [asyncio.create_task(worker()) for _ in range(workers)]
+    try:
+        # Read in a thread so records already queued keep running while stdin waits
+        numbered = enumerate(lines, start=1)
+        while (item := await asyncio.to_thread(next, numbered, None)) is not None:
+            if item[1].strip():
+                await queue.put(item)
+    finally:
+        for _ in tasks:
+            await queue.put(None)
+        await asyncio.gather(*tasks)
+    return failures
+
+
+def parse_batch_record(line: str) -> dict:
+    """Parse one batch line into requirement, title, labels and templates."""
+    record = json.loads(line)
+    if not isinstance(record, dict) or not record.get("requirement"):
+        raise ValueError("Each batch record must be a JSON object with a 'requirement'")
+
+    labels = record.get("labels") or []
+    if isinstance(labels, str):
+        labels = parse_labels(labels)
+
+    templates = record.get("templates") or []
+    if isinstance(templates, str):
+        templates = [templates]
+
+    return {
+        "requirement": record["requirement"],
+        "title": record.get("title") or "",
+        "labels": list(labels),
+        "templates": list(templates),
+    }
+
 
 async def create_new_feature(
     requirement: str,
     title: str,
     labels: List[str],
     templates: List[str],
-    output_json: bool,
     specs_folder: str,
-    issue_manager_type: str,
+    issue_manager,
     repo_root: Path,
-) -> None:
+    git_lock: Optional[asyncio.Lock] = None,
+    refuse_duplicates: bool = False,
+    worktree: bool = False,
+) -> dict:
     """Create a new feature."""
     feature_title = title or requirement_to_title(requirement)
     feature_slug = title_to_slug(feature_title)
@@ -95,35 +286,53 @@ async def create_new_feature(
 
     feature_parent_dir.mkdir(parents=True, exist_ok=True)
 
-    issue_manager = get_issue_manager(issue_manager_type)
-    feature_id = await issue_manager.create_issue(
-        feature_slug,
-        feature_title,
-        feature_parent_dir,
-        labels,
-        requirement,
-    )
+    with span("duplicate check"):
+        duplicates = find_duplicate_features(requirement, feature_parent_dir)
+    if duplicates:
+        listing = ", ".join(f"{folder} ({score:.0%} similar)" for folder, score in duplicates)
+        if refuse_duplicates:
+            log_error(f"Refusing to create a likely duplicate of {listing}")
+        log_warn(f"Possible duplicate of {listing}")
+
+    with span("create issue", manager=type(issue_manager).__name__):
+        feature_id = await issue_manager.create_issue(
+            feature_slug,
+            feature_title,
+            feature_parent_dir,
+            labels,
+            requirement,
+        )
 
     feature_padded_id = padd_feature_id(feature_id)
     feature_name = f"{feature_padded_id}-{feature_slug}"
-    feature_dir = feature_parent_dir / feature_name
+    feature_dir = feature_path(feature_parent_dir, feature_name)
 
     log_info(f"🚀 Created feature: {feature_name}")
 
-    # Create branch (or switch to it if it already exists)
-    try:
-        branch_exists = await git_branch_exists(feature_name)
-        if branch_exists:
-            await git_checkout(feature_name, create=False)
-            log_info(f"Switched to existing branch: {feature_name}")
-        else:
-            await git_checkout(feature_name, create=True)
-            log_info(f"Created new branch: {feature_name}")
-    except Exception as error:
-        log_error(f"Failed to create/switch to branch {feature_name}: {error}")
-
-    # Copy templates
-    copied_files_csv = await copy_templates(feature_dir, templates)
+    # Branch switching and template copying touch the shared working tree
+    worktree_dir = None
+    async with git_lock or nullcontext():
+        # Create branch (or switch to it if it already exists)
+        with span("create branch"):
+            try:
+                branch_exists = await git_branch_exists(feature_name)
+                if worktree:
+                    worktree_dir = await git_worktree(feature_name, not branch_exists, repo_root)
+                    feature_dir = feature_path(worktree_dir / specs_folder, feature_name)
+                    log_info(f"Using worktree {worktree_dir} for branch: {feature_name}")
+                elif branch_exists:
+                    await git_checkout(feature_name, create=False)
+                    log_info(f"Switched to existing branch: {feature_name}")
+                else:
+                    await git_checkout(feature_name, create=True)
+                    log_info(f"Created new branch: {feature_name}")
+            except Exception as error:
+                log_error(f"Failed to create/switch to branch {feature_name}: {error}")
+
+        # Copy templates
+        variables = feature_variables(feature_name, feature_id, feature_title, requirement)
+        with span("copy templates"):
+            copied_files_csv = await copy_templates(feature_dir, templates, repo_root, variables)
 
     # Output results
     results = {
@@ -134,8 +343,34 @@ async def create_new_feature(
         "REQUIREMENT": requirement,
         "COPIED_TEMPLATES": copied_files_csv.split(",") if copied_files_csv else [],
     }
+    if worktree_dir:
+        results["WORKTREE"] = str(worktree_dir)
+    if duplicates:
+        results["POSSIBLE_DUPLICATES"] = [folder for folder, _ in duplicates]
 
-    output_results(results, output_json)
+    return results
+
+
+def find_duplicate_features(requirement: str, specs_dir: Path) -> List[Tuple[str, float]]:
+    """
+    Look up existing features whose description is close to the requirement.
+    The check is advisory: any failure skips it rather than the feature creation.
+    """
+    from utils.duplicate_index_py import DuplicateIndex, get_threshold
+
+    index = None
+    try:
+        if get_threshold() > 1:
+            return []
+        index = DuplicateIndex(specs_dir)
+        index.refresh()
+        return index.find_duplicates(requirement)
+    except Exception as error:
+        log_debug(f"Duplicate check skipped: {error}")
+        return []
+    finally:
+        if index is not None:
+            index.close()
 
 
 async def update_existing_feature(
@@ -143,95 +378,133 @@ async def update_existing_feature(
     labels: List[str],
     requirement: str,
     templates: List[str],
-    output_json: bool,
     specs_folder: str,
-    issue_manager_type: str,
-) -> None:
+    issue_manager,
+    repo_root: Path,
+    git_lock: Optional[asyncio.Lock] = None,
+    worktree: bool = False,
+) -> dict:
     """Update an existing feature."""
     feature_id = extract_feature_id(feature_name)
-    feature_parent_dir = Path.cwd() / specs_folder
-    feature_dir = feature_parent_dir / feature_name
+    feature_parent_dir = repo_root / specs_folder
+    feature_dir = resolve_feature_dir(feature_parent_dir, feature_name)
 
     if not feature_dir.exists():
         log_error(f"Feature directory '{feature_dir}' not found")
 
-    # Checkout branch
-    try:
-        await git_checkout(feature_name, create=False)
-    except Exception:
-        log_error(f"Failed to switch to branch {feature_name}")
+    # Templates go next to the issue, or into the feature's worktree
+    documents_dir = feature_dir
+    worktree_dir = None
+    async with git_lock or nullcontext():
+        # Checkout branch
+        with span("switch branch"):
+            try:
+                if worktree:
+                    worktree_dir = await git_worktree(feature_name, False, repo_root)
+                    documents_dir = feature_path(worktree_dir / specs_folder, feature_name)
+                else:
+                    await git_checkout(feature_name, create=False)
+            except Exception:
+                log_error(f"Failed to switch to branch {feature_name}")
 
     if not feature_id or feature_id == 0:
         log_error(f"Could not determine issue from branch '{feature_name}'")
 
-    issue_manager = get_issue_manager(issue_manager_type)
-    await issue_manager.update_issue(feature_id, feature_name, feature_dir, labels, requirement)
-
-    # Copy templates
-    copied_files_csv = await copy_templates(feature_dir, templates)
+    with span("update issue", manager=type(issue_manager).__name__):
+        await issue_manager.update_issue(
+            feature_id, feature_name, feature_dir, labels, requirement
+        )
 
     # Get feature title
     feature_title = feature_name
-    issue_json_path = feature_dir / "issue.json"
-    if issue_json_path.exists():
-        with open(issue_json_path) as f:
-            issue_data = json.load(f)
-            feature_title = issue_data.get("title", feature_name)
+    try:
+        feature_title = load_issue(feature_dir).get("title", feature_name)
+    except (OSError, ValueError):
+        # No local issue, e.g. with the GitHub managers
+        pass
+
+    # Copy templates
+    variables = feature_variables(feature_name, feature_id, feature_title, requirement)
+    async with git_lock or nullcontext():
+        with span("copy templates"):
+            copied_files_csv = await copy_templates(
+                documents_dir, templates, repo_root, variables
+            )
 
     # Output results
     results = {
         "BRANCH_NAME": feature_name,
-        "FEATURE_FOLDER": str(feature_dir),
+        "FEATURE_FOLDER": str(documents_dir),
         "ISSUE_NUMBER": str(feature_id),
         "TITLE": feature_title,
         "REQUIREMENT": requirement,
         "COPIED_TEMPLATES": copied_files_csv.split(",") if copied_files_csv else [],
     }
-
-    output_results(results, output_json)
-
-
-async def copy_templates(feature_dir: Path, requested_templates: List[str]) -> str:
-    """Copy templates to feature directory."""
+    if worktree_dir:
+        results["WORKTREE"] = str(worktree_dir)
+
+    return results
+
+
+async def copy_templates(
+    feature_dir: Path,
+    requested_templates: List[str],
+    repo_root: Optional[Path] = None,
+    variables: Optional[Dict[str, str]] = None,
+) -> str:
+    """
+    Render templates into the feature directory.
+    Placeholders such as {{TITLE}} and {{ISSUE_NUMBER}} are filled from variables;
+    the files are written concurrently and existing files are never overwritten.
+    """
     if not requested_templates:
         log_info("ℹ️  No templates specified. Only creating directory structure.")
         return ""
 
-    repo_root = get_repo_root()
+    repo_root = repo_root or get_repo_root()
     templates_dir = repo_root / ".cwai/templates/outline"
-    copied_files = []
+    registry = get_template_registry(templates_dir)
+    variables = variables or {}
 
+    selected = []
     for template in requested_templates:
         template = template.strip()
         if not template:
             continue
-
-        source_path = templates_dir / template
-        if not source_path.exists() and not template.endswith(".md"):
-            source_path = templates_dir / f"{template}.md"
-
-        if not source_path.exists():
+        compiled = registry.get(template)
+        if compiled is None:
             log_warn(f"Template '{template}' not found in {templates_dir}")
             continue
+        if compiled not in selected:
+            selected.append(compiled)
+    if not selected:
+        return ""
 
-        feature_dir.mkdir(parents=True, exist_ok=True)
-        destination = feature_dir / source_path.name
+    feature_dir.mkdir(parents=True, exist_ok=True)
 
-        if destination.exists():
-            log_warn(
-                f"Template '{destination.name}' already exists in {feature_dir}; skipping"
-            )
-            continue
+    def write(compiled) -> bool:
+        try:
+            with open(feature_dir / compiled.name, "x", encoding="utf-8") as f:
+                f.write(compiled.render(variables))
+        except FileExistsError:
+            return False
+        return True
 
-        shutil.copy2(source_path, destination)
-        log_info(f"Copied template: {source_path.name}")
-        copied_files.append(source_path.name)
+    written = await asyncio.gather(*(asyncio.to_thread(write, compiled) for compiled in selected))
+
+    copied_files = []
+    for compiled, was_written in zip(selected, written):
+        if was_written:
+            log_info(f"Copied template: {compiled.name}")
+            copied_files.append(compiled.name)
+        else:
+            log_warn(f"Template '{compiled.name}' already exists in {feature_dir}; skipping")
 
     return ",".join(copied_files)
 
 
 @click.command()
-@click.argument("requirement")
+@click.argument("requirement", required=False)
 @click.option("--json", "output_json", is_flag=True, help="Output data as JSON instead of text")
 @click.option("--title", help="Explicit title for the feature")
 @click.option(
@@ -242,36 +515,222 @@ async def copy_templates(feature_dir: Path, requested_templates: List[str]) -> s
     help="Templates to copy (can be used multiple times)",
 )
 @click.option("-l", "--labels", help="Labels to add to GitHub issue (comma separated)")
+@click.option(
+    "--batch",
+    "batch_file",
+    type=click.File("r"),
+    help="Read one JSON record per line from FILE (or - for stdin) and output NDJSON",
+)
+@click.option(
+    "--daemon",
+    "run_as_daemon",
+    is_flag=True,
+    help="Serve requests for this repository from a resident process over a Unix socket",
+)
+@click.option(
+    "--refuse-duplicates",
+    is_flag=True,
+    help="Fail instead of warning when the requirement looks like an existing feature",
+)
+@click.option(
+    "--compact",
+    "compact_journals",
+    is_flag=True,
+    help="Fold every feature's comments.jsonl back into its issue.json and exit",
+)
+@click.option(
+    "--migrate-layout",
+    type=click.Choice(LAYOUTS),
+    help="Move every feature folder into the given specs layout and exit",
+)
+@click.option(
+    "--import-issues",
+    is_flag=True,
+    help="Copy every issue.json into the sqlite issue store and exit",
+)
+@click.option(
+    "--export-issues",
+    is_flag=True,
+    help="Write every issue of the sqlite issue store back as issue.json and exit",
+)
+@click.option(
+    "--concurrency",
+    type=int,
+    default=lambda: int(os.environ.get("CWAI_BATCH_CONCURRENCY", "4")),
+    show_default="4",
+    help="Maximum GitHub issues created in parallel in batch mode",
+)
+@click.option(
+    "--worktree",
+    is_flag=True,
+    help="Check the feature branch out in its own git worktree (see CWAI_WORKTREE_DIR)",
+)
+@click.option(
+    "--trace",
+    "trace_file",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write timings of each phase and subprocess to FILE (Chrome trace-event JSON)",
+)
 def create_feature_command(
-    requirement: str,
+    requirement: Optional[str],
     output_json: bool,
     title: Optional[str],
     templates: tuple,
     labels: Optional[str],
+    batch_file,
+    concurrency: int,
+    run_as_daemon: bool,
+    compact_journals: bool,
+    migrate_layout: Optional[str],
+    import_issues: bool,
+    export_issues: bool,
+    refuse_duplicates: bool,
+    worktree: bool,
+    trace_file: Optional[str],
 ) -> None:
     """Create a new feature or update an existing one."""
+    if compact_journals:
+        compact_feature_journals(get_repo_context())
+        return
+
+    if migrate_layout:
+        migrate_feature_layout(get_repo_context(), migrate_layout)
+        return
+
+    if import_issues or export_issues:
+        transfer_issues(get_repo_context(), export_issues)
+        return
+
+    if run_as_daemon:
+        from commands.create_feature_daemon_py import run_daemon
+
+        run_daemon(get_repo_context())
+        return
+
+    if batch_file is not None:
+        try:
+            failures = asyncio.run(
+                create_features_batch(
+                    batch_file, concurrency, refuse_duplicates, trace_file, worktree
+                )
+            )
+        except Exception as error:
+            log_error(f"Batch feature creation failed: {error}")
+        if failures:
+            log_error(f"{failures} batch record(s) failed")
+        return
+
     parsed_labels = parse_labels(labels)
     template_list = list(templates) if templates else []
 
+    if requirement and forward_request(
+        requirement,
+        output_json,
+        title,
+        template_list,
+        parsed_labels,
+        refuse_duplicates,
+        trace_file,
+        worktree,
+    ):
+        return
+
     try:
         asyncio.run(
             create_feature_command_async(
-                requirement, output_json, title or "", template_list, parsed_labels
+                requirement or "",
+                output_json,
+                title or "",
+                template_list,
+                parsed_labels,
+                refuse_duplicates=refuse_duplicates,
+                trace_file=trace_file,
+                worktree=worktree,
             )
         )
     except Exception as error:
         log_error(f"Feature creation failed: {error}")
 
 
+def compact_feature_journals(context: RepoContext) -> None:
+    """Compact the comment journals of all features in the specs folder."""
+    load_environment(context.root)
+    specs_dir = get_specs_root(context) / os.environ.get("CWAI_SPECS_FOLDER", "specs")
+    compacted = 0
+    for _, entry in iter_feature_dirs(specs_dir):
+        if compact_issue(Path(entry.path)):
+            compacted += 1
+    log_info(f"🗜️  Compacted {compacted} issue journal(s)")
+
+
+def migrate_feature_layout(context: RepoContext, layout: str) -> None:
+    """Move all feature folders of the specs folder into the given layout."""
+    load_environment(context.root)
+    specs_dir = get_specs_root(context) / os.environ.get("CWAI_SPECS_FOLDER", "specs")
+    moved = migrate_specs_layout(specs_dir, layout)
+    log_info(f"📦 Moved {moved} feature folder(s) into the {layout} layout")
+    if os.environ.get("CWAI_SPECS_LAYOUT", "flat").lower() != layout:
+        log_warn(f"Set CWAI_SPECS_LAYOUT={layout} so new features are created the same way")
+
+
+def transfer_issues(context: RepoContext, export: bool) -> None:
+    """Move issues between issue.json files and the sqlite issue store."""
+    from utils.sqlite_issue_manager_py import export_localfs_issues, import_localfs_issues
+
+    load_environment(context.root)
+    specs_dir = get_specs_root(context) / os.environ.get("CWAI_SPECS_FOLDER", "specs")
+    if export:
+        log_info(f"📤 Exported {export_localfs_issues(specs_dir)} issue(s) to issue.json")
+    else:
+        log_info(f"📥 Imported {import_localfs_issues(specs_dir)} issue(s) into the sqlite store")
+
+
+def forward_request(
+    requirement: str,
+    output_json: bool,
+    title: Optional[str],
+    templates: List[str],
+    labels: List[str],
+    refuse_duplicates: bool = False,
+    trace_file: Optional[str] = None,
+    worktree: bool = False,
+) -> bool:
+    """Hand the request to a running daemon; returns False if it must run in-process."""
+    from commands.create_feature_daemon_py import forward_to_daemon
+
+    reply = forward_to_daemon(
+        {
+            "requirement": requirement,
+            "title": title,
+            "templates": templates,
+            "labels": labels,
+            "refuse_duplicates": refuse_duplicates,
+            "worktree": worktree,
+        },
+        get_repo_context(),
+    )
+    if reply is None:
+        return False
+
+    sys.stderr.write(reply.get("log", ""))
+    if reply.get("exit_code"):
+        sys.exit(reply["exit_code"])
+    results = reply["results"]
+    if output_json or trace_file:
+        # The daemon traces every request; its spans stand in for our own
+        tracer = Tracer()
+        tracer.events = reply.get("trace", [])
+        report_trace(tracer, results, output_json, trace_file)
+    output_results(results, output_json)
+    return True
+
+
 def main():
     """Entry point for cwai-create-feature command."""
     try:
         create_feature_command()
     except KeyboardInterrupt:
-        from rich.console import Console
-
-        console = Console()
-        console.print("\n\nOperation cancelled by user", style="yellow")
+        get_console().print("\n\nOperation cancelled by user", style="yellow")
         sys.exit(1)
 
 
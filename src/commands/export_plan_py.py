@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""Export plan command for CwAI CLI: turn a `/breakdown` plan into issues."""
+
+import asyncio
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import click
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.fs_py import specs_state_dir
+from utils.helpers_py import (
+    get_specs_root,
+    load_environment,
+    padd_feature_id,
+    parse_labels,
+    title_to_slug,
+)
+from utils.issue_manager_py import get_issue_manager, load_issue, patch_issue
+from utils.logger_py import get_console, log_error, log_info, log_success, log_warn
+from utils.plan_py import PlanError, PlanItem, dependency_levels, load_plan, plan_marker
+from utils.repo_context_py import get_repo_context
+from utils.specs_layout_py import iter_feature_dirs, resolve_feature_dir
+
+
+class ExportJournal:
+    """
+    Append-only record of a plan's export, one JSON line per step.
+
+    An item is marked `creating` before its issue is requested and `created`
+    with the issue number afterwards, so a rerun skips finished items and checks
+    the specs folder for items a crash interrupted instead of creating them twice.
+    """
+
+    def __init__(self, specs_dir: Path, plan_path: Path):
+        digest = hashlib.sha1(str(plan_path.resolve()).encode()).hexdigest()[:12]
+        self.path = specs_state_dir(specs_dir) / "plans" / f"{plan_path.name}-{digest}.jsonl"
+
+    def load(self) -> Dict[str, dict]:
+        """Get the latest entry of every item."""
+        state: Dict[str, dict] = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn last line from a crash mid-write
+                        continue
+                    state[entry["id"]] = entry
+        except FileNotFoundError:
+            pass
+        return state
+
+    def record(self, entry: dict) -> None:
+        """Append one entry with a single write."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, (json.dumps(entry) + "\n").encode("utf-8"))
+        finally:
+            os.close(fd)
+
+
+def item_slug(item: PlanItem) -> str:
+    """Slug of the feature folder an item's issue gets."""
+    return title_to_slug(item.title) or title_to_slug(item.id)
+
+
+def find_item_issue(specs_dir: Path, item: PlanItem, plan_name: str) -> Optional[dict]:
+    """Look for a local issue created from item whose export was not recorded."""
+    suffix = f"-{item_slug(item)}"
+    marker = plan_marker(plan_name, item.id)
+    for _, entry in iter_feature_dirs(specs_dir):
+        if not entry.name.endswith(suffix):
+            continue
+        try:
+            issue = load_issue(Path(entry.path))
+        except (OSError, ValueError):
+            continue
+        if marker in issue.get("description", ""):
+            return {"issue": issue["id"], "folder": entry.name}
+    return None
+
+
+async def export_plan(
+    plan_path: Path,
+    items: List[PlanItem],
+    specs_dir: Path,
+    issue_manager,
+    concurrency: int,
+    labels: List[str],
+) -> List[dict]:
+    """
+    Create one issue per plan item, level by level, and link them in issue.json.
+    Returns one result per item; items whose parent or blockers failed are skipped.
+    """
+    journal = ExportJournal(specs_dir, plan_path)
+    state = journal.load()
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    results: Dict[str, dict] = {}
+
+    async def export_item(item: PlanItem) -> None:
+        entry = state.get(item.id, {})
+        if entry.get("status") == "created":
+            results[item.id] = {**entry, "status": "existing"}
+            return
+        requirements = [item.parent, *item.blocked_by] if item.parent else item.blocked_by
+        if any(results[other]["status"] in ("failed", "skipped") for other in requirements):
+            results[item.id] = {"id": item.id, "status": "skipped"}
+            return
+        if entry.get("status") == "creating":
+            found = find_item_issue(specs_dir, item, plan_path.name)
+            if found:
+                state[item.id] = {"id": item.id, "status": "created", **found}
+                journal.record(state[item.id])
+                results[item.id] = {**state[item.id], "status": "existing"}
+                return
+
+        async with semaphore:
+            journal.record({"id": item.id, "status": "creating"})
+            try:
+                feature_id = await issue_manager.create_issue(
+                    item_slug(item),
+                    item.title,
+                    specs_dir,
+                    [*labels, item.type],
+                    item.body(plan_path.name),
+                )
+            except (Exception, SystemExit) as error:
+                message = str(error) if isinstance(error, Exception) else "Issue creation failed"
+                log_warn(f"Plan item {item.id} failed: {message}")
+                results[item.id] = {"id": item.id, "status": "failed", "error": message}
+                return
+        state[item.id] = {
+            "id": item.id,
+            "status": "created",
+            "issue": feature_id,
+            "folder": f"{padd_feature_id(feature_id)}-{item_slug(item)}",
+        }
+        journal.record(state[item.id])
+        results[item.id] = state[item.id]
+
+    for level in dependency_levels(items):
+        await asyncio.gather(*(export_item(item) for item in level))
+
+    link_issues(plan_path, items, specs_dir, state)
+    return [{"type": item.type, "title": item.title, **results[item.id]} for item in items]
+
+
+def link_issues(
+    plan_path: Path, items: List[PlanItem], specs_dir: Path, state: Dict[str, dict]
+) -> None:
+    """Write each created item's parent, children and dependencies into its issue.json."""
+    numbers = {
+        item_id: entry["issue"]
+        for item_id, entry in state.items()
+        if entry.get("status") == "created"
+    }
+
+    def issues(item_ids: List[str]) -> List[int]:
+        return [numbers[item_id] for item_id in item_ids if item_id in numbers]
+
+    for item in items:
+        if item.id not in numbers:
+            continue
+        feature_dir = resolve_feature_dir(specs_dir, state[item.id]["folder"])
+        if not feature_dir.is_dir():
+            # Renamed since, e.g. when cwai-sync reconciled a provisional ID
+            found = find_item_issue(specs_dir, item, plan_path.name)
+            if not found:
+                log_warn(f"Issue folder of plan item {item.id} not found; links not written")
+                continue
+            feature_dir = resolve_feature_dir(specs_dir, found["folder"])
+        patch_issue(
+            feature_dir,
+            {
+                "plan": {
+                    "file": plan_path.name,
+                    "id": item.id,
+                    "type": item.type,
+                    "parent": numbers.get(item.parent) if item.parent else None,
+                    "children": issues(item.children),
+                    "blocked_by": issues(item.blocked_by),
+                    "blocking": issues(item.blocking),
+                }
+            },
+        )
+
+
+@click.command()
+@click.argument("plan_file", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("--json", "output_json", is_flag=True, help="Output one result per item as JSON")
+@click.option("--labels", help="Comma-separated labels added to every issue")
+@click.option(
+    "--concurrency",
+    type=int,
+    default=lambda: int(os.environ.get("CWAI_BATCH_CONCURRENCY", "4")),
+    show_default="4",
+    help="Maximum issues created in parallel",
+)
+@click.option("--dry-run", is_flag=True, help="Print the creation order without creating issues")
+def export_plan_command(
+    plan_file: Path,
+    output_json: bool,
+    labels: Optional[str],
+    concurrency: int,
+    dry_run: bool,
+) -> None:
+    """Create issues for every epic, story and task of a .plan.md or .plan.json file."""
+    context = get_repo_context()
+    load_environment(context.root)
+
+    try:
+        items = load_plan(plan_file)
+        levels = dependency_levels(items)
+    except PlanError as error:
+        log_error(str(error))
+
+    if dry_run:
+        for number, level in enumerate(levels, start=1):
+            for item in level:
+                print(f"{number}\t{item.id}\t{item.type}\t{item.title}")
+        return
+
+    specs_dir = get_specs_root(context) / os.environ.get("CWAI_SPECS_FOLDER", "specs")
+    specs_dir.mkdir(parents=True, exist_ok=True)
+    issue_manager = get_issue_manager(os.environ.get("CWAI_ISSUE_MANAGER", "localfs"), context)
+    log_info(f"🗺️  Exporting {len(items)} plan item(s) in {len(levels)} level(s)")
+    try:
+        results = asyncio.run(
+            export_plan(
+                plan_file, items, specs_dir, issue_manager, concurrency, parse_labels(labels)
+            )
+        )
+    except Exception as error:
+        log_error(f"Plan export failed: {error}")
+
+    if output_json:
+        print(json.dumps(results, indent=2))
+    else:
+        for result in results:
+            issue = f"#{result['issue']}" if "issue" in result else "-"
+            print(f"{result['id']}\t{issue}\t{result['status']}\t{result['title']}")
+
+    failed = sum(1 for result in results if result["status"] in ("failed", "skipped"))
+    if failed:
+        log_error(f"{failed} plan item(s) not exported; rerun to resume")
+    log_success(f"Exported {len(results)} plan item(s)")
+
+
+def main():
+    """Entry point for cwai-export-plan command."""
+    try:
+        export_plan_command()
+    except KeyboardInterrupt:
+        get_console().print("\n\nOperation cancelled by user", style="yellow")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,16 @@
 #!/usr/bin/env python3
 """Install command for CwAI CLI."""
 
+import asyncio
+import json
 import os
 import shutil
-import subprocess
 import sys
-import tempfile
+from dataclasses import asdict
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
+import click
 import questionary
 from rich.console import Console
 
@@ -16,8 +19,10 @@ from pathlib import Path
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from utils.asset_cache_py import AssetCache
 from utils.helpers_py import get_absolute_path
 from utils.logger_py import log_error, log_info, log_success, log_warn
+from utils.sync_py import SyncStats, sync_files, sync_tree
 
 LOGO = """
    _____                _____
@@ -31,36 +36,78 @@ LOGO = """
           Code with AI
 """
 
-REPO_URL = "https://github.com/templ-project/code-with-ai.git"
+CLIENTS = ("vscode", "claude", "gemini")
+
+
+@click.command()
+@click.option(
+    "--offline",
+    is_flag=True,
+    help="Install from cached or packaged assets without contacting the repository",
+)
+@click.option("--refresh", is_flag=True, help="Fetch the assets again even if they are cached")
+@click.option(
+    "-t",
+    "--target",
+    "targets",
+    multiple=True,
+    type=click.Path(),
+    help="Project to install into without prompting (repeatable)",
+)
+@click.option(
+    "-c",
+    "--client",
+    "clients",
+    multiple=True,
+    type=click.Choice(CLIENTS),
+    help="AI client to install for without prompting (repeatable)",
+)
+@click.option(
+    "--global", "install_global", is_flag=True, help="Install globally for every --client"
+)
+@click.option(
+    "--manifest",
+    type=click.Path(exists=True, dir_okay=False),
+    help="YAML or JSON file listing targets and their clients",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=int,
+    default=lambda: int(os.environ.get("CWAI_INSTALL_JOBS", "8")),
+    show_default="8",
+    help="Targets installed in parallel",
+)
+@click.option("--json", "output_json", is_flag=True, help="Print the install summary as JSON")
+def install_command(
+    offline: bool,
+    refresh: bool,
+    targets: tuple,
+    clients: tuple,
+    install_global: bool,
+    manifest: Optional[str],
+    jobs: int,
+    output_json: bool,
+):
+    """
+    Install CwAI prompts and assets for an AI client.
+
+    Without --target, --global or --manifest the installer asks what to install where.
+    """
+    if targets or install_global or manifest:
+        plan = plan_fleet_install(targets, clients, install_global, manifest)
+        cwai_source_dir = AssetCache().resolve(offline=offline, refresh=refresh)
+        results = asyncio.run(install_fleet(plan, cwai_source_dir, jobs))
+        report_fleet_install(results, cwai_source_dir, output_json)
+        return
 
-
-def install_command():
-    """Main installation command."""
     console = Console()
     console.print(LOGO, style="blue")
 
     log_info(f"Python version: {sys.version.split()[0]}")
 
-    # Clone repo to temp directory
-    temp_dir = Path(tempfile.mkdtemp(prefix="cwai-install-"))
-    cwai_source_dir = None
-
-    try:
-        log_info("Cloning code-with-ai repository...")
-        subprocess.run(
-            ["git", "clone", "--depth", "1", REPO_URL, str(temp_dir)],
-            check=True,
-            capture_output=True,
-        )
-        log_info(f"Repository cloned to {temp_dir}")
-
-        cwai_source_dir = temp_dir / ".cwai"
-
-        if not cwai_source_dir.exists():
-            log_error(f"Source .cwai directory not found in cloned repo: {cwai_source_dir}")
-
-    except subprocess.CalledProcessError as error:
-        log_error(f"Failed to clone repository: {error}")
+    # Assets are shared by all installs on this machine, one snapshot per upstream commit
+    cwai_source_dir = AssetCache().resolve(offline=offline, refresh=refresh)
 
     # Select AI Client
     selected_ai_client = questionary.select(
@@ -114,18 +161,10 @@ def install_command():
     check_existing_installation(target_path, selected_ai_client)
 
     # Install prompts
-    install_prompts(cwai_source_dir, target_path, selected_ai_client)
+    stats = install_prompts(cwai_source_dir, target_path, selected_ai_client)
 
     # Install .cwai folder
-    install_cwai_folder(cwai_source_dir, target_path)
-
-    # Cleanup temporary directory
-    try:
-        log_info("Cleaning up temporary files...")
-        shutil.rmtree(temp_dir)
-        log_info("Temporary files removed")
-    except Exception as error:
-        log_warn(f"Failed to remove temporary directory: {error}")
+    stats += install_cwai_folder(cwai_source_dir, target_path)
 
     # Success message
     console.print()
@@ -135,6 +174,7 @@ def install_command():
     console.print(f"  Install Type: {install_type}")
     console.print(f"  Target Path: {target_path}")
     console.print(f"  CwAI Assets: {target_path / '.cwai'}")
+    console.print(f"  Files: {stats}")
 
     # Show client-specific paths
     if selected_ai_client == "vscode":
@@ -149,6 +189,161 @@ def install_command():
     )
 
 
+def plan_fleet_install(
+    targets: tuple, clients: tuple, install_global: bool, manifest: Optional[str]
+) -> List[Tuple[Path, List[str]]]:
+    """
+    Collect (target path, clients) pairs from the command line and the manifest.
+    Targets listed more than once get the union of their clients.
+    """
+    plan: Dict[Path, List[str]] = {}
+
+    def add(target: Path, target_clients) -> None:
+        merged = plan.setdefault(target, [])
+        merged.extend(client for client in target_clients if client not in merged)
+
+    if (targets or install_global) and not clients:
+        raise click.UsageError("--target and --global need at least one --client")
+    for target in targets:
+        add(get_absolute_path(target), clients)
+    if install_global:
+        for client in clients:
+            add(get_global_install_path(client), [client])
+    if manifest:
+        for target, target_clients in load_fleet_manifest(Path(manifest), clients):
+            add(target, target_clients)
+
+    if not plan:
+        raise click.UsageError("Nothing to install: no targets given")
+    return list(plan.items())
+
+
+def load_fleet_manifest(path: Path, default_clients: tuple = ()) -> List[Tuple[Path, List[str]]]:
+    """
+    Read a fleet manifest:
+
+        clients: [vscode, claude]        # default for targets without their own
+        targets:
+          - ~/src/service-a
+          - path: ../service-b           # relative to the manifest
+            clients: [gemini]
+
+    YAML needs PyYAML (`pip install code-with-ai[yaml]`); JSON works out of the box.
+    """
+    text = path.read_text(encoding="utf-8")
+    if path.suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise click.UsageError(
+                "YAML manifests need PyYAML (pip install 'code-with-ai[yaml]'); "
+                "use a .json manifest instead"
+            )
+        data = yaml.safe_load(text)
+    else:
+        data = json.loads(text)
+
+    if not isinstance(data, dict) or not isinstance(data.get("targets"), list):
+        raise click.UsageError(f"{path}: expected a mapping with a 'targets' list")
+    manifest_clients = data.get("clients") or list(default_clients)
+
+    plan = []
+    for entry in data["targets"]:
+        if isinstance(entry, str):
+            entry = {"path": entry}
+        if not isinstance(entry, dict) or not entry.get("path"):
+            raise click.UsageError(f"{path}: every target needs a 'path'")
+        target_clients = entry.get("clients") or manifest_clients
+        if isinstance(target_clients, str):
+            target_clients = [target_clients]
+        unknown = [client for client in target_clients if client not in CLIENTS]
+        if unknown or not target_clients:
+            raise click.UsageError(
+                f"{path}: target {entry['path']} needs clients from {', '.join(CLIENTS)}"
+            )
+        target = Path(entry["path"]).expanduser()
+        if not target.is_absolute():
+            target = path.parent / target
+        plan.append((target.resolve(), list(target_clients)))
+    return plan
+
+
+def install_target(cwai_source_dir: Path, target_path: Path, clients: List[str]) -> SyncStats:
+    """
+    Install the prompts of several clients and the .cwai folder into one target.
+    A client's global folder is created when missing; other targets must exist.
+    """
+    if target_path in {get_global_install_path(client) for client in clients}:
+        target_path.mkdir(parents=True, exist_ok=True)
+    if not target_path.is_dir():
+        raise FileNotFoundError(f"Target is not a directory: {target_path}")
+    src_prompts_dir = cwai_source_dir / "prompts"
+    stats = SyncStats()
+    for client in clients:
+        dest_dir, files = client_prompt_files(client, src_prompts_dir)
+        stats += sync_files(files, target_path / dest_dir)
+    stats += sync_tree(cwai_source_dir, target_path / ".cwai")
+    return stats
+
+
+async def install_fleet(
+    plan: List[Tuple[Path, List[str]]], cwai_source_dir: Path, jobs: int
+) -> List[dict]:
+    """
+    Install into every target of the plan, at most `jobs` at a time, from one source
+    tree. A failing target is reported and does not stop the others.
+    """
+    semaphore = asyncio.Semaphore(max(1, jobs))
+    done = 0
+
+    async def run_target(target_path: Path, clients: List[str]) -> dict:
+        nonlocal done
+        async with semaphore:
+            result = {"target": str(target_path), "clients": clients}
+            try:
+                stats = await asyncio.to_thread(
+                    install_target, cwai_source_dir, target_path, clients
+                )
+                result.update(status="ok", **asdict(stats))
+            except (Exception, SystemExit) as error:
+                message = str(error) if isinstance(error, Exception) else "Install failed"
+                result.update(status="error", error=message)
+            done += 1
+            progress = f"[{done}/{len(plan)}] {target_path} ({', '.join(clients)})"
+            if result["status"] == "ok":
+                log_success(f"{progress}: {stats}")
+            else:
+                log_warn(f"{progress} failed: {result['error']}")
+            return result
+
+    return await asyncio.gather(*(run_target(target, clients) for target, clients in plan))
+
+
+def report_fleet_install(results: List[dict], cwai_source_dir: Path, output_json: bool) -> None:
+    """Print the fleet summary and exit non-zero when any target failed."""
+    totals = SyncStats()
+    for result in results:
+        if result["status"] == "ok":
+            totals += SyncStats(
+                result["added"], result["changed"], result["removed"], result["unchanged"]
+            )
+    failed = sum(1 for result in results if result["status"] != "ok")
+    summary = {
+        "source": str(cwai_source_dir),
+        "targets": results,
+        "installed": len(results) - failed,
+        "failed": failed,
+        "files": asdict(totals),
+    }
+
+    if output_json:
+        print(json.dumps(summary, indent=2))
+    else:
+        log_info(f"Installed into {summary['installed']} target(s), files: {totals}")
+    if failed:
+        log_error(f"{failed} target(s) failed")
+
+
 def get_client_display_name(client: str) -> str:
     """Get display name for AI client."""
     display_names = {
@@ -224,7 +419,9 @@ def check_existing_installation(target_path: Path, selected_ai_client: str) -> N
             log_info("Will copy over existing installation")
 
 
-def install_prompts(cwai_source_dir: Path, target_path: Path, selected_ai_client: str) -> None:
+def install_prompts(
+    cwai_source_dir: Path, target_path: Path, selected_ai_client: str
+) -> SyncStats:
     """Install AI client-specific prompts."""
     src_prompts_dir = cwai_source_dir / "prompts"
 
@@ -232,67 +429,64 @@ def install_prompts(cwai_source_dir: Path, target_path: Path, selected_ai_client
         log_error(f"Source prompts directory not found: {src_prompts_dir}")
 
     if selected_ai_client == "vscode":
-        install_vscode_prompts(src_prompts_dir, target_path)
+        stats = install_vscode_prompts(src_prompts_dir, target_path)
     elif selected_ai_client == "claude":
-        install_claude_prompts(src_prompts_dir, target_path)
+        stats = install_claude_prompts(src_prompts_dir, target_path)
     elif selected_ai_client == "gemini":
-        install_gemini_prompts(src_prompts_dir, target_path)
+        stats = install_gemini_prompts(src_prompts_dir, target_path)
 
-    log_success(f"Prompts installed successfully for {get_client_display_name(selected_ai_client)}")
+    log_success(
+        f"Prompts installed successfully for {get_client_display_name(selected_ai_client)} "
+        f"({stats})"
+    )
+    return stats
 
 
-def install_vscode_prompts(src_prompts_dir: Path, target_path: Path) -> None:
-    """Install VSCode Copilot prompts."""
-    dest_dir = target_path / ".github/prompts"
-    log_info(f"Installing VSCode Copilot prompts to {dest_dir}")
+def client_prompt_files(client: str, src_prompts_dir: Path) -> Tuple[str, List[Tuple[str, Path]]]:
+    """Get the prompts folder of an AI client and its (file name, source) pairs."""
+    if client == "vscode":
+        return ".github/prompts", [(f"{f.stem}.prompt.md", f) for f in src_prompts_dir.glob("*.md")]
+    if client == "claude":
+        return "prompts", [(f.name, f) for f in src_prompts_dir.glob("*.md")]
+    if client == "gemini":
+        return "templates", [(f.name, f) for f in src_prompts_dir.glob("*.md")]
+    raise ValueError(f"Unknown AI client: {client}")
 
-    dest_dir.mkdir(parents=True, exist_ok=True)
 
-    for file in src_prompts_dir.glob("*.md"):
-        base_name = file.stem
-        dest_file = dest_dir / f"{base_name}.prompt.md"
-        shutil.copy2(file, dest_file)
-        log_info(f"Installed: {base_name}.prompt.md")
+def install_vscode_prompts(src_prompts_dir: Path, target_path: Path) -> SyncStats:
+    """Install VSCode Copilot prompts."""
+    dest_dir, files = client_prompt_files("vscode", src_prompts_dir)
+    log_info(f"Installing VSCode Copilot prompts to {target_path / dest_dir}")
+    return sync_files(files, target_path / dest_dir)
 
 
-def install_claude_prompts(src_prompts_dir: Path, target_path: Path) -> None:
+def install_claude_prompts(src_prompts_dir: Path, target_path: Path) -> SyncStats:
     """Install Claude prompts."""
-    dest_dir = target_path / "prompts"
-    log_info(f"Installing Claude prompts to {dest_dir}")
-
-    dest_dir.mkdir(parents=True, exist_ok=True)
+    dest_dir, files = client_prompt_files("claude", src_prompts_dir)
+    log_info(f"Installing Claude prompts to {target_path / dest_dir}")
+    return sync_files(files, target_path / dest_dir)
 
-    for file in src_prompts_dir.glob("*.md"):
-        dest_file = dest_dir / file.name
-        shutil.copy2(file, dest_file)
-        log_info(f"Installed: {file.name}")
 
-
-def install_gemini_prompts(src_prompts_dir: Path, target_path: Path) -> None:
+def install_gemini_prompts(src_prompts_dir: Path, target_path: Path) -> SyncStats:
     """Install Gemini prompts."""
-    dest_dir = target_path / "templates"
-    log_info(f"Installing Gemini prompts to {dest_dir}")
-
-    dest_dir.mkdir(parents=True, exist_ok=True)
-
-    for file in src_prompts_dir.glob("*.md"):
-        dest_file = dest_dir / file.name
-        shutil.copy2(file, dest_file)
-        log_info(f"Installed: {file.name}")
+    dest_dir, files = client_prompt_files("gemini", src_prompts_dir)
+    log_info(f"Installing Gemini prompts to {target_path / dest_dir}")
+    return sync_files(files, target_path / dest_dir)
 
 
-def install_cwai_folder(cwai_source_dir: Path, target_path: Path) -> None:
-    """Install .cwai folder."""
+def install_cwai_folder(cwai_source_dir: Path, target_path: Path) -> SyncStats:
+    """
+    Install .cwai folder.
+    Only files whose content changed are rewritten; files no longer shipped are removed.
+    """
     dest_cwai = target_path / ".cwai"
 
     log_info(f"Installing .cwai folder from {cwai_source_dir} to {dest_cwai}")
 
-    target_path.mkdir(parents=True, exist_ok=True)
-    if dest_cwai.exists():
-        shutil.rmtree(dest_cwai)
-    shutil.copytree(cwai_source_dir, dest_cwai)
+    stats = sync_tree(cwai_source_dir, dest_cwai)
 
-    log_success(".cwai folder installed successfully")
+    log_success(f".cwai folder installed successfully ({stats})")
+    return stats
 
 
 def main():
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Query command for CwAI CLI."""
+
+import json
+import os
+import re
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+import click
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.helpers_py import get_specs_root, load_environment
+from utils.logger_py import get_console, log_error, log_info
+from utils.repo_context_py import get_repo_context
+
+RELATIVE_TIME = re.compile(r"^(\d+)([mhdw])$")
+RELATIVE_UNITS = {"m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+
+def parse_time(value: Optional[str], now: Optional[datetime] = None) -> Optional[str]:
+    """
+    Turn `--since`/`--until` values into the ISO timestamps stored in issue.json.
+    Accepts relative ages (30m, 12h, 7d, 2w) and ISO dates or datetimes.
+    """
+    if not value:
+        return None
+    match = RELATIVE_TIME.match(value.strip())
+    if match:
+        delta = timedelta(**{RELATIVE_UNITS[match.group(2)]: int(match.group(1))})
+        return ((now or datetime.utcnow()) - delta).isoformat() + "Z"
+    try:
+        datetime.fromisoformat(value.rstrip("Z"))
+    except ValueError:
+        raise click.BadParameter(f"expected an ISO date or an age like 7d, got {value!r}")
+    return value
+
+
+@click.command()
+@click.option("--json", "output_json", is_flag=True, help="Output matches as JSON")
+@click.option(
+    "-l", "--label", "labels", multiple=True, help="Only features carrying this label (repeatable)"
+)
+@click.option("--since", help="Only features updated since (ISO date or age like 7d)")
+@click.option("--until", help="Only features updated until (ISO date or age like 7d)")
+@click.option("--limit", type=int, help="Return at most this many features")
+@click.option("--refresh", is_flag=True, help="Re-read every feature's issue, even unchanged ones")
+def query_command(
+    output_json: bool,
+    labels: tuple,
+    since: Optional[str],
+    until: Optional[str],
+    limit: Optional[int],
+    refresh: bool,
+) -> None:
+    """List features from the local issue index, newest update first."""
+    from utils.issue_index_py import IssueIndex
+
+    context = get_repo_context()
+    load_environment(context.root)
+    specs_dir = get_specs_root(context) / os.environ.get("CWAI_SPECS_FOLDER", "specs")
+    if not specs_dir.is_dir():
+        log_error(f"Specs folder not found: {specs_dir}")
+
+    index = IssueIndex(specs_dir)
+    try:
+        reread = index.refresh(full=refresh)
+        if reread:
+            log_info(f"🗂️  Indexed {reread} feature folder(s)")
+        matches = index.query(labels, parse_time(since), parse_time(until), limit)
+    finally:
+        index.close()
+
+    if output_json:
+        print(json.dumps(matches, indent=2))
+        return
+    for match in matches:
+        print(
+            f"{match['folder']}\t{match['updated_at']}\t{','.join(match['labels'])}\t{match['title']}"
+        )
+
+
+def main():
+    """Entry point for cwai-query command."""
+    try:
+        query_command()
+    except KeyboardInterrupt:
+        get_console().print("\n\nOperation cancelled by user", style="yellow")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Search command for CwAI CLI."""
+
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Optional
+
+import click
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.helpers_py import get_specs_root, load_environment
+from utils.logger_py import get_console, log_error, log_info
+from utils.repo_context_py import get_repo_context
+
+
+@click.command()
+@click.argument("query", nargs=-1, required=True)
+@click.option("--json", "output_json", is_flag=True, help="Output hits as JSON")
+@click.option("-k", "--limit", type=int, default=10, show_default=True, help="Number of hits")
+@click.option("--feature", help="Only search inside this feature folder")
+@click.option(
+    "--refresh",
+    is_flag=True,
+    help="Re-read every document, even those whose mtime and size did not change",
+)
+@click.option(
+    "--no-refresh",
+    is_flag=True,
+    help="Skip checking documents for changes (fastest, may be stale)",
+)
+def search_command(
+    query: tuple,
+    output_json: bool,
+    limit: int,
+    feature: Optional[str],
+    refresh: bool,
+    no_refresh: bool,
+) -> None:
+    """Full-text search over feature documents and local issues, best match first."""
+    from utils.search_index_py import SearchIndex
+
+    context = get_repo_context()
+    load_environment(context.root)
+    specs_dir = get_specs_root(context) / os.environ.get("CWAI_SPECS_FOLDER", "specs")
+    if not specs_dir.is_dir():
+        log_error(f"Specs folder not found: {specs_dir}")
+
+    index = SearchIndex(specs_dir)
+    try:
+        if not no_refresh:
+            reindexed = index.refresh(full=refresh)
+            if reindexed:
+                log_info(f"🔎 Indexed {reindexed} document(s)")
+        hits = index.search(" ".join(query), limit, feature)
+    finally:
+        index.close()
+
+    if output_json:
+        print(json.dumps(hits, indent=2))
+        return
+    for hit in hits:
+        print(f"{hit['feature']}\t{hit['path']}\t{hit['score']}\t{hit['snippet']}")
+
+
+def main():
+    """Entry point for cwai-search command."""
+    try:
+        search_command()
+    except KeyboardInterrupt:
+        get_console().print("\n\nOperation cancelled by user", style="yellow")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Sync command for CwAI CLI: send queued GitHub operations."""
+
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Optional
+
+import click
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.helpers_py import get_specs_root, load_environment
+from utils.logger_py import get_console, log_error, log_info, log_success
+from utils.repo_context_py import get_repo_context
+
+
+@click.command()
+@click.option("--json", "output_json", is_flag=True, help="Output the result as JSON")
+@click.option("--status", is_flag=True, help="List queued operations without sending them")
+@click.option(
+    "-j",
+    "--jobs",
+    type=int,
+    help="Features flushed at once (default: CWAI_SYNC_JOBS or 4)",
+)
+@click.option("--no-wait", is_flag=True, help="Stop at the first rate limit instead of backing off")
+def sync_command(output_json: bool, status: bool, jobs: Optional[int], no_wait: bool) -> None:
+    """Send the GitHub issues, labels and comments queued with CWAI_OUTBOX=on."""
+    from utils.issue_manager_py import get_remote_issue_manager
+    from utils.outbox_py import Outbox, OutboxIssueManager
+
+    context = get_repo_context()
+    load_environment(context.root)
+    specs_dir = get_specs_root(context) / os.environ.get("CWAI_SPECS_FOLDER", "specs")
+    if not specs_dir.is_dir():
+        log_error(f"Specs folder not found: {specs_dir}")
+
+    if status:
+        outbox = Outbox(specs_dir)
+        try:
+            pending = outbox.pending()
+        finally:
+            outbox.close()
+        if output_json:
+            print(json.dumps(pending, indent=2))
+            return
+        for op in pending:
+            error = f"\t{op['last_error']}" if op["last_error"] else ""
+            print(f"#{op['feature']}\t{op['kind']}\t{op['created_at']}\t{op['attempts']}{error}")
+        return
+
+    manager_type = os.environ.get("CWAI_ISSUE_MANAGER", "localfs")
+    if manager_type not in ("github", "github-api"):
+        log_error(f"Nothing to sync with CWAI_ISSUE_MANAGER={manager_type}")
+
+    manager = OutboxIssueManager(get_remote_issue_manager(manager_type, context))
+    stats = asyncio.run(manager.flush(specs_dir, wait=not no_wait, jobs=jobs))
+
+    if output_json:
+        print(
+            json.dumps(
+                {
+                    "sent": stats.sent,
+                    "failed": stats.failed,
+                    "remaining": stats.remaining,
+                    "reconciled": {str(k): v for k, v in stats.reconciled.items()},
+                },
+                indent=2,
+            )
+        )
+    if stats.remaining:
+        log_error(f"Sync incomplete: {stats}")
+    if stats.sent:
+        log_success(f"Synced with Github: {stats}")
+    else:
+        log_info("📮 Nothing queued")
+
+
+def main():
+    """Entry point for cwai-sync command."""
+    try:
+        sync_command()
+    except KeyboardInterrupt:
+        get_console().print("\n\nOperation cancelled by user", style="yellow")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
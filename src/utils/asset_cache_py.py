@@ -0,0 +1,192 @@
+"""Persistent per-user cache of the .cwai assets installed by cwai-install."""
+
+import os
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from utils.fs_py import atomic_write_text, file_lock
+from utils.helpers_py import get_cache_dir
+from utils.logger_py import log_debug, log_error, log_info, log_warn
+
+REPO_URL = "https://github.com/templ-project/code-with-ai.git"
+
+ASSETS_DIR_NAME = ".cwai"
+LATEST_FILE_NAME = "latest"
+
+# Older snapshots are pruned once a new one is fetched
+KEEP_SNAPSHOTS = 3
+
+
+def get_assets_url() -> str:
+    """Repository the assets are fetched from (CWAI_ASSETS_URL for forks and mirrors)."""
+    return os.environ.get("CWAI_ASSETS_URL", REPO_URL)
+
+
+def get_assets_cache_dir() -> Path:
+    """Folder holding one snapshot of the assets per upstream commit."""
+    return get_cache_dir() / "assets"
+
+
+def packaged_assets() -> Optional[Path]:
+    """
+    Get the .cwai folder shipped with this installation, if there is one.
+    Wheels carry it inside the src package; source checkouts have it at the top.
+    """
+    src_dir = Path(__file__).resolve().parent.parent
+    for candidate in (src_dir / ASSETS_DIR_NAME, src_dir.parent / ASSETS_DIR_NAME):
+        if (candidate / "prompts").is_dir():
+            return candidate
+    return None
+
+
+def resolve_remote_commit(repo_url: str) -> Optional[str]:
+    """Ask the remote for the commit its HEAD points to, without cloning anything."""
+    try:
+        result = subprocess.run(
+            ["git", "ls-remote", repo_url, "HEAD"],
+            check=True,
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError) as error:
+        log_debug(f"git ls-remote {repo_url} failed: {error}")
+        return None
+    fields = result.stdout.split()
+    return fields[0] if fields else None
+
+
+class AssetCache:
+    """
+    Snapshots of the .cwai tree keyed by the upstream commit they were taken from.
+
+    A snapshot is fetched at most once per commit and shared by every install on
+    the machine; `latest` names the most recently fetched one for offline installs.
+    Snapshots are written to a temporary folder and renamed into place, so a
+    half-finished fetch is never mistaken for a complete one.
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = root or get_assets_cache_dir()
+
+    def snapshot(self, commit: str) -> Optional[Path]:
+        """Get the cached assets for commit, if present."""
+        path = self.root / commit / ASSETS_DIR_NAME
+        return path if path.is_dir() else None
+
+    def latest(self) -> Optional[Path]:
+        """Get the most recently fetched snapshot, if any."""
+        try:
+            commit = (self.root / LATEST_FILE_NAME).read_text().strip()
+        except FileNotFoundError:
+            return None
+        return self.snapshot(commit) if commit else None
+
+    def mark_latest(self, commit: str) -> None:
+        """Remember commit as the snapshot offline installs use."""
+        atomic_write_text(self.root / LATEST_FILE_NAME, commit + "\n")
+
+    def fetch(self, repo_url: str, replace: bool = False) -> Path:
+        """
+        Clone only the .cwai tree of repo_url's HEAD and store it as a snapshot.
+        An existing snapshot of the same commit is kept unless replace is set.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        with file_lock(self.root / ".lock"):
+            staging = Path(tempfile.mkdtemp(prefix=".fetch-", dir=self.root))
+            try:
+                checkout = staging / "checkout"
+                subprocess.run(
+                    [
+                        "git",
+                        "clone",
+                        "--quiet",
+                        "--depth",
+                        "1",
+                        "--filter=blob:none",
+                        "--sparse",
+                        repo_url,
+                        str(checkout),
+                    ],
+                    check=True,
+                    capture_output=True,
+                )
+                subprocess.run(
+                    ["git", "-C", str(checkout), "sparse-checkout", "set", ASSETS_DIR_NAME],
+                    check=True,
+                    capture_output=True,
+                )
+                commit = subprocess.run(
+                    ["git", "-C", str(checkout), "rev-parse", "HEAD"],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                ).stdout.strip()
+
+                # Someone else fetched the same commit while we waited for the lock
+                existing = None if replace else self.snapshot(commit)
+                if existing is None:
+                    if not (checkout / ASSETS_DIR_NAME).is_dir():
+                        log_error(f"Source .cwai directory not found in {repo_url}")
+                    entry = staging / "entry"
+                    entry.mkdir()
+                    (checkout / ASSETS_DIR_NAME).rename(entry / ASSETS_DIR_NAME)
+                    shutil.rmtree(self.root / commit, ignore_errors=True)
+                    entry.rename(self.root / commit)
+                    existing = self.snapshot(commit)
+                self.mark_latest(commit)
+            finally:
+                shutil.rmtree(staging, ignore_errors=True)
+            self.prune(keep=commit)
+        return existing
+
+    def prune(self, keep: str) -> None:
+        """Remove all but the newest snapshots (always keeping `keep`)."""
+        snapshots = sorted(
+            (e for e in self.root.iterdir() if e.is_dir() and not e.name.startswith(".")),
+            key=lambda entry: entry.stat().st_mtime,
+            reverse=True,
+        )
+        for entry in snapshots[KEEP_SNAPSHOTS:]:
+            if entry.name != keep:
+                shutil.rmtree(entry, ignore_errors=True)
+
+    def resolve(self, offline: bool = False, refresh: bool = False) -> Path:
+        """
+        Find the .cwai folder to install from.
+
+        Online, the remote HEAD is looked up with `git ls-remote` and only fetched
+        when it is not cached yet (or when refresh is set). Offline, or when the
+        remote cannot be reached, the latest snapshot is used, then the assets
+        shipped with the package.
+        """
+        repo_url = get_assets_url()
+        if not offline:
+            commit = resolve_remote_commit(repo_url)
+            if commit:
+                cached = None if refresh else self.snapshot(commit)
+                if cached:
+                    log_info(f"Using cached assets for {commit[:12]}")
+                    self.mark_latest(commit)
+                    return cached
+                log_info(f"Fetching assets for {commit[:12]} from {repo_url}...")
+                try:
+                    return self.fetch(repo_url, replace=refresh)
+                except subprocess.CalledProcessError as error:
+                    stderr = (error.stderr or b"").decode(errors="replace").strip()
+                    log_warn(f"Failed to fetch assets: {stderr or error}")
+            else:
+                log_warn(f"Could not reach {repo_url}; installing without fetching")
+
+        cached = self.latest()
+        if cached:
+            log_info(f"Using cached assets from {cached.parent.name[:12]}")
+            return cached
+        shipped = packaged_assets()
+        if shipped:
+            log_info(f"Using assets shipped with the package: {shipped}")
+            return shipped
+        log_error("No CwAI assets available offline; run cwai-install once with network access")
@@ -0,0 +1,233 @@
+"""MinHash/LSH index of issue descriptions for near-duplicate detection."""
+
+import hashlib
+import os
+import random
+import sqlite3
+import struct
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from utils.fs_py import STATE_DIR_NAME, specs_state_dir
+from utils.issue_manager_py import load_issue
+from utils.logger_py import log_debug
+from utils.search_index_py import tokenize
+from utils.specs_layout_py import iter_feature_dirs, specs_signature
+
+INDEX_FILE_NAME = "duplicates.sqlite"
+
+# Bump when hashing or banding changes; older index files are rebuilt
+SCHEMA_VERSION = 1
+
+# 16 bands of 4 rows: pairs with Jaccard similarity 0.5 share a band ~65% of the
+# time, pairs at 0.8 ~99.9%, pairs at 0.2 ~2.5%
+NUM_PERMUTATIONS = 64
+BANDS = 16
+ROWS = NUM_PERMUTATIONS // BANDS
+
+MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(0x5EED)
+PERMUTATIONS = [
+    (_rng.randrange(1, MERSENNE_PRIME), _rng.randrange(0, MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+SIGNATURE_FORMAT = f"<{NUM_PERMUTATIONS}Q"
+
+DEFAULT_THRESHOLD = 0.5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS signatures (
+    folder TEXT PRIMARY KEY,
+    signature BLOB
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS buckets (
+    band INTEGER,
+    bucket INTEGER,
+    folder TEXT,
+    PRIMARY KEY (band, bucket, folder)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS buckets_folder ON buckets (folder);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def shingles(text: str) -> set:
+    """Word unigrams and bigrams of text, ignoring case, punctuation and stopwords."""
+    tokens = tokenize(text)
+    return set(tokens) | {f"{a} {b}" for a, b in zip(tokens, tokens[1:])}
+
+
+def minhash(text: str) -> Optional[Tuple[int, ...]]:
+    """Compute the MinHash signature of text, or None when it has no words."""
+    hashes = [
+        int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little")
+        for s in shingles(text)
+    ]
+    if not hashes:
+        return None
+    return tuple(min((a * h + b) % MERSENNE_PRIME for h in hashes) for a, b in PERMUTATIONS)
+
+
+def band_buckets(signature: Tuple[int, ...]) -> List[Tuple[int, int]]:
+    """Get the (band, bucket) pairs a signature is filed under."""
+    buckets = []
+    for band in range(BANDS):
+        rows = struct.pack(f"<{ROWS}Q", *signature[band * ROWS : (band + 1) * ROWS])
+        digest = hashlib.blake2b(rows, digest_size=8).digest()
+        buckets.append((band, int.from_bytes(digest, "little", signed=True)))
+    return buckets
+
+
+def similarity(first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+    """Estimate the Jaccard similarity of two texts from their signatures."""
+    return sum(1 for a, b in zip(first, second) if a == b) / NUM_PERMUTATIONS
+
+
+def get_threshold() -> float:
+    """Similarity from which features are reported as likely duplicates."""
+    return float(os.environ.get("CWAI_DUPLICATE_THRESHOLD", DEFAULT_THRESHOLD))
+
+
+class DuplicateIndex:
+    """
+    Locality-sensitive hashing index over the description of every feature.
+
+    A lookup reads only the features sharing at least one band bucket with the new
+    text, so its cost does not grow with the number of features. The index follows
+    the specs folder: new or removed feature folders are noticed through the
+    folder's mtime, and the issue manager records the features it creates.
+    """
+
+    def __init__(self, specs_dir: Path):
+        self.specs_dir = Path(specs_dir)
+        self.path = specs_state_dir(self.specs_dir) / INDEX_FILE_NAME
+        self._db: Optional[sqlite3.Connection] = None
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        if self._db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            if db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                db.executescript(
+                    "DROP TABLE IF EXISTS signatures; DROP TABLE IF EXISTS buckets; "
+                    "DROP TABLE IF EXISTS meta;"
+                )
+                db.executescript(SCHEMA)
+                db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            self._db = db
+        return self._db
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _specs_mtime(self) -> str:
+        return specs_signature(self.specs_dir)
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def refresh(self) -> int:
+        """Index features added since the last refresh and forget removed ones."""
+        specs_mtime = self._specs_mtime()
+        if self._get_meta("specs_mtime") == specs_mtime:
+            return 0
+
+        stored = {folder for (folder,) in self.db.execute("SELECT folder FROM signatures")}
+        on_disk = {relative for relative, _ in iter_feature_dirs(self.specs_dir)}
+
+        added = 0
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            for folder in stored - on_disk:
+                self._delete(folder)
+            for folder in on_disk - stored:
+                try:
+                    description = load_issue(self.specs_dir / folder).get("description") or ""
+                except (OSError, ValueError) as error:
+                    log_debug(f"Skipping {folder} in duplicate index: {error}")
+                    continue
+                self._add(folder, description)
+                added += 1
+            self.db.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('specs_mtime', ?)",
+                (specs_mtime,),
+            )
+        return added
+
+    def _delete(self, folder: str) -> None:
+        self.db.execute("DELETE FROM signatures WHERE folder = ?", (folder,))
+        self.db.execute("DELETE FROM buckets WHERE folder = ?", (folder,))
+
+    def _add(self, folder: str, text: str) -> None:
+        signature = minhash(text)
+        # Folders without words are still stored, so refresh does not retry them
+        self.db.execute(
+            "INSERT OR REPLACE INTO signatures (folder, signature) VALUES (?, ?)",
+            (folder, struct.pack(SIGNATURE_FORMAT, *signature) if signature else None),
+        )
+        if signature:
+            self.db.executemany(
+                "INSERT OR IGNORE INTO buckets (band, bucket, folder) VALUES (?, ?, ?)",
+                [(band, bucket, folder) for band, bucket in band_buckets(signature)],
+            )
+
+    def record(self, folder: str, text: str, specs_mtime_before: str) -> None:
+        """Add a feature the issue manager just created."""
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            self._add(folder, text)
+            # Only our own folder appeared since the index was last in sync
+            if self._get_meta("specs_mtime") == specs_mtime_before:
+                self.db.execute(
+                    "UPDATE meta SET value = ? WHERE key = 'specs_mtime'", (self._specs_mtime(),)
+                )
+
+    def find_duplicates(
+        self, text: str, threshold: Optional[float] = None, limit: int = 5
+    ) -> List[Tuple[str, float]]:
+        """Get (feature folder, estimated similarity) of likely duplicates of text."""
+        signature = minhash(text)
+        if signature is None:
+            return []
+        threshold = get_threshold() if threshold is None else threshold
+
+        buckets = band_buckets(signature)
+        clause = " OR ".join("(band = ? AND bucket = ?)" for _ in buckets)
+        params = [value for pair in buckets for value in pair]
+        candidates = self.db.execute(
+            "SELECT s.folder, s.signature FROM signatures s WHERE s.folder IN "
+            f"(SELECT folder FROM buckets WHERE {clause})",
+            params,
+        ).fetchall()
+
+        matches = []
+        for folder, packed in candidates:
+            score = similarity(signature, struct.unpack(SIGNATURE_FORMAT, packed))
+            if score >= threshold:
+                matches.append((folder, score))
+        matches.sort(key=lambda match: (-match[1], match[0]))
+        return matches[:limit]
+
+
+def record_feature(specs_dir: Path, folder: str, text: str, specs_mtime_before: str) -> None:
+    """
+    Add a newly created feature to the duplicate index, if one has been built.
+    Index problems never fail the issue operation itself.
+    """
+    if not (specs_dir / STATE_DIR_NAME / INDEX_FILE_NAME).exists():
+        return
+    index = DuplicateIndex(specs_dir)
+    try:
+        index.record(folder, text, specs_mtime_before)
+    except sqlite3.Error as error:
+        log_debug(f"Duplicate index not updated: {error}")
+    finally:
+        index.close()
@@ -0,0 +1,78 @@
+"""Filesystem primitives shared by CwAI CLI tools."""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+STATE_DIR_NAME = ".cwai-state"
+
+
+def specs_state_dir(specs_dir: Path) -> Path:
+    """
+    Get the folder holding CwAI bookkeeping files for a specs folder.
+    The folder carries its own .gitignore so its contents never get committed.
+    """
+    state_dir = specs_dir / STATE_DIR_NAME
+    if not state_dir.exists():
+        state_dir.mkdir(parents=True, exist_ok=True)
+        (state_dir / ".gitignore").write_text("*\n")
+    return state_dir
+
+
+@contextmanager
+def file_lock(lock_path: Path, blocking: bool = True) -> Iterator[None]:
+    """
+    Hold an exclusive advisory lock on lock_path for the duration of the block.
+    Without blocking, BlockingIOError is raised when someone else holds the lock.
+    """
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a+b") as handle:
+        if os.name == "nt":
+            import msvcrt
+
+            handle.seek(0)
+            try:
+                msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+            except OSError as error:
+                if blocking:
+                    raise
+                raise BlockingIOError(str(error)) from error
+            try:
+                yield
+            finally:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(
+                handle.fileno(), fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+            )
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def atomic_write_text(path: Path, content: str) -> None:
+    """
+    Write content to path atomically.
+    Data is written to a temporary sibling, fsynced and renamed over the target,
+    so readers never observe a partially written file even if the process crashes.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
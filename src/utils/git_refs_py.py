@@ -0,0 +1,220 @@
+"""Read and write git branch refs directly, without spawning git."""
+
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from utils.repo_context_py import RepoContext
+
+# Files present in the git dir while an operation that owns HEAD is in progress
+IN_PROGRESS_MARKERS = (
+    "index.lock",
+    "HEAD.lock",
+    "MERGE_HEAD",
+    "CHERRY_PICK_HEAD",
+    "REVERT_HEAD",
+    "BISECT_LOG",
+    "rebase-merge",
+    "rebase-apply",
+)
+
+INVALID_REF_CHARS = set(" ~^:?*[\\\x7f")
+
+
+def is_valid_branch_name(name: str) -> bool:
+    """Check a branch name against the rules of `git check-ref-format --branch`."""
+    if not name or name.startswith("-") or name.startswith("/") or name.endswith("/"):
+        return False
+    if name.endswith(".") or name.endswith(".lock") or ".." in name or "@{" in name or name == "@":
+        return False
+    if any(ch in INVALID_REF_CHARS or ord(ch) < 32 for ch in name):
+        return False
+    return all(part and not part.startswith(".") for part in name.split("/"))
+
+
+class RefStore:
+    """
+    Branch refs of one repository.
+
+    Loose refs are looked up with a single stat each time, so they are always fresh.
+    packed-refs is parsed once into an in-memory index and only re-read when its
+    mtime changes.
+    """
+
+    def __init__(self, git_dir: Path, common_dir: Path):
+        self.git_dir = git_dir
+        self.common_dir = common_dir
+        self._packed: Dict[str, str] = {}
+        self._packed_mtime: Optional[int] = None
+
+    def packed_refs(self) -> Dict[str, str]:
+        """Get the ref -> sha index of packed-refs."""
+        packed_path = self.common_dir / "packed-refs"
+        try:
+            mtime = packed_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._packed, self._packed_mtime = {}, None
+            return self._packed
+
+        if mtime != self._packed_mtime:
+            packed = {}
+            with open(packed_path, encoding="utf-8") as f:
+                for line in f:
+                    if line.startswith("#") or line.startswith("^"):
+                        continue
+                    sha, _, ref = line.strip().partition(" ")
+                    if ref:
+                        packed[ref] = sha
+            self._packed, self._packed_mtime = packed, mtime
+        return self._packed
+
+    def resolve(self, ref: str, depth: int = 0) -> Optional[str]:
+        """Resolve a full ref name (or HEAD) to a commit sha, following symbolic refs."""
+        if depth > 5:
+            return None
+        base = self.git_dir if ref == "HEAD" else self.common_dir
+        try:
+            content = (base / ref).read_text(encoding="utf-8").strip()
+        except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+            return self.packed_refs().get(ref)
+        if content.startswith("ref:"):
+            return self.resolve(content[4:].strip(), depth + 1)
+        return content or None
+
+    def branch_exists(self, branch_name: str) -> bool:
+        """Check refs/heads/<name> and refs/remotes/origin/<name>."""
+        return any(
+            self.resolve(ref) is not None
+            for ref in (f"refs/heads/{branch_name}", f"refs/remotes/origin/{branch_name}")
+        )
+
+    def head(self) -> Tuple[Optional[str], Optional[str]]:
+        """Get (symbolic ref or None when detached, commit sha or None when unborn)."""
+        content = (self.git_dir / "HEAD").read_text(encoding="utf-8").strip()
+        if content.startswith("ref:"):
+            ref = content[4:].strip()
+            return ref, self.resolve(ref)
+        return None, content
+
+    def checked_out_elsewhere(self, ref: str) -> bool:
+        """Check whether another worktree of the repository has ref checked out."""
+        heads = [self.common_dir / "HEAD"]
+        worktrees = self.common_dir / "worktrees"
+        if worktrees.is_dir():
+            heads.extend(entry / "HEAD" for entry in worktrees.iterdir())
+        for head in heads:
+            if head.parent == self.git_dir:
+                continue
+            try:
+                if head.read_text(encoding="utf-8").strip() == f"ref: {ref}":
+                    return True
+            except OSError:
+                continue
+        return False
+
+    def is_busy(self) -> bool:
+        """Check whether another git operation currently owns HEAD or the index."""
+        return any((self.git_dir / marker).exists() for marker in IN_PROGRESS_MARKERS)
+
+    def write_ref(self, ref: str, content: str, base: Optional[Path] = None) -> None:
+        """
+        Write a ref using git's lock protocol: create `<ref>.lock` exclusively,
+        write and fsync it, then rename it over the ref.
+        """
+        path = (base or self.common_dir) / ref
+        path.parent.mkdir(parents=True, exist_ok=True)
+        lock_path = path.with_name(path.name + ".lock")
+        fd = os.open(lock_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        try:
+            os.write(fd, f"{content}\n".encode())
+            os.fsync(fd)
+        except BaseException:
+            os.close(fd)
+            lock_path.unlink(missing_ok=True)
+            raise
+        os.close(fd)
+        os.replace(lock_path, path)
+
+    def append_reflog(self, ref: str, old: str, new: str, identity: str, message: str) -> None:
+        """Append a reflog entry the way git does when core.logAllRefUpdates is on."""
+        base = self.git_dir if ref == "HEAD" else self.common_dir
+        log_path = base / "logs" / ref
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        offset = -time.timezone if time.localtime().tm_isdst == 0 else -time.altzone
+        sign = "+" if offset >= 0 else "-"
+        tz = f"{sign}{abs(offset) // 3600:02d}{abs(offset) % 3600 // 60:02d}"
+        line = f"{old} {new} {identity} {int(time.time())} {tz}\t{message}\n"
+        fd = os.open(log_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, line.encode())
+        finally:
+            os.close(fd)
+
+
+NULL_SHA = "0" * 40
+
+
+def ref_only_checkout(
+    context: RepoContext, store: RefStore, branch_name: str, create: bool
+) -> bool:
+    """
+    Switch HEAD to a branch by writing refs only, without touching the worktree.
+
+    A new branch is created at the current HEAD commit; an existing branch is only
+    switched to when it points at the HEAD commit. In both cases index and worktree
+    already match the target, so local changes carry over exactly as with
+    `git checkout`. Returns False whenever git itself should do the work instead.
+    """
+    if not is_valid_branch_name(branch_name) or store.is_busy():
+        return False
+
+    current_ref, head_sha = store.head()
+    if head_sha is None:
+        return False
+
+    target_ref = f"refs/heads/{branch_name}"
+    target_sha = store.resolve(target_ref)
+    if create:
+        if target_sha is not None:
+            return False
+    elif target_sha != head_sha or store.checked_out_elsewhere(target_ref):
+        return False
+
+    identity = f"{context.user_name or 'Unknown User'} <{context.user_email or ''}>"
+    log_updates = context.config.get("core.logallrefupdates", "true") != "false"
+    from_name = current_ref.rsplit("refs/heads/", 1)[-1] if current_ref else head_sha
+
+    if create:
+        store.write_ref(target_ref, head_sha)
+        if log_updates:
+            store.append_reflog(
+                target_ref, NULL_SHA, head_sha, identity, f"branch: Created from {from_name}"
+            )
+    store.write_ref("HEAD", f"ref: {target_ref}", base=store.git_dir)
+    if log_updates:
+        store.append_reflog(
+            "HEAD",
+            head_sha,
+            head_sha,
+            identity,
+            f"checkout: moving from {from_name} to {branch_name}",
+        )
+    return True
+
+
+_stores: Dict[Path, RefStore] = {}
+
+
+def get_ref_store(context: RepoContext) -> Optional[RefStore]:
+    """
+    Get the process-wide ref store for a repository, or None when refs cannot be
+    read directly (no repository, git environment overrides, reftable storage).
+    """
+    if context.git_dir is None or context.exotic:
+        return None
+    if context.config.get("extensions.refstorage", "files") != "files":
+        return None
+    if context.git_dir not in _stores:
+        _stores[context.git_dir] = RefStore(context.git_dir, context.common_dir)
+    return _stores[context.git_dir]
@@ -0,0 +1,260 @@
+"""GitHub issue manager talking to the REST API over pooled keep-alive connections."""
+
+import asyncio
+import http.client
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, List, Optional, Tuple
+from urllib.parse import quote, urlencode, urlsplit
+
+from utils.github_issue_manager_py import GitHubIssueManager, find_marked_issue
+from utils.repo_context_py import RepoContext, get_repo_context
+from utils.trace_py import span
+
+DEFAULT_API_URL = "https://api.github.com"
+
+# Idle connections kept per client; requests beyond this open extra short-lived ones
+POOL_SIZE = 8
+
+REMOTE_URL_PATTERN = re.compile(r"[:/]([^/:]+)/([^/]+?)(?:\.git)?/?$")
+
+# Methods safe to send twice; others are only retried when they never left the client
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+DROPPED_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+
+class GitHubAPIError(Exception):
+    """Raised when the GitHub API answers with an error status."""
+
+    def __init__(
+        self, status: int, method: str, path: str, body: str, retry_after: Optional[float] = None
+    ):
+        self.status = status
+        self.body = body
+        # Seconds GitHub asks us to wait before retrying, when it says so
+        self.retry_after = retry_after
+        super().__init__(f"{method} {path} failed with HTTP {status}: {body[:200]}")
+
+
+class GitHubAPIConfigError(Exception):
+    """Raised when the REST API backend lacks the repository or the token it needs."""
+
+
+def resolve_repo_slug(context: RepoContext) -> Optional[str]:
+    """Get 'owner/repo' from GH_REPO, or from the origin remote like gh does."""
+    gh_repo = os.environ.get("GH_REPO")
+    if gh_repo:
+        # GH_REPO may be [HOST/]OWNER/REPO
+        return "/".join(gh_repo.strip("/").split("/")[-2:])
+    match = REMOTE_URL_PATTERN.search(context.config.get("remote.origin.url", ""))
+    if match:
+        return f"{match.group(1)}/{match.group(2)}"
+    return None
+
+
+def parse_retry_after(response: http.client.HTTPResponse) -> Optional[float]:
+    """Get how long a rate-limited response asks us to wait, in seconds."""
+    retry_after = response.getheader("Retry-After")
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    reset = response.getheader("X-RateLimit-Reset")
+    if response.getheader("X-RateLimit-Remaining") == "0" and reset and reset.isdigit():
+        return max(0.0, int(reset) - time.time())
+    return None
+
+
+class GitHubAPIClient:
+    """
+    Minimal JSON client over a pool of persistent HTTP/1.1 connections.
+
+    Connections are reused across requests, so one process pays for a single TLS
+    handshake per concurrently used connection instead of one per call. Requests
+    are blocking and run in worker threads to keep the event loop free.
+    """
+
+    def __init__(self, base_url: str, token: str, timeout: Optional[float] = None):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme or "https"
+        self.host = parts.netloc
+        self.prefix = parts.path.rstrip("/")
+        self.token = token
+        self.timeout = timeout or float(os.environ.get("CWAI_COMMAND_TIMEOUT", "120"))
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+
+    def _acquire(self) -> Tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        connection_class = (
+            http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        )
+        return connection_class(self.host, timeout=self.timeout), False
+
+    def _release(self, connection: http.client.HTTPConnection) -> None:
+        with self._lock:
+            if len(self._idle) < POOL_SIZE:
+                self._idle.append(connection)
+                return
+        connection.close()
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+    def request_sync(self, method: str, path: str, payload: Any = None) -> Any:
+        """Send one request and return the decoded JSON response (None when empty)."""
+        body = json.dumps(payload).encode() if payload is not None else None
+        headers = {
+            "Accept": "application/vnd.github+json",
+            "Authorization": f"Bearer {self.token}",
+            "User-Agent": "cwai",
+            "X-GitHub-Api-Version": "2022-11-28",
+        }
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+
+        # Issue numbers are folded out of the span name so the summary groups requests
+        route = re.sub(r"/\d+(?=/|$)", "/:number", path.split("?")[0])
+        with span(f"{method} {route}", "http") as trace_args:
+            while True:
+                connection, reused = self._acquire()
+                sent = False
+                try:
+                    connection.request(method, self.prefix + path, body=body, headers=headers)
+                    sent = True
+                    response = connection.getresponse()
+                    data = response.read()
+                except DROPPED_CONNECTION_ERRORS:
+                    connection.close()
+                    # The server dropped an idle keep-alive connection; use a fresh one,
+                    # unless it may have acted on a request that is unsafe to repeat
+                    if reused and (not sent or method in IDEMPOTENT_METHODS):
+                        continue
+                    raise
+                except BaseException:
+                    connection.close()
+                    raise
+                break
+
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(connection)
+            trace_args["status"] = response.status
+
+        text = data.decode("utf-8", errors="replace")
+        if response.status >= 400:
+            raise GitHubAPIError(
+                response.status, method, path, text, retry_after=parse_retry_after(response)
+            )
+        return json.loads(text) if text else None
+
+    async def request(self, method: str, path: str, payload: Any = None) -> Any:
+        """Send one request from async code."""
+        return await asyncio.to_thread(self.request_sync, method, path, payload)
+
+
+class GitHubAPIIssueManager(GitHubIssueManager):
+    """GitHub issue manager using the REST API instead of the gh CLI."""
+
+    unavailable_errors = (GitHubAPIError, OSError, http.client.HTTPException)
+
+    def __init__(
+        self, context: Optional[RepoContext] = None, client: Optional[GitHubAPIClient] = None
+    ):
+        context = context or get_repo_context()
+        self.repo = resolve_repo_slug(context)
+        if not self.repo:
+            raise GitHubAPIConfigError(
+                "Cannot tell the GitHub repository: set GH_REPO=owner/repo or add an origin remote"
+            )
+        token = os.environ.get("GH_TOKEN") or os.environ.get("GITHUB_TOKEN")
+        if client is None and not token:
+            raise GitHubAPIConfigError(
+                "GH_TOKEN (or GITHUB_TOKEN) is required for CWAI_ISSUE_MANAGER=github-api"
+            )
+        self.api_url = os.environ.get("CWAI_GITHUB_API_URL", DEFAULT_API_URL).rstrip("/")
+        self.client = client or GitHubAPIClient(self.api_url, token)
+        super().__init__(context)
+
+    def label_cache_key(self) -> str:
+        return f"{self.api_url}/{self.repo}"
+
+    async def list_labels(self) -> List[str]:
+        names: List[str] = []
+        page = 1
+        while True:
+            labels = await self.client.request(
+                "GET", f"/repos/{self.repo}/labels?per_page=100&page={page}"
+            )
+            names.extend(label["name"] for label in labels)
+            if len(labels) < 100:
+                return names
+            page += 1
+
+    async def create_remote_label(self, name: str, color: str, description: str) -> None:
+        payload = {"name": name, "color": color}
+        if description:
+            payload["description"] = description
+        await self.client.request("POST", f"/repos/{self.repo}/labels", payload)
+
+    async def create_remote_issue(
+        self, title: str, body: str, labels: List[str]
+    ) -> Tuple[int, str]:
+        issue = await self.client.request(
+            "POST", f"/repos/{self.repo}/issues", {"title": title, "body": body, "labels": labels}
+        )
+        return issue["number"], issue["html_url"]
+
+    async def find_remote_issue(self, marker: str, since: str) -> Optional[Tuple[int, str]]:
+        query = urlencode({"state": "all", "since": since, "per_page": 100})
+        issues = await self.client.request("GET", f"/repos/{self.repo}/issues?{query}")
+        return find_marked_issue(issues, marker)
+
+    async def add_remote_labels(self, feature_id: int, labels: List[str]) -> None:
+        await self.client.request(
+            "POST", f"/repos/{self.repo}/issues/{feature_id}/labels", {"labels": labels}
+        )
+
+    async def remove_remote_labels(self, feature_id: int, labels: List[str]) -> None:
+        async def remove(label: str) -> None:
+            try:
+                path = f"/repos/{self.repo}/issues/{feature_id}/labels/{quote(label, safe='')}"
+                await self.client.request("DELETE", path)
+            except GitHubAPIError as error:
+                # Removing a label the issue does not carry is not an error for us
+                if error.status != 404:
+                    raise
+
+        await asyncio.gather(*(remove(label) for label in labels))
+
+    async def add_remote_comment(self, feature_id: int, body: str) -> None:
+        await self.client.request(
+            "POST", f"/repos/{self.repo}/issues/{feature_id}/comments", {"body": body}
+        )
+
+    def is_label_conflict(self, error: Exception) -> bool:
+        return (
+            isinstance(error, GitHubAPIError)
+            and error.status == 422
+            and "already_exists" in error.body
+        )
+
+    def is_rate_limited(self, error: Exception) -> bool:
+        return (
+            isinstance(error, GitHubAPIError)
+            and error.status in (403, 429)
+            and (error.retry_after is not None or "rate limit" in error.body.lower())
+        )
+
+    def is_missing_label(self, error: Exception) -> bool:
+        # The REST API creates unknown labels on issue creation instead of failing
+        return False
@@ -0,0 +1,352 @@
+"""GitHub issue manager backed by the gh CLI."""
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import subprocess
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from utils.fs_py import atomic_write_text
+from utils.helpers_py import get_cache_dir
+from utils.issue_manager_py import LocalFSIssueManager
+from utils.logger_py import log_info
+from utils.process_py import run_command
+from utils.repo_context_py import RepoContext, get_repo_context
+
+# gh reports both the primary and the secondary (abuse) limits in its error output
+RATE_LIMITED = re.compile(r"rate limit|submitted too quickly", re.I)
+
+# How gh reports an unknown label on issue create, as opposed to e.g. an unknown repository
+MISSING_LABEL = re.compile(r"could not add label: '.*' not found")
+
+
+def find_marked_issue(issues: List[dict], marker: str) -> Optional[Tuple[int, str]]:
+    """Get (number, URL) of the first issue whose body contains marker."""
+    for issue in issues:
+        if marker in (issue.get("body") or ""):
+            return issue["number"], issue["html_url"]
+    return None
+
+
+def generate_hex_color() -> str:
+    """Generate a random hex color."""
+    random_int = random.randint(0, 16777216)
+    return f"{random_int:06X}"
+
+
+class LabelCache:
+    """
+    Set of repository label names, loaded once per process.
+
+    When a TTL is configured the set is also persisted under the user cache dir, so
+    later runs within the TTL skip listing labels entirely.
+    """
+
+    def __init__(self, loader, cache_path: Optional[Path] = None, ttl: float = 0):
+        self.loader = loader
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self._labels: Optional[set] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop = None
+
+    async def get(self) -> set:
+        """Return the cached label set, loading it on first use or after invalidation."""
+        async with self._get_lock():
+            if self._labels is None:
+                self._labels = self._read_persisted()
+            if self._labels is None:
+                self._labels = set(await self.loader())
+                self._persist()
+            return self._labels
+
+    def add(self, label_name: str) -> None:
+        """Record a label created by this process."""
+        if self._labels is not None:
+            self._labels.add(label_name)
+            self._persist()
+
+    def invalidate(self) -> None:
+        """Forget the cached labels so the next lookup lists them again."""
+        self._labels = None
+        if self.cache_path:
+            self.cache_path.unlink(missing_ok=True)
+
+    def _get_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock, self._lock_loop = asyncio.Lock(), loop
+        return self._lock
+
+    def _read_persisted(self) -> Optional[set]:
+        if not self.cache_path or self.ttl <= 0:
+            return None
+        try:
+            with open(self.cache_path) as f:
+                data = json.load(f)
+            if time.time() - data["fetched_at"] > self.ttl:
+                return None
+            return set(data["labels"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _persist(self) -> None:
+        if not self.cache_path or self.ttl <= 0 or self._labels is None:
+            return
+        try:
+            atomic_write_text(
+                self.cache_path,
+                json.dumps({"fetched_at": time.time(), "labels": sorted(self._labels)}),
+            )
+        except OSError:
+            # The on-disk copy is only an optimization
+            pass
+
+
+_label_caches: Dict[str, LabelCache] = {}
+
+
+def get_label_cache(repo_key: str, loader) -> LabelCache:
+    """Get the process-wide label cache for a repository."""
+    if repo_key not in _label_caches:
+        ttl = float(os.environ.get("CWAI_LABEL_CACHE_TTL", "300"))
+        digest = hashlib.sha1(repo_key.encode()).hexdigest()[:16]
+        cache_path = get_cache_dir() / f"labels-{digest}.json"
+        _label_caches[repo_key] = LabelCache(loader, cache_path, ttl)
+    return _label_caches[repo_key]
+
+
+class GitHubIssueManager:
+    """
+    GitHub-based issue manager using gh CLI.
+
+    The remote operations are small methods so other transports (see
+    github_api_issue_manager_py) can reuse the label handling and localfs mirroring.
+    """
+
+    # Errors meaning GitHub cannot be reached at all; labelling is skipped silently
+    unavailable_errors: Tuple[type, ...] = (subprocess.CalledProcessError, FileNotFoundError)
+
+    def __init__(self, context: Optional[RepoContext] = None):
+        self.context = context or get_repo_context()
+        self.localfs_manager = LocalFSIssueManager(self.context)
+        self.labels = get_label_cache(self.label_cache_key(), self.list_labels)
+
+    def label_cache_key(self) -> str:
+        """Key identifying the repository's label set."""
+        return str(self.context.root)
+
+    async def list_labels(self) -> List[str]:
+        """List repository label names."""
+        result = await run_command(
+            ["gh", "label", "list", "--limit", "1000", "--json", "name", "--jq", ".[].name"]
+        )
+        return [name for name in result.stdout.split("\n") if name]
+
+    async def create_remote_label(self, name: str, color: str, description: str) -> None:
+        """Create one label on GitHub."""
+        args = ["gh", "label", "create", name, "--color", color]
+        if description:
+            args.extend(["--description", description])
+        await run_command(args)
+
+    async def create_remote_issue(
+        self, title: str, body: str, labels: List[str]
+    ) -> Tuple[int, str]:
+        """Create an issue on GitHub and return its number and URL."""
+        label_args = []
+        for label in labels:
+            label_args.extend(["--label", label])
+        result = await run_command(
+            ["gh", "issue", "create", "--title", title, "--body", body, *label_args]
+        )
+        issue_url = result.stdout.strip()
+        return int(issue_url.split("/")[-1]), issue_url
+
+    async def find_remote_issue(self, marker: str, since: str) -> Optional[Tuple[int, str]]:
+        """Find an issue updated since the ISO time whose body contains marker."""
+        result = await run_command(
+            [
+                "gh",
+                "api",
+                f"repos/{{owner}}/{{repo}}/issues?state=all&since={since}&per_page=100",
+            ]
+        )
+        return find_marked_issue(json.loads(result.stdout or "[]"), marker)
+
+    async def add_remote_labels(self, feature_id: int, labels: List[str]) -> None:
+        """Add labels to an issue."""
+        await run_command(["gh", "issue", "edit", str(feature_id), "--add-label", ",".join(labels)])
+
+    async def remove_remote_labels(self, feature_id: int, labels: List[str]) -> None:
+        """Remove labels from an issue."""
+        await run_command(
+            ["gh", "issue", "edit", str(feature_id), "--remove-label", ",".join(labels)]
+        )
+
+    async def add_remote_comment(self, feature_id: int, body: str) -> None:
+        """Comment on an issue."""
+        await run_command(["gh", "issue", "comment", str(feature_id), "--body", body])
+
+    def is_label_conflict(self, error: Exception) -> bool:
+        """Check whether a label create failed because the label already exists."""
+        return "already exists" in (getattr(error, "stderr", None) or "")
+
+    def is_missing_label(self, error: Exception) -> bool:
+        """Check whether an issue create failed because a label does not exist."""
+        return bool(MISSING_LABEL.search(getattr(error, "stderr", None) or ""))
+
+    async def create_label(
+        self, label_name: str, label_color: str = "", label_description: str = ""
+    ) -> None:
+        """Create a GitHub label if it doesn't exist."""
+        await self.ensure_labels({label_name: (label_color, label_description)})
+
+    async def ensure_labels(self, labels: Dict[str, Tuple[str, str]]) -> None:
+        """
+        Make sure every label exists, given as name -> (color, description).
+        Costs at most one label listing plus one parallel create per missing label.
+        """
+        try:
+            existing_labels = await self.labels.get()
+        except self.unavailable_errors:
+            # Silently ignore if GitHub is not available
+            return
+
+        missing = {
+            name: spec for name, spec in labels.items() if name and name not in existing_labels
+        }
+        await asyncio.gather(
+            *(self._create_missing_label(name, *spec) for name, spec in missing.items())
+        )
+
+    async def _create_missing_label(
+        self, label_name: str, label_color: str, label_description: str
+    ) -> None:
+        log_info(f"🏷️  Creating label: {label_name}")
+        try:
+            await self.create_remote_label(
+                label_name, label_color or generate_hex_color(), label_description
+            )
+            self.labels.add(label_name)
+        except self.unavailable_errors as error:
+            if self.is_label_conflict(error):
+                # Someone else created it; our view of the labels is stale
+                self.labels.invalidate()
+
+    async def create_remote_feature_issue(
+        self, feature_title: str, feature_body: str, feature_labels: List[str]
+    ) -> Tuple[int, str]:
+        """Create the GitHub issue of a feature, with its labels, and return its number and URL."""
+        # Ensure required and additional labels exist
+        labels = {
+            "task": ("0e8a16", "Task item"),
+            "auto-generated": ("bfd4f2", "Automatically generated by script"),
+        }
+        for label in feature_labels:
+            if label:
+                labels.setdefault(label, ("", ""))
+        await self.ensure_labels(labels)
+
+        try:
+            feature_id, issue_url = await self.create_remote_issue(
+                feature_title, feature_body, list(labels)
+            )
+        except self.unavailable_errors as error:
+            if not self.is_missing_label(error):
+                raise
+            # A persisted label cache may still list labels deleted since; refresh and retry
+            self.labels.invalidate()
+            await self.ensure_labels(labels)
+            feature_id, issue_url = await self.create_remote_issue(
+                feature_title, feature_body, list(labels)
+            )
+
+        log_info(f"🏷️  Created Github issue: {issue_url}")
+        return feature_id, issue_url
+
+    async def edit_remote_labels(self, feature_id: int, feature_labels: List[str]) -> None:
+        """Apply label changes ("-x" removes x) to an issue, creating missing labels first."""
+        add_labels = []
+        remove_labels = []
+
+        for label in feature_labels:
+            if label.startswith("-"):
+                remove_labels.append(label[1:])
+            elif label:
+                add_labels.append(label)
+
+        await self.ensure_labels({label: ("", "") for label in add_labels})
+
+        async def add() -> None:
+            await self.add_remote_labels(feature_id, add_labels)
+            log_info(f"🏷️  Added labels to issue #{feature_id}: {', '.join(add_labels)}")
+
+        async def remove() -> None:
+            await self.remove_remote_labels(feature_id, remove_labels)
+            log_info(f"🏷️  Removed labels from issue #{feature_id}: {', '.join(remove_labels)}")
+
+        await asyncio.gather(
+            *([add()] if add_labels else []),
+            *([remove()] if remove_labels else []),
+        )
+
+    def is_rate_limited(self, error: Exception) -> bool:
+        """Check whether a request was refused by GitHub's (secondary) rate limits."""
+        return bool(RATE_LIMITED.search(getattr(error, "stderr", None) or ""))
+
+    async def create_issue(
+        self,
+        feature_slug: str,
+        feature_title: str,
+        feature_parent_dir: Path,
+        feature_labels: List[str],
+        feature_body: str,
+    ) -> int:
+        """Create a new GitHub issue."""
+        # Resolve the local author while GitHub is busy
+        author_task = asyncio.ensure_future(self.localfs_manager.get_author())
+
+        feature_id, _ = await self.create_remote_feature_issue(
+            feature_title, feature_body, feature_labels
+        )
+
+        await author_task
+        await self.localfs_manager.create_issue(
+            feature_slug,
+            feature_title,
+            feature_parent_dir,
+            feature_labels,
+            feature_body,
+            feature_id=feature_id,
+        )
+
+        return feature_id
+
+    async def update_issue(
+        self,
+        feature_id: int,
+        feature_name: str,
+        feature_dir: Path,
+        feature_labels: List[str],
+        feature_comment: str,
+    ) -> None:
+        """Update an existing GitHub issue."""
+        author_task = asyncio.ensure_future(self.localfs_manager.get_author())
+
+        async def comment() -> None:
+            await self.add_remote_comment(feature_id, feature_comment)
+            log_info(f"💬 Added comment to Github issue #{feature_id}")
+
+        # Label edits and the comment are independent of each other
+        await asyncio.gather(self.edit_remote_labels(feature_id, feature_labels), comment())
+
+        await author_task
+        await self.localfs_manager.update_issue(
+            feature_id, feature_name, feature_dir, feature_labels, feature_comment
+        )
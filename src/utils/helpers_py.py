@@ -1,11 +1,15 @@
 """Utility functions for CwAI CLI tools."""
 
+import asyncio
 import os
 import re
-import subprocess
 from pathlib import Path
 from typing import List, Optional
 
+from utils.git_refs_py import get_ref_store, ref_only_checkout
+from utils.process_py import run_command
+from utils.repo_context_py import RepoContext, get_repo_context
+
 
 def requirement_to_title(requirement: str) -> str:
     """Convert a requirement string to a title by extracting first 5 words."""
@@ -22,13 +26,13 @@ def title_to_slug(title: str) -> str:
 
 
 def padd_feature_id(feature_id: int) -> str:
-    """Pad feature ID to 5 digits with leading zeros."""
+    """Pad feature ID to at least 5 digits with leading zeros (IDs past 99999 grow wider)."""
     return str(feature_id).zfill(5)
 
 
 def extract_feature_id(feature_name: str) -> int:
-    """Extract feature ID from a feature name like '00001-my-feature'."""
-    match = re.match(r"^(\d{5})", feature_name)
+    """Extract feature ID from a feature name like '00001-my-feature' or '123456-big'."""
+    match = re.match(r"^(\d{5,})(?!\d)", feature_name)
     if not match:
         return 0
     return int(match.group(1))
@@ -36,7 +40,7 @@ def extract_feature_id(feature_name: str) -> int:
 
 def detect_feature_name(requirement: str) -> Optional[str]:
     """Detect existing feature name in requirement string."""
-    match = re.search(r"\d{5}-[a-z0-9][a-z0-9-]*", requirement)
+    match = re.search(r"\d{5,}-[a-z0-9][a-z0-9-]*", requirement)
     if not match:
         return None
     return match.group(0)
@@ -89,66 +93,135 @@ def get_absolute_path(input_path: str) -> Path:
     return path.resolve()
 
 
+def get_cache_dir() -> Path:
+    """
+    Get the per-user CwAI cache directory.
+    Honors CWAI_CACHE_DIR, then XDG_CACHE_HOME (or LOCALAPPDATA on Windows).
+    """
+    if os.environ.get("CWAI_CACHE_DIR"):
+        return Path(os.environ["CWAI_CACHE_DIR"]).expanduser()
+    if os.name == "nt" and os.environ.get("LOCALAPPDATA"):
+        return Path(os.environ["LOCALAPPDATA"]) / "cwai" / "cache"
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "cwai"
+
+
 def get_repo_root() -> Path:
     """
     Get the repository root directory.
-    First tries using git to find the repository root, then falls back to current directory.
+    Walks up to the folder containing .git (without spawning git), falling back to the
+    current directory outside of a repository.
     """
-    try:
-        # Use git to find the repository root (the folder containing .git)
-        result = subprocess.run(
-            ["git", "rev-parse", "--show-toplevel"],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-        return Path(result.stdout.strip())
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        # If git command fails (not in a git repo or git not installed), use current working directory
-        return Path.cwd()
+    return get_repo_context().root
 
 
-async def git_branch_exists(branch_name: str) -> bool:
+async def git_branch_exists(branch_name: str, context: Optional[RepoContext] = None) -> bool:
     """Check if a git branch exists locally or remotely."""
-    try:
-        subprocess.run(
-            ["git", "rev-parse", "--verify", "--quiet", f"refs/heads/{branch_name}"],
-            capture_output=True,
-            check=True,
+    store = get_ref_store(context or get_repo_context())
+    if store is not None:
+        return store.branch_exists(branch_name)
+
+    results = await asyncio.gather(
+        *(
+            run_command(["git", "rev-parse", "--verify", "--quiet", ref], check=False)
+            for ref in (f"refs/heads/{branch_name}", f"refs/remotes/origin/{branch_name}")
         )
-        return True
-    except subprocess.CalledProcessError:
-        try:
-            subprocess.run(
-                ["git", "rev-parse", "--verify", "--quiet", f"refs/remotes/origin/{branch_name}"],
-                capture_output=True,
-                check=True,
-            )
-            return True
-        except subprocess.CalledProcessError:
-            return False
-
-
-async def git_checkout(branch_name: str, create: bool = False) -> None:
-    """Checkout or create a git branch."""
+    )
+    return any(result.returncode == 0 for result in results)
+
+
+async def git_checkout(
+    branch_name: str, create: bool = False, context: Optional[RepoContext] = None
+) -> None:
+    """
+    Checkout or create a git branch.
+    With CWAI_GIT_REF_ONLY=1, branches at the current commit are switched to by writing
+    refs directly instead of running git checkout.
+    """
+    if os.environ.get("CWAI_GIT_REF_ONLY", "").lower() in ("1", "true", "yes"):
+        context = context or get_repo_context()
+        store = get_ref_store(context)
+        if store is not None and ref_only_checkout(context, store, branch_name, create):
+            return
+
     cmd = ["git", "checkout"]
     if create:
         cmd.append("-b")
     cmd.append(branch_name)
-    
-    subprocess.run(cmd, check=True, capture_output=True)
+
+    await run_command(cmd)
+
+
+def worktree_enabled() -> bool:
+    """Check whether features get their own git worktree (CWAI_WORKTREE)."""
+    return os.environ.get("CWAI_WORKTREE", "").lower() in ("1", "on", "true", "yes")
+
+
+def get_specs_root(context: Optional[RepoContext] = None, worktree: Optional[bool] = None) -> Path:
+    """
+    Get the checkout whose specs folder holds the features and their state. In
+    worktree mode that is the main worktree, also when run from inside a feature's
+    worktree, so every worktree shares one set of issues and one ID counter.
+    """
+    context = context or get_repo_context()
+    if worktree is None:
+        worktree = worktree_enabled()
+    return context.main_root if worktree else context.root
+
+
+def get_worktree_dir(repo_root: Path) -> Path:
+    """
+    Get the folder feature worktrees are created in: CWAI_WORKTREE_DIR (relative
+    paths are taken from the repository root), or <repo>.worktrees next to the repository.
+    """
+    configured = os.environ.get("CWAI_WORKTREE_DIR")
+    if configured:
+        return repo_root / os.path.expanduser(configured)
+    return repo_root.parent / f"{repo_root.name}.worktrees"
+
+
+async def find_branch_worktree(branch_name: str, repo_root: Path) -> Optional[Path]:
+    """Get the worktree (possibly the main working tree) the branch is checked out in."""
+    listing = await run_command(["git", "worktree", "list", "--porcelain"], cwd=str(repo_root))
+    path = None
+    for line in listing.stdout.splitlines():
+        if line.startswith("worktree "):
+            path = line[len("worktree ") :]
+        elif line == f"branch refs/heads/{branch_name}" and path:
+            return Path(path)
+    return None
+
+
+async def git_worktree(branch_name: str, create: bool, repo_root: Path) -> Path:
+    """
+    Get a worktree with the branch checked out, reusing the one it is already
+    checked out in (possibly the main working tree) and adding one otherwise.
+    The main working tree is never switched, so other features keep working there.
+    """
+    existing = await find_branch_worktree(branch_name, repo_root)
+    if existing:
+        return existing
+
+    target = get_worktree_dir(repo_root) / branch_name
+    cmd = ["git", "worktree", "add"]
+    cmd += ["-b", branch_name, str(target)] if create else [str(target), branch_name]
+    await run_command(cmd, cwd=str(repo_root))
+    return target
 
 
 def load_environment(repo_root: Path) -> None:
     """Load environment variables from .env and .env.local files."""
-    from dotenv import load_dotenv
-
     env_file = repo_root / ".env"
     env_local_file = repo_root / ".env.local"
 
+    if not env_file.exists() and not env_local_file.exists():
+        return
+
+    from dotenv import load_dotenv
+
     if env_file.exists():
         load_dotenv(env_file)
-    
+
     if env_local_file.exists():
         load_dotenv(env_local_file, override=True)
 
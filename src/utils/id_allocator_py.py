@@ -0,0 +1,82 @@
+"""Persistent feature ID allocator for the localfs issue manager."""
+
+from pathlib import Path
+from typing import Tuple
+
+from utils.fs_py import atomic_write_text, file_lock, specs_state_dir
+from utils.helpers_py import extract_feature_id
+from utils.specs_layout_py import iter_feature_dirs, specs_signature
+
+COUNTER_FILE_NAME = "next-feature-id"
+
+
+class FeatureIdAllocator:
+    """
+    Hand out feature IDs from a counter file kept under the specs folder.
+
+    Allocation is O(1): the counter is read and bumped under an exclusive file lock,
+    so concurrent `cwai-create-feature` runs never receive the same ID. The counter is
+    replaced atomically, so a crash can at worst leave a gap in the sequence.
+
+    The counter is not committed, so folders can appear that it never handed out
+    (a pull, a merge, a branch switch). It stores the specs folder signature it was
+    last checked against; when the signature differs, the folders are scanned again
+    and the counter moves past the highest ID found.
+    """
+
+    def __init__(self, specs_dir: Path):
+        self.specs_dir = Path(specs_dir)
+        self.state_dir = specs_state_dir(self.specs_dir)
+        self.counter_path = self.state_dir / COUNTER_FILE_NAME
+        self.lock_path = self.state_dir / f"{COUNTER_FILE_NAME}.lock"
+
+    def allocate(self) -> int:
+        """Reserve and return the next free feature ID."""
+        with file_lock(self.lock_path):
+            feature_id, signature = self._read_counter()
+            self._write_counter(feature_id + 1, signature)
+        return feature_id
+
+    def observe(self, feature_id: int) -> None:
+        """Make sure an externally assigned ID (e.g. a GitHub issue number) is never reused."""
+        with file_lock(self.lock_path):
+            next_id, signature = self._read_counter()
+            if next_id <= feature_id:
+                self._write_counter(feature_id + 1, signature)
+
+    def record_created(self, specs_signature_before: str) -> None:
+        """
+        Note that the caller created the folder of an ID it was just given, so the
+        next allocation does not rescan because of it.
+        """
+        with file_lock(self.lock_path):
+            next_id, signature = self._read_counter(rescan=False)
+            # Only our own folder appeared since the counter was last checked
+            if signature == specs_signature_before:
+                self._write_counter(next_id, specs_signature(self.specs_dir))
+
+    def _read_counter(self, rescan: bool = True) -> Tuple[int, str]:
+        """Read the next ID and the signature it is valid for, rescanning when stale."""
+        next_id, signature = 0, ""
+        try:
+            fields = self.counter_path.read_text().split()
+            next_id = max(0, int(fields[0]))
+            signature = fields[1] if len(fields) > 1 else ""
+        except (FileNotFoundError, IndexError, ValueError):
+            pass
+        if not rescan:
+            return next_id, signature
+        current = specs_signature(self.specs_dir)
+        if next_id and signature == current:
+            return next_id, signature
+        return max(next_id, self._highest_in_specs() + 1), current
+
+    def _write_counter(self, next_id: int, signature: str) -> None:
+        atomic_write_text(self.counter_path, f"{next_id} {signature}\n")
+
+    def _highest_in_specs(self) -> int:
+        """Get the highest ID among the existing NNNNN-slug folders."""
+        highest = 0
+        for _, entry in iter_feature_dirs(self.specs_dir):
+            highest = max(highest, extract_feature_id(entry.name))
+        return highest
@@ -0,0 +1,302 @@
+"""SQLite index of local issue metadata, kept under the specs state folder."""
+
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.fs_py import STATE_DIR_NAME, specs_state_dir
+from utils.helpers_py import concatenate_arrays
+from utils.issue_manager_py import COMMENTS_JOURNAL, load_issue
+from utils.logger_py import log_debug
+from utils.specs_layout_py import iter_feature_dirs
+from utils.sqlite_issue_manager_py import stored_issue_revisions
+
+INDEX_FILE_NAME = "index.sqlite"
+
+# Bump when the schema changes; older index files are rebuilt from scratch
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS features (
+    folder TEXT PRIMARY KEY,
+    id INTEGER,
+    title TEXT,
+    author TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    comment_count INTEGER,
+    issue_mtime INTEGER,
+    journal_mtime INTEGER
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS features_updated_at ON features (updated_at);
+CREATE INDEX IF NOT EXISTS features_id ON features (id);
+-- updated_at is repeated here so label + date queries are a single index range scan
+CREATE TABLE IF NOT EXISTS labels (
+    label TEXT,
+    folder TEXT,
+    updated_at TEXT,
+    PRIMARY KEY (label, folder)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS labels_updated_at ON labels (label, updated_at);
+CREATE INDEX IF NOT EXISTS labels_folder ON labels (folder);
+"""
+
+
+def mtime_ns(path: Path) -> int:
+    """Get the mtime of path in nanoseconds, or 0 if it does not exist."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except (FileNotFoundError, NotADirectoryError):
+        return 0
+
+
+def issue_mtimes(feature_dir: Path, revision: int = 0) -> Tuple[int, int]:
+    """
+    Get what an index row remembers of a feature's issue: the mtimes of issue.json
+    and comments.jsonl, or (0, revision) for an issue kept only in the SQLite store.
+    """
+    issue_mtime = mtime_ns(feature_dir / "issue.json")
+    if not issue_mtime:
+        return 0, revision
+    return issue_mtime, mtime_ns(feature_dir / COMMENTS_JOURNAL)
+
+
+class IssueIndex:
+    """
+    Queryable copy of every feature's issue metadata.
+
+    Rows remember the mtimes of issue.json and comments.jsonl they were read from
+    (the store revision, for issues the sqlite manager keeps without issue.json).
+    The issue managers update rows in place as they write. `refresh` stats those
+    two files in every feature folder and re-reads only the folders that were
+    added, removed or changed since, whether by hand, a git pull or a branch switch.
+    """
+
+    def __init__(self, specs_dir: Path):
+        self.specs_dir = Path(specs_dir)
+        self.path = specs_state_dir(self.specs_dir) / INDEX_FILE_NAME
+        self._db: Optional[sqlite3.Connection] = None
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        if self._db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            if db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                db.executescript(
+                    "DROP TABLE IF EXISTS features; DROP TABLE IF EXISTS labels; "
+                    "DROP TABLE IF EXISTS meta;"
+                )
+                db.executescript(SCHEMA)
+                db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            self._db = db
+        return self._db
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _changes(self, full: bool = False) -> Tuple[List[str], List[Tuple[str, Tuple[int, int]]]]:
+        """Get the folders gone from disk, and the (folder, mtimes) to re-read."""
+        stored: Dict[str, Tuple[int, int]] = {
+            folder: (issue_mtime, journal_mtime)
+            for folder, issue_mtime, journal_mtime in self.db.execute(
+                "SELECT folder, issue_mtime, journal_mtime FROM features"
+            )
+        }
+
+        revisions = stored_issue_revisions(self.specs_dir)
+        seen = set()
+        changed = []
+        for relative, entry in iter_feature_dirs(self.specs_dir):
+            mtimes = issue_mtimes(Path(entry.path), revisions.get(relative, 0))
+            if mtimes == (0, 0):
+                continue
+            seen.add(relative)
+            if full or stored.get(relative) != mtimes:
+                changed.append((relative, mtimes))
+        return sorted(stored.keys() - seen), changed
+
+    def is_stale(self) -> bool:
+        """Check whether any feature's issue was added, removed or changed since it was read."""
+        removed, changed = self._changes()
+        return bool(removed or changed)
+
+    def refresh(self, full: bool = False) -> int:
+        """
+        Re-read the features whose issue files changed and drop removed ones; with
+        full set, re-read every feature. Returns the number of folders (re-)read.
+        """
+        removed, changed = self._changes(full)
+        if not removed and not changed:
+            return 0
+
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            for folder in removed:
+                self._delete(folder)
+            for relative, mtimes in changed:
+                try:
+                    issue = load_issue(self.specs_dir / relative)
+                except (OSError, ValueError) as error:
+                    log_debug(f"Skipping {relative} in issue index: {error}")
+                    continue
+                self._upsert(relative, issue, mtimes)
+        return len(changed)
+
+    def _delete(self, folder: str) -> None:
+        self.db.execute("DELETE FROM features WHERE folder = ?", (folder,))
+        self.db.execute("DELETE FROM labels WHERE folder = ?", (folder,))
+
+    def _upsert(self, folder: str, issue: dict, mtimes: Tuple[int, int]) -> None:
+        self.db.execute(
+            "INSERT OR REPLACE INTO features VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                folder,
+                issue.get("id"),
+                issue.get("title"),
+                issue.get("author"),
+                issue.get("created_at"),
+                issue.get("updated_at"),
+                len(issue.get("comments", [])),
+                *mtimes,
+            ),
+        )
+        self._set_labels(folder, issue.get("labels", []), issue.get("updated_at"))
+
+    def _set_labels(self, folder: str, labels: Iterable[str], updated_at: Optional[str]) -> None:
+        self.db.execute("DELETE FROM labels WHERE folder = ?", (folder,))
+        self.db.executemany(
+            "INSERT OR IGNORE INTO labels (label, folder, updated_at) VALUES (?, ?, ?)",
+            [(label, folder, updated_at) for label in labels if label],
+        )
+
+    def _folder(self, feature_dir: Path) -> str:
+        return Path(feature_dir).relative_to(self.specs_dir).as_posix()
+
+    def record_created(self, feature_dir: Path, issue: dict, revision: int = 0) -> None:
+        """Add a feature the issue manager just created."""
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            self._upsert(self._folder(feature_dir), issue, issue_mtimes(feature_dir, revision))
+
+    def record_replaced(self, feature_dir: Path, issue: dict, revision: int = 0) -> None:
+        """Replace a feature's row with the issue the issue manager just rewrote."""
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            self._upsert(self._folder(feature_dir), issue, issue_mtimes(feature_dir, revision))
+
+    def record_updated(self, feature_dir: Path, entry: dict, journal_mtime_before: int) -> None:
+        """Apply one journal entry the issue manager just appended."""
+        folder = self._folder(feature_dir)
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            row = self.db.execute(
+                "SELECT journal_mtime FROM features WHERE folder = ?", (folder,)
+            ).fetchone()
+            if row is None or row[0] != journal_mtime_before:
+                # The index missed earlier changes to this feature; the row keeps its old
+                # mtimes, so the next refresh re-reads it
+                return
+
+            labels = [
+                label
+                for (label,) in self.db.execute(
+                    "SELECT label FROM labels WHERE folder = ?", (folder,)
+                )
+            ]
+            merged = concatenate_arrays(",".join(labels), ",".join(entry.get("labels", [])))
+            self._set_labels(folder, merged.split(","), entry["created_at"])
+            self.db.execute(
+                "UPDATE features SET updated_at = ?, comment_count = comment_count + 1, "
+                "journal_mtime = ? WHERE folder = ?",
+                (entry["created_at"], mtime_ns(feature_dir / COMMENTS_JOURNAL), folder),
+            )
+
+    def query(
+        self,
+        labels: Iterable[str] = (),
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[dict]:
+        """
+        Find features carrying all given labels, updated within [since, until].
+        Timestamps are ISO 8601 strings as stored in issue.json; newest first.
+        """
+        labels = list(labels)
+        # Drive the scan from the first label's (label, updated_at) index when there is
+        # one, so the date range and the ordering come straight from the index
+        if labels:
+            source, time_column = "labels l JOIN features f ON f.folder = l.folder", "l"
+            clauses, params = ["l.label = ?"], [labels[0]]
+            for label in labels[1:]:
+                clauses.append(
+                    "EXISTS (SELECT 1 FROM labels WHERE label = ? AND folder = l.folder)"
+                )
+                params.append(label)
+        else:
+            source, time_column = "features f", "f"
+            clauses, params = [], []
+        if since:
+            clauses.append(f"{time_column}.updated_at >= ?")
+            params.append(since)
+        if until:
+            clauses.append(f"{time_column}.updated_at <= ?")
+            params.append(until)
+
+        sql = (
+            "SELECT f.folder, f.id, f.title, f.author, f.created_at, f.updated_at, "
+            "f.comment_count, (SELECT json_group_array(label) FROM labels "
+            f"WHERE labels.folder = f.folder) FROM {source}"
+        )
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {time_column}.updated_at DESC, {time_column}.folder DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        keys = ("folder", "id", "title", "author", "created_at", "updated_at", "comments")
+        matches = []
+        for *values, labels_json in self.db.execute(sql, params):
+            matches.append({**dict(zip(keys, values)), "labels": sorted(json.loads(labels_json))})
+        return matches
+
+
+def update_index(specs_dir: Path, apply) -> None:
+    """
+    Let an issue manager apply a change to the index, if one has been built.
+    Without an index nothing is done: the first query builds it from scratch.
+    Index problems never fail the issue operation itself.
+    """
+    if not (specs_dir / STATE_DIR_NAME / INDEX_FILE_NAME).exists():
+        return
+    index = IssueIndex(specs_dir)
+    try:
+        apply(index)
+    except sqlite3.Error as error:
+        log_debug(f"Issue index not updated: {error}")
+    finally:
+        index.close()
+
+
+def lookup_folder(specs_dir: Path, feature_id: int) -> Optional[str]:
+    """Get the folder of a feature ID from the index, if one has been built."""
+    if not (specs_dir / STATE_DIR_NAME / INDEX_FILE_NAME).exists():
+        return None
+    index = IssueIndex(specs_dir)
+    try:
+        row = index.db.execute(
+            "SELECT folder FROM features WHERE id = ? LIMIT 1", (feature_id,)
+        ).fetchone()
+        return row[0] if row else None
+    except sqlite3.Error as error:
+        log_debug(f"Issue index lookup failed: {error}")
+        return None
+    finally:
+        index.close()
@@ -3,53 +3,194 @@
 import asyncio
 import json
 import os
-import random
 import subprocess
 from datetime import datetime
 from pathlib import Path
 from typing import List, Optional
 
+from utils.fs_py import atomic_write_text, file_lock, specs_state_dir
 from utils.helpers_py import concatenate_arrays, padd_feature_id
-from utils.logger_py import log_info
+from utils.id_allocator_py import FeatureIdAllocator
+from utils.logger_py import log_error, log_info
+from utils.process_py import run_command
+from utils.repo_context_py import RepoContext, get_repo_context
+from utils.specs_layout_py import feature_path, specs_dir_of, specs_signature
 
 
-def generate_hex_color() -> str:
-    """Generate a random hex color."""
-    random_int = random.randint(0, 16777216)
-    return f"{random_int:06X}"
-
-
-async def get_git_user_name() -> str:
+async def get_git_user_name(context: Optional[RepoContext] = None) -> str:
     """Get git user name from git config."""
+    context = context or get_repo_context()
+    if not context.exotic:
+        return context.user_name or "Unknown User"
     try:
-        result = subprocess.run(
-            ["git", "config", "--get", "user.name"],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
+        result = await run_command(["git", "config", "--get", "user.name"], cwd=str(context.root))
         return result.stdout.strip()
     except (subprocess.CalledProcessError, FileNotFoundError):
         return "Unknown User"
 
 
-async def get_git_user_email() -> str:
+async def get_git_user_email(context: Optional[RepoContext] = None) -> str:
     """Get git user email from git config."""
+    context = context or get_repo_context()
+    if not context.exotic:
+        return context.user_email or "unknown@example.com"
     try:
-        result = subprocess.run(
-            ["git", "config", "--get", "user.email"],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
+        result = await run_command(["git", "config", "--get", "user.email"], cwd=str(context.root))
         return result.stdout.strip()
     except (subprocess.CalledProcessError, FileNotFoundError):
         return "unknown@example.com"
 
 
+# Updates are appended here instead of rewriting issue.json; see load_issue
+COMMENTS_JOURNAL = "comments.jsonl"
+
+
+def _issue_lock_path(feature_dir: Path) -> Path:
+    return specs_state_dir(specs_dir_of(feature_dir)) / "locks" / f"{feature_dir.name}.lock"
+
+
+def append_issue_update(feature_dir: Path, entry: dict) -> None:
+    """
+    Record one update (comment plus label changes) in the feature's journal.
+    The line is written with a single O_APPEND write, so the cost does not depend
+    on how many updates came before and concurrent writers never clobber each other.
+    """
+    line = (json.dumps(entry) + "\n").encode("utf-8")
+    with file_lock(_issue_lock_path(feature_dir)):
+        fd = os.open(feature_dir / COMMENTS_JOURNAL, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            # A writer that crashed mid-write leaves a torn line without its newline;
+            # end it so this entry starts on a line of its own
+            if os.fstat(fd).st_size:
+                os.lseek(fd, -1, os.SEEK_END)
+                if os.read(fd, 1) != b"\n":
+                    line = b"\n" + line
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+
+def _issue_store(feature_dir: Path):
+    """Get (store, folder) when the feature's specs folder has a sqlite issue store."""
+    # Imported on demand; only folders without issue.json get here
+    from utils.sqlite_issue_manager_py import get_issue_store
+
+    specs_dir = specs_dir_of(feature_dir)
+    store = get_issue_store(specs_dir, create=False)
+    if store is None:
+        return None, None
+    return store, Path(feature_dir).relative_to(specs_dir).as_posix()
+
+
+def load_issue(feature_dir: Path) -> dict:
+    """
+    Read a local issue: issue.json with the journal's updates replayed on top.
+    The result has the same shape issue.json always had. Features whose issue
+    the sqlite manager keeps (without a snapshot) are read from its store.
+    """
+    try:
+        with open(feature_dir / "issue.json", "r") as f:
+            issue_data = json.load(f)
+    except FileNotFoundError:
+        store, folder = _issue_store(feature_dir)
+        issue_data = store.get_folder(folder) if store else None
+        if issue_data is None:
+            raise
+        return issue_data
+    issue_data.setdefault("comments", [])
+
+    journal_path = feature_dir / COMMENTS_JOURNAL
+    if not journal_path.exists():
+        return issue_data
+
+    with open(journal_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # Torn last line from a writer that crashed mid-write
+                continue
+            if not isinstance(entry, dict) or not entry.get("created_at"):
+                # Not an update this version wrote; skip it rather than fail the read
+                continue
+            issue_data["comments"].append(
+                {key: entry.get(key, "") for key in ("author", "comment", "created_at")}
+            )
+            updated_labels = concatenate_arrays(
+                ",".join(issue_data.get("labels", [])), ",".join(entry.get("labels") or [])
+            )
+            issue_data["labels"] = [l for l in updated_labels.split(",") if l]
+            issue_data["updated_at"] = entry["created_at"]
+    return issue_data
+
+
+def compact_issue(feature_dir: Path) -> bool:
+    """
+    Fold the journal back into issue.json and remove it.
+    Returns False when there was nothing to compact.
+    """
+    journal_path = feature_dir / COMMENTS_JOURNAL
+    if not journal_path.exists():
+        return False
+    with file_lock(_issue_lock_path(feature_dir)):
+        if not journal_path.exists():
+            return False
+        atomic_write_text(feature_dir / "issue.json", json.dumps(load_issue(feature_dir), indent=2))
+        journal_path.unlink()
+    return True
+
+
+def patch_issue(feature_dir: Path, fields: dict) -> None:
+    """Set top-level fields of a local issue.json, e.g. links to other issues."""
+    if not (feature_dir / "issue.json").exists():
+        store, folder = _issue_store(feature_dir)
+        if store and store.get_folder(folder) is not None:
+            store.patch(folder, fields)
+            return
+    with file_lock(_issue_lock_path(feature_dir)):
+        issue_path = feature_dir / "issue.json"
+        with open(issue_path, "r") as f:
+            issue_data = json.load(f)
+        issue_data.update(fields)
+        atomic_write_text(issue_path, json.dumps(issue_data, indent=2))
+
+
+def _mtime_ns(path: Path) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+
+def _update_index(specs_dir: Path, apply) -> None:
+    # Imported on demand to keep sqlite3 off the startup path of every command
+    from utils.issue_index_py import update_index
+
+    update_index(specs_dir, apply)
+
+
+def _record_description(specs_dir: Path, folder: str, description: str, specs_mtime: str) -> None:
+    from utils.duplicate_index_py import record_feature
+
+    record_feature(specs_dir, folder, description, specs_mtime)
+
+
 class LocalFSIssueManager:
     """LocalFS-based issue manager."""
 
+    def __init__(self, context: Optional[RepoContext] = None):
+        self.context = context or get_repo_context()
+        self._author: Optional[str] = None
+
+    async def get_author(self) -> str:
+        """Get the 'Name <email>' author string, resolved once per manager."""
+        if self._author is None:
+            user_name, user_email = await asyncio.gather(
+                get_git_user_name(self.context), get_git_user_email(self.context)
+            )
+            self._author = f"{user_name} <{user_email}>"
+        return self._author
+
     async def create_issue(
         self,
         feature_slug: str,
@@ -57,30 +198,25 @@ class LocalFSIssueManager:
         feature_parent_dir: Path,
         feature_labels: List[str],
         feature_body: str,
+        feature_id: Optional[int] = None,
     ) -> int:
-        """Create a new local issue."""
-        if os.environ.get("LOCALFS_FEATURE_ID"):
+        """Create a new local issue, optionally with an ID assigned elsewhere."""
+        allocator = FeatureIdAllocator(feature_parent_dir)
+        if feature_id is None and os.environ.get("LOCALFS_FEATURE_ID"):
             feature_id = int(os.environ["LOCALFS_FEATURE_ID"])
+        if feature_id is not None:
+            allocator.observe(feature_id)
         else:
-            specs_folder = os.environ.get("CWAI_SPECS_FOLDER", "specs")
-            existing_count = 0
-
-            if Path(specs_folder).exists():
-                # Count only directories (not files) asynchronously
-                entries = list(Path(specs_folder).iterdir())
-                is_dir_checks = [entry.is_dir() for entry in entries]
-                existing_count = sum(is_dir_checks)
-
-            feature_id = existing_count + 1
+            feature_id = allocator.allocate()
 
         feature_padded_id = padd_feature_id(feature_id)
-        feature_dir = feature_parent_dir / f"{feature_padded_id}-{feature_slug}"
+        feature_dir = feature_path(feature_parent_dir, f"{feature_padded_id}-{feature_slug}")
+        specs_mtime = specs_signature(feature_parent_dir)
         feature_dir.mkdir(parents=True, exist_ok=True)
+        allocator.record_created(specs_mtime)
 
         now = datetime.utcnow().isoformat() + "Z"
-        user_name = await get_git_user_name()
-        user_email = await get_git_user_email()
-        author = f"{user_name} <{user_email}>"
+        author = await self.get_author()
 
         issue_data = {
             "author": author,
@@ -93,9 +229,17 @@ class LocalFSIssueManager:
             "comments": [],
         }
 
-        issue_json_path = feature_dir / "issue.json"
-        with open(issue_json_path, "w") as f:
-            json.dump(issue_data, f, indent=2)
+        atomic_write_text(feature_dir / "issue.json", json.dumps(issue_data, indent=2))
+        _update_index(
+            feature_parent_dir,
+            lambda index: index.record_created(feature_dir, issue_data),
+        )
+        _record_description(
+            feature_parent_dir,
+            feature_dir.relative_to(feature_parent_dir).as_posix(),
+            feature_body,
+            specs_mtime,
+        )
 
         log_info(f"✅ Created Local issue (#{feature_id}) {feature_title}")
 
@@ -109,186 +253,67 @@ class LocalFSIssueManager:
         feature_labels: List[str],
         feature_comment: str,
     ) -> None:
-        """Update an existing local issue."""
-        issue_json_path = feature_dir / "issue.json"
-
-        with open(issue_json_path, "r") as f:
-            issue_data = json.load(f)
+        """Update an existing local issue by appending to its journal."""
+        if not (feature_dir / "issue.json").exists():
+            raise FileNotFoundError(f"No issue.json in {feature_dir}")
 
         now = datetime.utcnow().isoformat() + "Z"
-        user_name = await get_git_user_name()
-        user_email = await get_git_user_email()
-        author = f"{user_name} <{user_email}>"
+        author = await self.get_author()
 
         sanitized_comment = feature_comment.replace(feature_name, "").strip()
 
-        comment_entry = {
+        # Label changes are stored as given ("-x" removes x) and applied on read
+        entry = {
             "author": author,
             "comment": sanitized_comment,
             "created_at": now,
+            "labels": [l for l in feature_labels if l],
         }
-
-        issue_data["comments"].append(comment_entry)
-
-        # Update labels
-        existing_labels = ",".join(issue_data.get("labels", []))
-        labels_string = ",".join(feature_labels)
-        updated_labels = concatenate_arrays(existing_labels, labels_string)
-        issue_data["labels"] = [l for l in updated_labels.split(",") if l]
-        issue_data["updated_at"] = now
-
-        with open(issue_json_path, "w") as f:
-            json.dump(issue_data, f, indent=2)
+        journal_mtime = _mtime_ns(feature_dir / COMMENTS_JOURNAL)
+        append_issue_update(feature_dir, entry)
+        _update_index(
+            specs_dir_of(feature_dir),
+            lambda index: index.record_updated(feature_dir, entry, journal_mtime),
+        )
 
         log_info(f"💬 Updated Local issue (#{feature_id}) {feature_name}")
 
 
-class GitHubIssueManager:
-    """GitHub-based issue manager using gh CLI."""
-
-    def __init__(self):
-        self.localfs_manager = LocalFSIssueManager()
-
-    async def create_label(
-        self, label_name: str, label_color: str = "", label_description: str = ""
-    ) -> None:
-        """Create a GitHub label if it doesn't exist."""
-        color = label_color or generate_hex_color()
-
-        try:
-            result = subprocess.run(
-                ["gh", "label", "list", "--json", "name", "--jq", ".[].name"],
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            existing_labels = [l for l in result.stdout.split("\n") if l]
-
-            if label_name in existing_labels:
-                return
-
-            log_info(f"🏷️  Creating label: {label_name}")
-            args = ["gh", "label", "create", label_name, "--color", color]
-            if label_description:
-                args.extend(["--description", label_description])
-            subprocess.run(args, check=True, capture_output=True)
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            # Silently ignore if gh CLI is not available or label already exists
-            pass
-
-    async def create_issue(
-        self,
-        feature_slug: str,
-        feature_title: str,
-        feature_parent_dir: Path,
-        feature_labels: List[str],
-        feature_body: str,
-    ) -> int:
-        """Create a new GitHub issue."""
-        # Ensure required labels exist
-        await self.create_label("task", "0e8a16", "Task item")
-        await self.create_label("auto-generated", "bfd4f2", "Automatically generated by script")
-
-        gh_label_args = ["--label", "task", "--label", "auto-generated"]
-
-        # Create any additional labels
-        for label in feature_labels:
-            if label:
-                await self.create_label(label)
-                gh_label_args.extend(["--label", label])
-
-        result = subprocess.run(
-            [
-                "gh",
-                "issue",
-                "create",
-                "--title",
-                feature_title,
-                "--body",
-                feature_body,
-                *gh_label_args,
-            ],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
+def get_issue_manager(manager_type: str, context: Optional[RepoContext] = None):
+    """Factory function to get the appropriate issue manager."""
+    if manager_type in ("github", "github-api"):
+        manager = get_remote_issue_manager(manager_type, context)
+        if os.environ.get("CWAI_OUTBOX", "off").lower() in ("1", "on", "true", "yes"):
+            from utils.outbox_py import OutboxIssueManager
 
-        issue_url = result.stdout.strip()
-        log_info(f"🏷️  Created Github issue: {issue_url}")
+            return OutboxIssueManager(manager)
+        return manager
+    if manager_type == "sqlite":
+        from utils.sqlite_issue_manager_py import SQLiteIssueManager
 
-        feature_id = int(issue_url.split("/")[-1])
-        os.environ["LOCALFS_FEATURE_ID"] = str(feature_id)
+        return SQLiteIssueManager(context)
+    return LocalFSIssueManager(context)
 
-        await self.localfs_manager.create_issue(
-            feature_slug, feature_title, feature_parent_dir, feature_labels, feature_body
-        )
 
-        del os.environ["LOCALFS_FEATURE_ID"]
-        return feature_id
+def get_remote_issue_manager(manager_type: str, context: Optional[RepoContext] = None):
+    """Get the issue manager talking to GitHub directly, without the outbox."""
+    if manager_type == "github-api":
+        from utils.github_api_issue_manager_py import GitHubAPIConfigError, GitHubAPIIssueManager
 
-    async def update_issue(
-        self,
-        feature_id: int,
-        feature_name: str,
-        feature_dir: Path,
-        feature_labels: List[str],
-        feature_comment: str,
-    ) -> None:
-        """Update an existing GitHub issue."""
-        add_labels = []
-        remove_labels = []
-
-        for label in feature_labels:
-            if label.startswith("-"):
-                remove_labels.append(label[1:])
-            else:
-                add_labels.append(label)
-                await self.create_label(label)
-
-        if add_labels:
-            subprocess.run(
-                [
-                    "gh",
-                    "issue",
-                    "edit",
-                    str(feature_id),
-                    "--add-label",
-                    ",".join(add_labels),
-                ],
-                check=True,
-                capture_output=True,
-            )
-            log_info(f"🏷️  Added labels to issue #{feature_id}: {', '.join(add_labels)}")
-
-        if remove_labels:
-            subprocess.run(
-                [
-                    "gh",
-                    "issue",
-                    "edit",
-                    str(feature_id),
-                    "--remove-label",
-                    ",".join(remove_labels),
-                ],
-                check=True,
-                capture_output=True,
-            )
-            log_info(f"🏷️  Removed labels from issue #{feature_id}: {', '.join(remove_labels)}")
+        try:
+            return GitHubAPIIssueManager(context)
+        except GitHubAPIConfigError as error:
+            log_error(str(error))
+    # Imported on demand to keep the GitHub machinery off the localfs startup path
+    from utils.github_issue_manager_py import GitHubIssueManager
 
-        subprocess.run(
-            ["gh", "issue", "comment", str(feature_id), "--body", feature_comment],
-            check=True,
-            capture_output=True,
-        )
-        log_info(f"💬 Added comment to Github issue #{feature_id}")
+    return GitHubIssueManager(context)
 
-        await self.localfs_manager.update_issue(
-            feature_id, feature_name, feature_dir, feature_labels, feature_comment
-        )
 
+def __getattr__(name: str):
+    """Keep `from utils.issue_manager_py import GitHubIssueManager` working lazily."""
+    if name in ("GitHubIssueManager", "LabelCache", "generate_hex_color"):
+        from utils import github_issue_manager_py
 
-def get_issue_manager(manager_type: str):
-    """Factory function to get the appropriate issue manager."""
-    if manager_type == "github":
-        return GitHubIssueManager()
-    return LocalFSIssueManager()
+        return getattr(github_issue_manager_py, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
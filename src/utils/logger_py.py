@@ -1,34 +1,156 @@
 """Logging utilities for CwAI CLI tools."""
 
+import atexit
+import json
+import os
+import queue
 import sys
-from rich.console import Console
+import threading
+from datetime import datetime
 
-# Create console that writes to stderr (not stdout)
-# This ensures logs don't interfere with JSON output on stdout
-console = Console(stderr=True)
+_console = None
+_writer = None
+
+LEVELS = {"debug": 10, "info": 20, "warn": 30, "warning": 30, "error": 40}
+
+# Rank, rich style and prefix of every log function's messages
+STYLES = {
+    "debug": (10, "dim", "🔍 "),
+    "info": (20, "cyan", "ℹ️  "),
+    "success": (20, "green", "✅ "),
+    "warn": (30, "yellow", "⚠️  "),
+    "error": (40, "red", "❌ "),
+}
+
+FORMATS = ("auto", "rich", "plain", "json")
+
+
+def get_console():
+    """Get the stderr console, importing rich and creating it on first use."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+
+        # Create console that writes to stderr (not stdout)
+        # This ensures logs don't interfere with JSON output on stdout
+        _console = Console(stderr=True)
+    return _console
+
+
+def get_log_level() -> int:
+    """Get the lowest level that is logged (CWAI_LOG_LEVEL, default info)."""
+    return LEVELS.get(os.environ.get("CWAI_LOG_LEVEL", "info").lower(), 20)
+
+
+def get_log_format(stream) -> str:
+    """
+    Get how messages are written (CWAI_LOG_FORMAT): `rich` (colours and markup),
+    `plain` text or `json` lines. `auto` (default) uses rich on a terminal only.
+    """
+    log_format = os.environ.get("CWAI_LOG_FORMAT", "auto").lower()
+    if log_format not in FORMATS or log_format == "auto":
+        isatty = getattr(stream, "isatty", None)
+        return "rich" if isatty and isatty() else "plain"
+    return log_format
+
+
+class BufferedWriter:
+    """
+    Background thread writing log lines, so callers never wait on a slow stderr.
+
+    Lines are queued with the stream they were meant for (which may be a
+    redirected one) and written in batches; `flush` waits until all queued
+    lines are out. Enabled with CWAI_LOG_BUFFER=on.
+    """
+
+    def __init__(self):
+        self.queue: "queue.Queue" = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="cwai-log", daemon=True)
+        self.thread.start()
+
+    def write(self, stream, text: str) -> None:
+        self.queue.put((stream, text))
+
+    def flush(self) -> None:
+        self.queue.join()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self.queue.get()]
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            pending = {}
+            for stream, text in batch:
+                pending.setdefault(id(stream), (stream, []))[1].append(text)
+            for stream, texts in pending.values():
+                try:
+                    stream.write("".join(texts))
+                    stream.flush()
+                except (OSError, ValueError):
+                    # Closed or broken stream; logging must never fail the command
+                    pass
+            for _ in batch:
+                self.queue.task_done()
+
+
+def flush_logs() -> None:
+    """Wait until buffered log lines have been written."""
+    if _writer is not None:
+        _writer.flush()
+
+
+def _write(stream, text: str) -> None:
+    global _writer
+    if os.environ.get("CWAI_LOG_BUFFER", "off").lower() not in ("1", "on", "true", "yes"):
+        stream.write(text)
+        return
+    if _writer is None:
+        _writer = BufferedWriter()
+        atexit.register(flush_logs)
+    _writer.write(stream, text)
+
+
+def _log(level: str, message: str) -> None:
+    rank, style, prefix = STYLES[level]
+    if rank < get_log_level():
+        return
+    stream = sys.stderr
+    log_format = get_log_format(stream)
+    if log_format == "rich":
+        flush_logs()
+        get_console().print(f"[{style}]{prefix}{message}[/{style}]")
+    elif log_format == "json":
+        now = datetime.utcnow().isoformat() + "Z"
+        _write(stream, json.dumps({"time": now, "level": level, "message": message}) + "\n")
+    else:
+        _write(stream, f"{prefix}{message}\n")
 
 
 def log_info(message: str) -> None:
     """Log an info message to stderr."""
-    console.print(f"[cyan]ℹ️  {message}[/cyan]")
+    _log("info", message)
 
 
 def log_success(message: str) -> None:
     """Log a success message to stderr."""
-    console.print(f"[green]✅ {message}[/green]")
+    _log("success", message)
 
 
 def log_warn(message: str) -> None:
     """Log a warning message to stderr."""
-    console.print(f"[yellow]⚠️  {message}[/yellow]")
+    _log("warn", message)
 
 
 def log_error(message: str, exit_code: int = 1) -> None:
     """Log an error message to stderr and exit."""
-    console.print(f"[red]❌ {message}[/red]")
+    _log("error", message)
+    flush_logs()
     sys.exit(exit_code)
 
 
 def log_debug(message: str) -> None:
     """Log a debug message to stderr."""
-    console.print(f"[dim]🔍 {message}[/dim]")
+    _log("debug", message)
@@ -0,0 +1,532 @@
+"""Durable queue of GitHub mutations for the github issue managers (CWAI_OUTBOX=on)."""
+
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import subprocess
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from utils.fs_py import STATE_DIR_NAME, atomic_write_text, file_lock, specs_state_dir
+from utils.helpers_py import find_branch_worktree, padd_feature_id
+from utils.id_allocator_py import FeatureIdAllocator
+from utils.logger_py import log_debug, log_info, log_warn
+from utils.process_py import run_command
+from utils.repo_context_py import get_repo_context
+from utils.specs_layout_py import (
+    feature_path,
+    locate_feature,
+    resolve_feature_dir,
+    specs_dir_of,
+)
+
+OUTBOX_FILE_NAME = "outbox.sqlite"
+
+# Queued operations are user data: schema changes must migrate, never drop
+SCHEMA_VERSION = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ops (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    feature INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    created_at TEXT NOT NULL,
+    sent_at TEXT,
+    local_key TEXT
+);
+CREATE INDEX IF NOT EXISTS ops_feature ON ops (feature, seq);
+CREATE INDEX IF NOT EXISTS ops_local_key ON ops (local_key, seq);
+-- Local keys of issues created while queued and the GitHub issue numbers they got
+CREATE TABLE IF NOT EXISTS resolved (
+    local_key TEXT PRIMARY KEY,
+    number INTEGER NOT NULL
+);
+-- Feature folders still to be given their issue number
+CREATE TABLE IF NOT EXISTS renames (
+    folder TEXT PRIMARY KEY,
+    number INTEGER NOT NULL,
+    url TEXT NOT NULL
+);
+"""
+
+OP_COLUMNS = "seq, feature, kind, payload, attempts, last_error, created_at, sent_at, local_key"
+
+# Backoff after a rate-limited request: full jitter, doubling from BACKOFF_BASE
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+MAX_ATTEMPTS = 6
+
+
+def get_sync_jobs() -> int:
+    """Get how many features are flushed at once (CWAI_SYNC_JOBS)."""
+    return max(1, int(os.environ.get("CWAI_SYNC_JOBS", "4")))
+
+
+class Outbox:
+    """
+    Pending GitHub operations of one specs folder, oldest first.
+
+    Operations on an existing issue are keyed by its number. An issue created
+    while offline gets a provisional ID from the local allocator, which may be
+    a number GitHub gives another issue, so it and every operation queued for
+    it are keyed by a random local key instead. Once GitHub assigns the real
+    number, the remaining operations are re-keyed to it and the folder rename
+    is recorded, in the same transaction that drops the create.
+    """
+
+    def __init__(self, specs_dir: Path):
+        self.specs_dir = Path(specs_dir)
+        state_dir = specs_state_dir(self.specs_dir)
+        self.path = state_dir / OUTBOX_FILE_NAME
+        self.lock_path = state_dir / f"{OUTBOX_FILE_NAME}.lock"
+        self._db: Optional[sqlite3.Connection] = None
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        if self._db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            version = db.execute("PRAGMA user_version").fetchone()[0]
+            if version == 1:
+                db.execute("ALTER TABLE ops ADD COLUMN sent_at TEXT")
+            if version in (1, 2):
+                db.execute("ALTER TABLE ops ADD COLUMN local_key TEXT")
+                _migrate_provisional_ids(db)
+            db.executescript(SCHEMA)
+            db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            self._db = db
+        return self._db
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def issue_number(self, op: dict) -> Optional[int]:
+        """Get the GitHub issue an operation goes to; None while its create is queued."""
+        if not op["local_key"]:
+            return op["feature"]
+        row = self.db.execute(
+            "SELECT number FROM resolved WHERE local_key = ?", (op["local_key"],)
+        ).fetchone()
+        return row[0] if row else None
+
+    def enqueue(
+        self,
+        feature_id: int,
+        kind: str,
+        payload: dict,
+        folder: Optional[str] = None,
+        local_key: Optional[str] = None,
+    ) -> None:
+        """
+        Queue one operation behind everything already queued for the feature.
+        Operations on a feature folder whose create is still queued, or whose
+        folder still has its provisional name, go to that issue rather than to
+        whatever GitHub issue has the same number as its provisional ID.
+        """
+        now = datetime.utcnow().isoformat() + "Z"
+        if folder and not local_key:
+            row = self.db.execute(
+                "SELECT number FROM renames WHERE folder = ?", (folder,)
+            ).fetchone()
+            if row:
+                feature_id = row[0]
+            else:
+                row = self.db.execute(
+                    "SELECT local_key FROM ops WHERE kind = 'issue' "
+                    "AND json_extract(payload, '$.folder') = ?",
+                    (folder,),
+                ).fetchone()
+                local_key = row[0] if row else None
+        self.db.execute(
+            "INSERT INTO ops (feature, kind, payload, created_at, local_key) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (feature_id, kind, json.dumps(payload), now, local_key),
+        )
+
+    def pending(self) -> List[dict]:
+        """List queued operations in the order they were queued."""
+        columns = OP_COLUMNS.split(", ")
+        ops = [
+            dict(zip(columns, row))
+            for row in self.db.execute(f"SELECT {OP_COLUMNS} FROM ops ORDER BY seq")
+        ]
+        for op in ops:
+            op["payload"] = json.loads(op["payload"])
+        return ops
+
+    def count(self) -> int:
+        """Count queued operations."""
+        return self.db.execute("SELECT COUNT(*) FROM ops").fetchone()[0]
+
+    def mark_sent(self, seq: int) -> None:
+        """Remember that an operation is being sent, in case we crash before it completes."""
+        now = datetime.utcnow().isoformat() + "Z"
+        self.db.execute("UPDATE ops SET sent_at = ? WHERE seq = ?", (now, seq))
+
+    def complete(self, seq: int) -> None:
+        """Drop an operation GitHub accepted."""
+        self.db.execute("DELETE FROM ops WHERE seq = ?", (seq,))
+
+    def fail(self, seq: int, error: Exception) -> None:
+        """Keep an operation queued and remember why it failed."""
+        self.db.execute(
+            "UPDATE ops SET attempts = attempts + 1, last_error = ? WHERE seq = ?",
+            (str(error)[:500], seq),
+        )
+
+    def complete_issue(self, op: dict, number: int, url: str) -> None:
+        """
+        Drop a create, move the feature's other operations to its issue number and
+        record that its folder is to be renamed.
+        """
+        db = self.db
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.execute("DELETE FROM ops WHERE seq = ?", (op["seq"],))
+            if op["local_key"]:
+                db.execute(
+                    "INSERT OR REPLACE INTO resolved (local_key, number) VALUES (?, ?)",
+                    (op["local_key"], number),
+                )
+                db.execute(
+                    "UPDATE ops SET feature = ?, local_key = NULL WHERE local_key = ?",
+                    (number, op["local_key"]),
+                )
+            db.execute(
+                "INSERT OR REPLACE INTO renames (folder, number, url) VALUES (?, ?, ?)",
+                (op["payload"]["folder"], number, url),
+            )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    def renames(self) -> List[Tuple[str, int, str]]:
+        """List (folder, issue number, url) of created issues whose folder is not renamed yet."""
+        return self.db.execute("SELECT folder, number, url FROM renames").fetchall()
+
+    def complete_rename(self, folder: str) -> None:
+        self.db.execute("DELETE FROM renames WHERE folder = ?", (folder,))
+
+
+def _migrate_provisional_ids(db: sqlite3.Connection) -> None:
+    # Before v3 a queued create and the operations queued after it shared the
+    # provisional ID; give each such feature its own local key
+    for (feature,) in db.execute(
+        "SELECT DISTINCT feature FROM ops WHERE kind = 'issue'"
+    ).fetchall():
+        db.execute("UPDATE ops SET local_key = ? WHERE feature = ?", (uuid.uuid4().hex, feature))
+
+
+def has_pending(specs_dir: Path) -> bool:
+    """Check for queued operations without creating an outbox."""
+    if not (Path(specs_dir) / STATE_DIR_NAME / OUTBOX_FILE_NAME).exists():
+        return False
+    outbox = Outbox(specs_dir)
+    try:
+        return outbox.count() > 0
+    finally:
+        outbox.close()
+
+
+@dataclass
+class FlushStats:
+    """What a flush sent to GitHub."""
+
+    sent: int = 0
+    failed: int = 0
+    remaining: int = 0
+    reconciled: Dict[int, int] = field(default_factory=dict)
+
+    def __str__(self) -> str:
+        return f"{self.sent} sent, {self.failed} failed, {self.remaining} still queued"
+
+
+class RateLimitGate:
+    """Pause shared by all flush workers once GitHub starts refusing requests."""
+
+    def __init__(self):
+        self.resume_at = 0.0
+        self.stopped = False
+
+    def pause(self, delay: float) -> None:
+        self.resume_at = max(self.resume_at, time.monotonic() + delay)
+
+    async def wait(self) -> None:
+        delay = self.resume_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float]) -> float:
+    """Seconds to wait before retry number attempt; GitHub's own hint wins."""
+    if retry_after is not None:
+        return retry_after
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2**attempt))
+
+
+class OutboxIssueManager:
+    """
+    Issue manager that writes local issues at once and queues the GitHub side.
+
+    Commands never wait for GitHub: creates get a provisional ID from the local
+    allocator, and updates are applied locally. The queue is sent by `cwai-sync`
+    or at the start of the next command, with bounded concurrency across
+    features and strict order within one.
+    """
+
+    def __init__(self, remote):
+        self.remote = remote
+        self.context = remote.context
+        self.localfs_manager = remote.localfs_manager
+        self._outboxes: Dict[Path, Outbox] = {}
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._flush_lock_loop = None
+
+    def outbox(self, specs_dir: Path) -> Outbox:
+        """Get the outbox of a specs folder."""
+        specs_dir = Path(specs_dir)
+        if specs_dir not in self._outboxes:
+            self._outboxes[specs_dir] = Outbox(specs_dir)
+        return self._outboxes[specs_dir]
+
+    async def create_issue(
+        self,
+        feature_slug: str,
+        feature_title: str,
+        feature_parent_dir: Path,
+        feature_labels: List[str],
+        feature_body: str,
+    ) -> int:
+        """Create the local issue under a provisional ID and queue the GitHub issue."""
+        feature_id = await self.localfs_manager.create_issue(
+            feature_slug, feature_title, feature_parent_dir, feature_labels, feature_body
+        )
+        local_key = uuid.uuid4().hex
+        # Lets a resend find the issue an interrupted send already created
+        marker = f"cwai-outbox:{feature_id}-{local_key[:12]}"
+        self.outbox(feature_parent_dir).enqueue(
+            feature_id,
+            "issue",
+            {
+                "title": feature_title,
+                "body": f"{feature_body}\n\n<!-- {marker} -->",
+                "labels": feature_labels,
+                "folder": f"{padd_feature_id(feature_id)}-{feature_slug}",
+                "marker": marker,
+            },
+            local_key=local_key,
+        )
+        log_info(f"📮 Queued Github issue for #{feature_id} (provisional until synced)")
+        return feature_id
+
+    async def update_issue(
+        self,
+        feature_id: int,
+        feature_name: str,
+        feature_dir: Path,
+        feature_labels: List[str],
+        feature_comment: str,
+    ) -> None:
+        """Update the local issue and queue the label changes and the comment."""
+        await self.localfs_manager.update_issue(
+            feature_id, feature_name, feature_dir, feature_labels, feature_comment
+        )
+        outbox = self.outbox(specs_dir_of(feature_dir))
+        folder = Path(feature_dir).name
+        labels = [label for label in feature_labels if label]
+        if labels:
+            outbox.enqueue(feature_id, "labels", {"labels": labels}, folder)
+        outbox.enqueue(feature_id, "comment", {"body": feature_comment}, folder)
+        log_info(f"📮 Queued Github update for #{feature_id}")
+
+    async def flush_queued(self, specs_dir: Path) -> None:
+        """Send what earlier commands queued, giving up at the first rate limit."""
+        if not has_pending(specs_dir):
+            return
+        stats = await self.flush(specs_dir, wait=False)
+        if stats.remaining:
+            log_warn(f"📮 {stats.remaining} Github operation(s) still queued; run cwai-sync")
+
+    def _get_flush_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._flush_lock is None or self._flush_lock_loop is not loop:
+            self._flush_lock, self._flush_lock_loop = asyncio.Lock(), loop
+        return self._flush_lock
+
+    async def flush(
+        self, specs_dir: Path, wait: bool = True, jobs: Optional[int] = None
+    ) -> FlushStats:
+        """
+        Send queued operations to GitHub. Features are flushed concurrently, their
+        operations one after another; a failed operation holds back the rest of its
+        feature. With wait set, rate-limited requests are retried after a backoff
+        (GitHub's Retry-After when given); otherwise the flush stops there.
+        Another process already flushing the same outbox makes this a no-op unless
+        waiting.
+        """
+        outbox = self.outbox(specs_dir)
+        stats = FlushStats()
+        async with self._get_flush_lock():
+            try:
+                with file_lock(outbox.lock_path, blocking=wait):
+                    features: Dict[Tuple[str, object], List[dict]] = {}
+                    for op in outbox.pending():
+                        key = (
+                            ("local", op["local_key"])
+                            if op["local_key"]
+                            else ("issue", op["feature"])
+                        )
+                        features.setdefault(key, []).append(op)
+
+                    gate = RateLimitGate()
+                    semaphore = asyncio.Semaphore(jobs or get_sync_jobs())
+
+                    async def flush_feature(ops: List[dict]) -> None:
+                        async with semaphore:
+                            for op in ops:
+                                if not await self._send(outbox, op, gate, wait, stats):
+                                    return
+
+                    await asyncio.gather(*(flush_feature(ops) for ops in features.values()))
+                    await self.apply_renames(outbox)
+            except BlockingIOError:
+                log_debug("Outbox is being flushed by another process")
+            stats.remaining = outbox.count()
+        return stats
+
+    async def _send(
+        self, outbox: Outbox, op: dict, gate: RateLimitGate, wait: bool, stats: FlushStats
+    ) -> bool:
+        payload = op["payload"]
+        attempt = 0
+        while True:
+            await gate.wait()
+            if gate.stopped:
+                return False
+            feature_id = outbox.issue_number(op)
+            if feature_id is None and op["kind"] != "issue":
+                # Its create is not sent yet; never fall back to the provisional ID
+                log_warn(f"Github {op['kind']} for #{op['feature']} waits for its issue")
+                return False
+            try:
+                if op["kind"] == "issue":
+                    number, url = await self._create_issue(outbox, op)
+                    # Recorded before touching local files; a crash before this point is
+                    # caught by the marker lookup when the create is sent again
+                    outbox.complete_issue(op, number, url)
+                    stats.reconciled[op["feature"]] = number
+                elif op["kind"] == "labels":
+                    await self.remote.edit_remote_labels(feature_id, payload["labels"])
+                    outbox.complete(op["seq"])
+                else:
+                    await self.remote.add_remote_comment(feature_id, payload["body"])
+                    outbox.complete(op["seq"])
+                    log_info(f"💬 Added comment to Github issue #{feature_id}")
+                stats.sent += 1
+                return True
+            except Exception as error:
+                if self.remote.is_rate_limited(error):
+                    attempt += 1
+                    if wait and attempt < MAX_ATTEMPTS:
+                        delay = backoff_delay(attempt, getattr(error, "retry_after", None))
+                        log_warn(f"⏳ Github rate limit hit; retrying in {delay:.1f}s")
+                        gate.pause(delay)
+                        continue
+                    gate.stopped = True
+                outbox.fail(op["seq"], error)
+                stats.failed += 1
+                number = feature_id or op["feature"]
+                log_warn(f"Github {op['kind']} for #{number} failed, kept queued: {error}")
+                return False
+
+    async def _create_issue(self, outbox: Outbox, op: dict) -> Tuple[int, str]:
+        """Create a queued issue, unless an interrupted earlier send already did."""
+        payload = op["payload"]
+        if op["sent_at"] and payload.get("marker"):
+            since = op["created_at"][:19] + "Z"
+            found = await self.remote.find_remote_issue(payload["marker"], since)
+            if found:
+                log_info(f"🔁 Github issue #{found[0]} was already created; not creating it again")
+                return found
+        outbox.mark_sent(op["seq"])
+        op["sent_at"] = True
+        return await self.remote.create_remote_feature_issue(
+            payload["title"], payload["body"], payload["labels"]
+        )
+
+    async def apply_renames(self, outbox: Outbox) -> None:
+        """
+        Reconcile every created issue whose folder still has its provisional name.
+        A folder whose issue number is still taken by another feature's provisional
+        folder waits until that one has moved on, so no two folders share an ID.
+        """
+        renames = outbox.renames()
+        while renames:
+            waiting = []
+            for folder, number, url in renames:
+                if await self.reconcile(outbox.specs_dir, folder, number, url) is None:
+                    waiting.append((folder, number, url))
+                else:
+                    outbox.complete_rename(folder)
+            if len(waiting) == len(renames):
+                for folder, number, _ in waiting:
+                    log_warn(f"{folder} is Github issue #{number}; renamed once that ID is free")
+                return
+            renames = waiting
+
+    async def reconcile(self, specs_dir: Path, folder: str, number: int, url: str) -> Optional[str]:
+        """
+        Give a feature created under a provisional ID its GitHub issue number:
+        issue.json gets the number and URL, and the feature folder and its branch
+        are renamed to match. Returns the feature's folder name, or None when
+        another folder still has the number.
+        """
+        FeatureIdAllocator(specs_dir).observe(number)
+        feature_dir = resolve_feature_dir(specs_dir, folder)
+        issue_path = feature_dir / "issue.json"
+        try:
+            issue = json.loads(issue_path.read_text(encoding="utf-8"))
+            if issue.get("id") != number or issue.get("url") != url:
+                issue.setdefault("provisional_id", issue.get("id"))
+                issue["id"] = number
+                issue["url"] = url
+                atomic_write_text(issue_path, json.dumps(issue, indent=2))
+        except (OSError, ValueError) as error:
+            log_warn(f"Could not record issue #{number} in {issue_path}: {error}")
+            return folder
+
+        slug = folder.split("-", 1)[1] if "-" in folder else folder
+        new_folder = f"{padd_feature_id(number)}-{slug}"
+        if new_folder == folder:
+            return folder
+        if locate_feature(specs_dir, number) is not None:
+            return None
+        new_feature_dir = feature_path(specs_dir, new_folder)
+        new_feature_dir.parent.mkdir(parents=True, exist_ok=True)
+        os.rename(feature_dir, new_feature_dir)
+        try:
+            # Leave branches alone that someone is working on in another worktree
+            worktree = await find_branch_worktree(folder, specs_dir)
+            if worktree and worktree.resolve() != get_repo_context(specs_dir).root:
+                log_warn(
+                    f"Branch {folder} is checked out in {worktree}; not renamed. "
+                    f"Rename it yourself with: git branch -m {folder} {new_folder}"
+                )
+            else:
+                await run_command(["git", "branch", "-m", folder, new_folder], cwd=str(specs_dir))
+        except (subprocess.CalledProcessError, FileNotFoundError) as error:
+            log_debug(f"Branch {folder} not renamed: {error}")
+        log_info(f"🔗 {folder} is Github issue #{number}, renamed to {new_folder}")
+        return new_folder
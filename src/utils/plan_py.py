@@ -0,0 +1,252 @@
+"""Parse `/breakdown` delivery plans (.plan.md / .plan.json) into a dependency graph."""
+
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ITEM_TYPES = ("epic", "story", "task")
+
+# "## EPIC E-001: Title", "### Story `S-001-01`: `Title`"
+HEADING = re.compile(r"^#{2,4}\s+(EPIC|Story|Task)\s+`?([^`:\s]+)`?\s*:\s*(.+?)\s*$", re.I)
+# "  - Task T-001-01a: Title"
+TASK_BULLET = re.compile(r"^(\s*)[-*]\s+Task\s+`?([^`:\s]+)`?\s*:\s*(.+?)\s*$", re.I)
+FIELD_BULLET = re.compile(r"^(\s*)[-*]\s+([A-Za-z][A-Za-z /]*?)(?:\s*\([^)]*\))?\s*:\s*(.*?)\s*$")
+LIST_BULLET = re.compile(r"^(\s*)[-*]\s+(.+?)\s*$")
+
+
+class PlanError(ValueError):
+    """Raised for plans that cannot be turned into issues."""
+
+
+@dataclass
+class PlanItem:
+    """One epic, story or task of a plan, with its links as plan IDs."""
+
+    id: str
+    title: str
+    type: str
+    description: str = ""
+    parent: Optional[str] = None
+    blocked_by: List[str] = field(default_factory=list)
+    blocking: List[str] = field(default_factory=list)
+    acceptance: List[str] = field(default_factory=list)
+    children: List[str] = field(default_factory=list)
+
+    def body(self, plan_name: str) -> str:
+        """Issue body: description, acceptance criteria and the plan reference."""
+        parts = [self.description] if self.description else []
+        if self.acceptance:
+            parts.append(
+                "Acceptance Criteria:\n" + "\n".join(f"- {line}" for line in self.acceptance)
+            )
+        parts.append(plan_marker(plan_name, self.id))
+        return "\n\n".join(parts)
+
+
+def plan_marker(plan_name: str, item_id: str) -> str:
+    """Line identifying the plan item an issue was created from."""
+    return f"Plan item: {item_id} ({plan_name})"
+
+
+def parse_ids(value) -> List[str]:
+    """Read an ID list given as a JSON list or as text like "[`E-001`, S-002]"."""
+    if isinstance(value, list):
+        return [str(item).strip() for item in value if str(item).strip()]
+    value = str(value or "").strip().strip("[]")
+    return [part.strip(" `") for part in value.split(",") if part.strip(" `")]
+
+
+def _strip_ticks(text: str) -> str:
+    return text.strip().strip("`").strip()
+
+
+def parse_plan_markdown(text: str) -> List[PlanItem]:
+    """Parse a plan written after .cwai/templates/plan.md."""
+    items: List[PlanItem] = []
+    current: Optional[PlanItem] = None
+    # Nested bullets below "Acceptance Criteria:" or "Dependencies:" belong to that field
+    open_field: Optional[str] = None
+    open_indent = -1
+    epic: Optional[PlanItem] = None
+    story: Optional[PlanItem] = None
+    in_fence = False
+
+    for line in text.splitlines():
+        if line.lstrip().startswith("```"):
+            in_fence = not in_fence
+            continue
+        if in_fence or not line.strip():
+            continue
+
+        heading = HEADING.match(line)
+        task = None if heading else TASK_BULLET.match(line)
+        if heading or task:
+            if heading:
+                kind, item_id, title = heading.group(1).lower(), heading.group(2), heading.group(3)
+            else:
+                kind, item_id, title = "task", task.group(2), task.group(3)
+            current = PlanItem(item_id, _strip_ticks(title), kind)
+            if kind == "epic":
+                epic, story = current, None
+            elif kind == "story":
+                current.parent = epic.id if epic else None
+                story = current
+            else:
+                owner = story or epic
+                current.parent = owner.id if owner else None
+            items.append(current)
+            open_field, open_indent = None, -1
+            continue
+        if current is None or line.lstrip().startswith("#"):
+            continue
+
+        bullet = LIST_BULLET.match(line)
+        if not bullet:
+            continue
+        indent = len(bullet.group(1))
+        if open_field and indent > open_indent:
+            nested = FIELD_BULLET.match(line)
+            key = nested.group(2).strip().lower() if nested else ""
+            if open_field == "dependencies" and key in ("parent", "blocked by", "blocking"):
+                ids = parse_ids(nested.group(3))
+                if key == "parent":
+                    current.parent = ids[0] if ids else current.parent
+                elif key == "blocked by":
+                    current.blocked_by.extend(ids)
+                else:
+                    current.blocking.extend(ids)
+            elif open_field == "acceptance criteria":
+                current.acceptance.append(bullet.group(2))
+            continue
+
+        open_field, open_indent = None, -1
+        field_match = FIELD_BULLET.match(line)
+        if not field_match:
+            continue
+        key, value = field_match.group(2).strip().lower(), field_match.group(3)
+        if key == "description":
+            current.description = value
+        elif key == "dependencies":
+            current.blocked_by.extend(parse_ids(value))
+            open_field, open_indent = key, indent
+        elif key == "acceptance criteria":
+            open_field, open_indent = key, indent
+        elif key == "blocked by":
+            current.blocked_by.extend(parse_ids(value))
+        elif key == "blocking":
+            current.blocking.extend(parse_ids(value))
+        elif key == "parent":
+            current.parent = _strip_ticks(value) or current.parent
+    return items
+
+
+def parse_plan_json(data: dict) -> List[PlanItem]:
+    """Parse a plan in the FORMAT=JSON shape, flattening nested children."""
+    items: List[PlanItem] = []
+
+    def visit(raw: dict, parent: Optional[str]) -> None:
+        if not isinstance(raw, dict) or not raw.get("id"):
+            raise PlanError(f"Plan item without an id: {raw!r}"[:200])
+        dependencies = raw.get("dependencies") or {}
+        if not isinstance(dependencies, dict):
+            dependencies = {"blockedBy": dependencies}
+        item = PlanItem(
+            id=str(raw["id"]),
+            title=str(raw.get("title") or raw["id"]),
+            type=str(raw.get("type") or "task").lower(),
+            description=str(raw.get("description") or ""),
+            parent=dependencies.get("parent") or parent,
+            blocked_by=parse_ids(dependencies.get("blockedBy")),
+            blocking=parse_ids(dependencies.get("blocking")),
+            acceptance=[str(line) for line in raw.get("acceptance") or []],
+        )
+        items.append(item)
+        for child in raw.get("children") or []:
+            visit(child, item.id)
+
+    for raw in data.get("items") or []:
+        visit(raw, None)
+    return items
+
+
+def load_plan(path: Path) -> List[PlanItem]:
+    """
+    Read a plan file and resolve its links: `Blocking` is folded into the other
+    item's `Blocked By`, a dependency on the item's own parent is dropped (the
+    parent is created first anyway) and children are listed on their parents.
+    """
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+    if path.suffix == ".json":
+        try:
+            items = parse_plan_json(json.loads(text))
+        except json.JSONDecodeError as error:
+            raise PlanError(f"{path} is not valid JSON: {error}")
+    else:
+        items = parse_plan_markdown(text)
+    if not items:
+        raise PlanError(f"No epics, stories or tasks found in {path}")
+
+    by_id: Dict[str, PlanItem] = {}
+    for item in items:
+        if item.id in by_id:
+            raise PlanError(f"Plan item {item.id} is defined twice")
+        if item.type not in ITEM_TYPES:
+            raise PlanError(f"Plan item {item.id} has unknown type {item.type!r}")
+        by_id[item.id] = item
+
+    for item in items:
+        for blocked in item.blocking:
+            if blocked in by_id and item.id not in by_id[blocked].blocked_by:
+                by_id[blocked].blocked_by.append(item.id)
+    for item in items:
+        if item.parent not in by_id:
+            item.parent = None
+        item.blocked_by = list(
+            dict.fromkeys(
+                blocker
+                for blocker in item.blocked_by
+                if blocker in by_id and blocker not in (item.id, item.parent)
+            )
+        )
+        item.blocking = [other.id for other in items if item.id in other.blocked_by]
+        if item.parent:
+            by_id[item.parent].children.append(item.id)
+    return items
+
+
+def dependency_levels(items: List[PlanItem]) -> List[List[PlanItem]]:
+    """
+    Group items into levels: every item comes after its parent and the items
+    blocking it, and items within one level do not depend on each other.
+    Raises PlanError on a dependency cycle.
+    """
+    by_id = {item.id: item for item in items}
+    position = {item.id: index for index, item in enumerate(items)}
+    waiting_on = {
+        item.id: set(item.blocked_by) | ({item.parent} if item.parent else set()) for item in items
+    }
+    dependents: Dict[str, List[str]] = {item.id: [] for item in items}
+    for item_id, requirements in waiting_on.items():
+        for requirement in requirements:
+            dependents[requirement].append(item_id)
+
+    levels: List[List[PlanItem]] = []
+    ready = [item.id for item in items if not waiting_on[item.id]]
+    placed = 0
+    while ready:
+        levels.append([by_id[item_id] for item_id in ready])
+        placed += len(ready)
+        next_ready = []
+        for item_id in ready:
+            for dependent in dependents[item_id]:
+                waiting_on[dependent].discard(item_id)
+                if not waiting_on[dependent]:
+                    next_ready.append(dependent)
+        ready = sorted(next_ready, key=position.__getitem__)
+    if placed != len(items):
+        cycle = sorted(item_id for item_id, requirements in waiting_on.items() if requirements)
+        raise PlanError(f"Dependency cycle between {', '.join(cycle)}")
+    return levels
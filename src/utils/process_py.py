@@ -0,0 +1,90 @@
+"""Async subprocess runner shared by all git/gh calls."""
+
+import asyncio
+import os
+import subprocess
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+from utils.trace_py import redact_argv, span, span_name
+
+
+@dataclass
+class CommandResult:
+    """Outcome of a finished command."""
+
+    args: List[str]
+    returncode: int
+    stdout: str
+    stderr: str
+    duration: float
+
+
+_semaphore: Optional[asyncio.Semaphore] = None
+_semaphore_loop = None
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    """Get the process-wide concurrency limit for the running event loop."""
+    global _semaphore, _semaphore_loop
+    loop = asyncio.get_running_loop()
+    if _semaphore is None or _semaphore_loop is not loop:
+        limit = int(os.environ.get("CWAI_MAX_PROCESSES", "8"))
+        _semaphore, _semaphore_loop = asyncio.Semaphore(max(1, limit)), loop
+    return _semaphore
+
+
+async def run_command(
+    args: Sequence[str],
+    *,
+    check: bool = True,
+    timeout: Optional[float] = None,
+    cwd: Optional[str] = None,
+    input: Optional[str] = None,
+) -> CommandResult:
+    """
+    Run a command without blocking the event loop.
+
+    At most CWAI_MAX_PROCESSES commands run at once. The command is killed after
+    `timeout` seconds (CWAI_COMMAND_TIMEOUT, default 120) and raises
+    subprocess.TimeoutExpired; a non-zero exit raises subprocess.CalledProcessError
+    when `check` is set, just like subprocess.run.
+    """
+    args = [str(arg) for arg in args]
+    if timeout is None:
+        timeout = float(os.environ.get("CWAI_COMMAND_TIMEOUT", "120"))
+
+    async with _get_semaphore():
+        with span(span_name(args), "subprocess", argv=redact_argv(args)) as trace_args:
+            start = time.perf_counter()
+            process = await asyncio.create_subprocess_exec(
+                *args,
+                stdin=subprocess.PIPE if input is not None else subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                cwd=cwd,
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(
+                    process.communicate(input.encode() if input is not None else None), timeout
+                )
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                raise subprocess.TimeoutExpired(args, timeout)
+            duration = time.perf_counter() - start
+            trace_args["exit_code"] = process.returncode
+
+    result = CommandResult(
+        args=args,
+        returncode=process.returncode,
+        stdout=stdout.decode("utf-8", errors="replace"),
+        stderr=stderr.decode("utf-8", errors="replace"),
+        duration=duration,
+    )
+    if check and result.returncode != 0:
+        raise subprocess.CalledProcessError(
+            result.returncode, args, output=result.stdout, stderr=result.stderr
+        )
+    return result
@@ -0,0 +1,256 @@
+"""Repository context (root, git dirs, git config) resolved without spawning git."""
+
+import os
+import subprocess
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from utils.trace_py import span, span_name
+
+# Environment variables that change how git finds repositories or configuration.
+# When any of them is set we defer to git itself instead of guessing.
+EXOTIC_GIT_ENV = (
+    "GIT_DIR",
+    "GIT_WORK_TREE",
+    "GIT_COMMON_DIR",
+    "GIT_CONFIG",
+    "GIT_CONFIG_COUNT",
+    "GIT_CONFIG_PARAMETERS",
+)
+
+
+class GitConfigError(ValueError):
+    """Raised when a git config file cannot be parsed."""
+
+
+def parse_git_config(text: str) -> List[Tuple[str, str]]:
+    """
+    Parse git config file contents into ordered (key, value) pairs.
+    Keys are normalized like `git config` does: `section.subsection.name`, with the
+    section and name lowercased and the subsection kept as written.
+    """
+    entries = []
+    section = None
+    lines = text.splitlines()
+    index = 0
+
+    while index < len(lines):
+        line = lines[index].strip()
+        index += 1
+
+        if line.startswith("["):
+            end = line.find("]")
+            if end == -1:
+                raise GitConfigError(f"Bad section header: {line}")
+            section = _parse_section(line[1:end])
+            line = line[end + 1 :].strip()
+
+        if not line or line[0] in "#;":
+            continue
+        if section is None:
+            raise GitConfigError(f"Key outside of a section: {line}")
+
+        name, sep, raw_value = line.partition("=")
+        name = name.strip().lower()
+        if not sep:
+            entries.append((f"{section}.{name}", "true"))
+            continue
+
+        # A trailing backslash continues the value on the next line
+        while _ends_with_continuation(raw_value) and index < len(lines):
+            raw_value += "\n" + lines[index]
+            index += 1
+        entries.append((f"{section}.{name}", _parse_value(raw_value)))
+
+    return entries
+
+
+def _parse_section(header: str) -> str:
+    name, _, rest = header.strip().partition(" ")
+    rest = rest.strip()
+    if rest:
+        if len(rest) < 2 or rest[0] != '"' or rest[-1] != '"':
+            raise GitConfigError(f"Bad subsection: {header}")
+        subsection = rest[1:-1].replace('\\"', '"').replace("\\\\", "\\")
+        return f"{name.lower()}.{subsection}"
+    # Plain [section] or the deprecated [section.subsection], both lowercased
+    return name.lower()
+
+
+def _ends_with_continuation(raw: str) -> bool:
+    stripped = raw.rstrip("\r")
+    return (len(stripped) - len(stripped.rstrip("\\"))) % 2 == 1
+
+
+def _parse_value(raw: str) -> str:
+    """Parse a raw value the way git does: quotes, escapes, comments and whitespace."""
+    out = []
+    pending_space = ""
+    in_quotes = False
+    escapes = {"n": "\n", "t": "\t", "b": "\b", "\\": "\\", '"': '"'}
+    chars = iter(raw.strip())
+
+    for char in chars:
+        if char == "\\":
+            nxt = next(chars, None)
+            if nxt == "\n":
+                continue
+            if nxt not in escapes:
+                raise GitConfigError(f"Bad escape in value: {raw}")
+            out.append(pending_space + escapes[nxt])
+            pending_space = ""
+        elif char == '"':
+            in_quotes = not in_quotes
+            out.append(pending_space)
+            pending_space = ""
+        elif not in_quotes and char in "#;":
+            break
+        elif not in_quotes and char.isspace():
+            # Interior whitespace becomes spaces, trailing whitespace is dropped
+            pending_space += " " if out else ""
+        else:
+            out.append(pending_space + char)
+            pending_space = ""
+
+    return "".join(out)
+
+
+def find_git_dirs(start: Path) -> Optional[Tuple[Path, Path, Path]]:
+    """
+    Walk up from start to the first folder holding `.git`.
+    Returns (worktree root, git dir, common dir). `.git` files (`gitdir: ...`, used
+    by linked worktrees and submodules) and `commondir` indirections are followed.
+    """
+    for directory in (start, *start.parents):
+        dot_git = directory / ".git"
+        if dot_git.is_dir():
+            git_dir = dot_git
+        elif dot_git.is_file():
+            content = dot_git.read_text().strip()
+            if not content.startswith("gitdir:"):
+                continue
+            git_dir = Path(content[len("gitdir:") :].strip())
+            if not git_dir.is_absolute():
+                git_dir = (directory / git_dir).resolve()
+        else:
+            continue
+
+        common_dir = git_dir
+        commondir_file = git_dir / "commondir"
+        if commondir_file.is_file():
+            common_dir = Path(commondir_file.read_text().strip())
+            if not common_dir.is_absolute():
+                common_dir = (git_dir / common_dir).resolve()
+        return directory, git_dir, common_dir
+    return None
+
+
+def global_config_paths() -> List[Path]:
+    """Get the system, XDG and global config files in increasing precedence."""
+    paths = []
+    if not os.environ.get("GIT_CONFIG_NOSYSTEM"):
+        paths.append(Path(os.environ.get("GIT_CONFIG_SYSTEM", "/etc/gitconfig")))
+    if os.environ.get("GIT_CONFIG_GLOBAL"):
+        paths.append(Path(os.environ["GIT_CONFIG_GLOBAL"]).expanduser())
+        return paths
+    xdg = os.environ.get("XDG_CONFIG_HOME") or Path.home() / ".config"
+    paths.append(Path(xdg) / "git" / "config")
+    paths.append(Path.home() / ".gitconfig")
+    return paths
+
+
+@dataclass
+class RepoContext:
+    """Everything CwAI needs to know about the current repository, resolved once."""
+
+    root: Path
+    git_dir: Optional[Path] = None
+    common_dir: Optional[Path] = None
+    config: Dict[str, str] = field(default_factory=dict)
+    exotic: bool = False
+
+    @classmethod
+    def discover(cls, start: Optional[Path] = None) -> "RepoContext":
+        """
+        Resolve the repository containing start (default: current directory).
+        Falls back to the current directory outside of git repositories, like
+        get_repo_root always did.
+        """
+        start = Path(start or Path.cwd()).resolve()
+        if any(os.environ.get(name) for name in EXOTIC_GIT_ENV):
+            return cls(root=_git_toplevel() or start, exotic=True)
+
+        found = find_git_dirs(start)
+        if found:
+            root, git_dir, common_dir = found
+        else:
+            root, git_dir, common_dir = start, None, None
+
+        config_paths = global_config_paths()
+        if common_dir:
+            config_paths.append(common_dir / "config")
+
+        config: Dict[str, str] = {}
+        exotic = False
+        for path in config_paths:
+            try:
+                entries = parse_git_config(path.read_text(encoding="utf-8"))
+            except (FileNotFoundError, NotADirectoryError, PermissionError):
+                continue
+            except (GitConfigError, UnicodeDecodeError):
+                exotic = True
+                continue
+            for key, value in entries:
+                if key.startswith("include.") or key.startswith("includeif."):
+                    exotic = True
+                config[key] = value
+
+        if git_dir and config.get("extensions.worktreeconfig") == "true":
+            # Per-worktree config overrides are rare enough to leave to git
+            exotic = True
+
+        return cls(root=root, git_dir=git_dir, common_dir=common_dir, config=config, exotic=exotic)
+
+    @property
+    def main_root(self) -> Path:
+        """
+        Root of the main worktree. Inside a linked worktree (`git worktree add`)
+        root is that worktree's own checkout; this is the one it was added from.
+        """
+        if self.common_dir and self.common_dir != self.git_dir and self.common_dir.name == ".git":
+            return self.common_dir.parent
+        return self.root
+
+    @property
+    def user_name(self) -> Optional[str]:
+        """Configured user.name, or None if not set."""
+        return self.config.get("user.name") or None
+
+    @property
+    def user_email(self) -> Optional[str]:
+        """Configured user.email, or None if not set."""
+        return self.config.get("user.email") or None
+
+
+def _git_toplevel() -> Optional[Path]:
+    args = ["git", "rev-parse", "--show-toplevel"]
+    with span(span_name(args), "subprocess", argv=args) as trace_args:
+        try:
+            result = subprocess.run(args, capture_output=True, text=True, check=True)
+        except (subprocess.CalledProcessError, FileNotFoundError) as error:
+            trace_args["exit_code"] = getattr(error, "returncode", None)
+            return None
+        trace_args["exit_code"] = 0
+        return Path(result.stdout.strip())
+
+
+_contexts: Dict[Path, RepoContext] = {}
+
+
+def get_repo_context(start: Optional[Path] = None) -> RepoContext:
+    """Get the repository context for start (default: cwd), computed once per process."""
+    key = Path(start or Path.cwd())
+    if key not in _contexts:
+        _contexts[key] = RepoContext.discover(key)
+    return _contexts[key]
@@ -0,0 +1,330 @@
+"""BM25 full-text index over feature documents and local issues."""
+
+import hashlib
+import math
+import os
+import re
+import sqlite3
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from utils.fs_py import specs_state_dir
+from utils.issue_manager_py import COMMENTS_JOURNAL, load_issue
+from utils.logger_py import log_debug
+from utils.specs_layout_py import iter_feature_dirs
+from utils.sqlite_issue_manager_py import stored_issue_revisions
+
+INDEX_FILE_NAME = "search.sqlite"
+
+# Bump when the schema or tokenizer changes; older index files are rebuilt
+SCHEMA_VERSION = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    doc_id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE,
+    feature TEXT,
+    kind TEXT,
+    title TEXT,
+    signature TEXT,
+    hash TEXT,
+    length INTEGER
+);
+-- Document length is repeated here so scoring never has to join docs
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT,
+    doc_id INTEGER,
+    tf INTEGER,
+    length INTEGER,
+    PRIMARY KEY (term, doc_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc_id);
+CREATE INDEX IF NOT EXISTS docs_feature ON docs (feature);
+"""
+
+# BM25 parameters, the usual defaults
+K1 = 1.2
+B = 0.75
+
+TOKEN_PATTERN = re.compile(r"[^\W_]{2,}")
+STOPWORDS = frozenset(
+    "an and are as at be but by for from has have if in into is it its of on or so such "
+    "that the their then there these they this to was were will with".split()
+)
+
+SNIPPET_WIDTH = 160
+
+# Terms in more than about half of all documents (idf below log 2) count as common
+COMMON_TERM_IDF = math.log(2)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens, dropping stopwords."""
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOPWORDS]
+
+
+def issue_text(issue: dict) -> str:
+    """Searchable text of a local issue: title, description and comments."""
+    parts = [issue.get("title") or "", issue.get("description") or ""]
+    parts.extend(comment.get("comment") or "" for comment in issue.get("comments", []))
+    return "\n\n".join(parts)
+
+
+def make_snippet(text: str, terms: List[str]) -> str:
+    """Cut a short excerpt of text around the first occurrence of a query term."""
+    lowered = text.lower()
+    positions = [lowered.find(term) for term in terms]
+    positions = [p for p in positions if p >= 0]
+    start = max(0, min(positions) - SNIPPET_WIDTH // 4) if positions else 0
+    excerpt = " ".join(text[start : start + SNIPPET_WIDTH].split())
+    return ("…" if start else "") + excerpt + ("…" if start + SNIPPET_WIDTH < len(text) else "")
+
+
+class SearchIndex:
+    """
+    Inverted index with BM25 ranking, stored next to the issue index.
+
+    Every markdown file in a feature folder is one document, and so is the feature's
+    issue (issue.json plus comments.jsonl, or its row in the sqlite issue store).
+    A refresh stats all documents and only re-reads those whose mtime/size changed;
+    a changed file whose content hash is the same as before is not re-tokenized.
+    """
+
+    def __init__(self, specs_dir: Path):
+        self.specs_dir = Path(specs_dir)
+        self.path = specs_state_dir(self.specs_dir) / INDEX_FILE_NAME
+        self._db: Optional[sqlite3.Connection] = None
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        if self._db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            # Postings arrive in document order but are stored in term order; a larger
+            # page cache keeps bulk indexing from thrashing
+            db.execute("PRAGMA cache_size=-65536")
+            if db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                db.executescript(
+                    "DROP TABLE IF EXISTS docs; DROP TABLE IF EXISTS postings; "
+                    "DROP TABLE IF EXISTS meta;"
+                )
+                db.executescript(SCHEMA)
+                db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            self._db = db
+        return self._db
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def scan(self) -> Iterator[Tuple[str, str, str]]:
+        """Yield (relative path, feature, signature) for every document on disk."""
+        # Issues the sqlite manager keeps without issue.json are signed by revision
+        revisions = stored_issue_revisions(self.specs_dir)
+        for folder, feature in iter_feature_dirs(self.specs_dir):
+            issue_signature = None
+            journal_signature = "-"
+            with os.scandir(feature.path) as entries:
+                pending = [(folder, entries)]
+                while pending:
+                    prefix, entries = pending.pop()
+                    for entry in entries:
+                        name = entry.name
+                        if name.endswith(".md"):
+                            stat = entry.stat()
+                            yield f"{prefix}/{name}", folder, f"{stat.st_mtime_ns}:{stat.st_size}"
+                        elif name.startswith("."):
+                            continue
+                        elif prefix == folder and name == "issue.json":
+                            stat = entry.stat()
+                            issue_signature = f"{stat.st_mtime_ns}:{stat.st_size}"
+                        elif prefix == folder and name == COMMENTS_JOURNAL:
+                            stat = entry.stat()
+                            journal_signature = f"{stat.st_mtime_ns}:{stat.st_size}"
+                        elif entry.is_dir():
+                            # Nested folders are rare; read them eagerly
+                            with os.scandir(entry.path) as nested:
+                                pending.append((f"{prefix}/{name}", list(nested)))
+            if issue_signature:
+                yield f"{folder}/issue.json", folder, f"{issue_signature}/{journal_signature}"
+            elif folder in revisions:
+                yield f"{folder}/issue.json", folder, f"sqlite:{revisions[folder]}"
+
+    def read_document(self, relative_path: str) -> Tuple[str, str]:
+        """Get (title, text) of a document."""
+        path = self.specs_dir / relative_path
+        if path.name == "issue.json":
+            issue = load_issue(path.parent)
+            return issue.get("title") or "", issue_text(issue)
+        text = path.read_text(encoding="utf-8", errors="replace")
+        title = next(
+            (line.lstrip("#").strip() for line in text.splitlines() if line.startswith("#")), ""
+        )
+        return title or path.stem, text
+
+    def refresh(self, full: bool = False) -> int:
+        """
+        Re-index changed documents and drop deleted ones. With full set, every
+        document is re-read and hashed, even when its mtime and size look unchanged.
+        Returns the number of documents re-indexed.
+        """
+        stored: Dict[str, Tuple[int, str]] = {
+            path: (doc_id, signature)
+            for doc_id, path, signature in self.db.execute(
+                "SELECT doc_id, path, signature FROM docs"
+            )
+        }
+        seen = set()
+        changed = []
+        for relative_path, feature, signature in self.scan():
+            seen.add(relative_path)
+            previous = stored.get(relative_path)
+            if full or previous is None or previous[1] != signature:
+                changed.append((relative_path, feature, signature))
+
+        removed = [stored[path][0] for path in stored.keys() - seen]
+
+        reindexed = 0
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            for doc_id in removed:
+                self._delete(doc_id)
+            for relative_path, feature, signature in changed:
+                try:
+                    title, text = self.read_document(relative_path)
+                except (OSError, ValueError) as error:
+                    log_debug(f"Skipping {relative_path} in search index: {error}")
+                    continue
+                digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+                row = self.db.execute(
+                    "SELECT doc_id, hash FROM docs WHERE path = ?", (relative_path,)
+                ).fetchone()
+                if row and row[1] == digest:
+                    # Touched but not changed (checkout, copy, save without edits)
+                    self.db.execute(
+                        "UPDATE docs SET signature = ? WHERE doc_id = ?", (signature, row[0])
+                    )
+                    continue
+                if row:
+                    self._delete(row[0])
+                self._insert(relative_path, feature, title, signature, digest, text)
+                reindexed += 1
+        return reindexed
+
+    def _delete(self, doc_id: int) -> None:
+        self.db.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+        self.db.execute("DELETE FROM docs WHERE doc_id = ?", (doc_id,))
+
+    def _insert(
+        self, relative_path: str, feature: str, title: str, signature: str, digest: str, text: str
+    ) -> None:
+        tokens = tokenize(text)
+        length = len(tokens)
+        kind = "issue" if relative_path.endswith("issue.json") else "doc"
+        cursor = self.db.execute(
+            "INSERT INTO docs (path, feature, kind, title, signature, hash, length) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (relative_path, feature, kind, title, signature, digest, length),
+        )
+        doc_id = cursor.lastrowid
+        self.db.executemany(
+            "INSERT INTO postings (term, doc_id, tf, length) VALUES (?, ?, ?, ?)",
+            [(term, doc_id, tf, length) for term, tf in Counter(tokens).items()],
+        )
+
+    def _score(
+        self,
+        weights: List[Tuple[str, float]],
+        average_length: float,
+        limit: int,
+        feature: Optional[str],
+        candidate_terms: Optional[List[Tuple[str, float]]] = None,
+    ) -> List[Tuple[int, float]]:
+        """Get the top (doc_id, BM25 score) pairs, optionally among candidate documents."""
+        values = ", ".join("(?, ?)" for _ in weights)
+        params: List = [value for weight in weights for value in weight]
+        params.extend([K1 + 1, K1, 1 - B, B / average_length])
+        sql = (
+            f"WITH q(term, idf) AS (VALUES {values}) "
+            "SELECT p.doc_id, SUM(q.idf * p.tf * ? / (p.tf + ? * (? + ? * p.length))) AS score "
+            "FROM q JOIN postings p ON p.term = q.term"
+        )
+        clauses = []
+        if candidate_terms:
+            placeholders = ", ".join("?" for _ in candidate_terms)
+            clauses.append(
+                f"p.doc_id IN (SELECT doc_id FROM postings WHERE term IN ({placeholders}))"
+            )
+            params.extend(term for term, _ in candidate_terms)
+        if feature:
+            clauses.append("p.doc_id IN (SELECT doc_id FROM docs WHERE feature = ?)")
+            params.append(feature)
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " GROUP BY p.doc_id ORDER BY score DESC LIMIT ?"
+        params.append(limit)
+        return self.db.execute(sql, params).fetchall()
+
+    def search(self, query: str, limit: int = 10, feature: Optional[str] = None) -> List[dict]:
+        """Rank documents against query with BM25 and return the top hits with snippets."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        total_docs, total_length = self.db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(length), 0) FROM docs"
+        ).fetchone()
+        if not total_docs:
+            return []
+        average_length = total_length / total_docs or 1
+
+        placeholders = ", ".join("?" for _ in terms)
+        weights = []
+        for term, df in self.db.execute(
+            f"SELECT term, COUNT(*) FROM postings WHERE term IN ({placeholders}) GROUP BY term",
+            terms,
+        ):
+            idf = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+            weights.append((term, idf))
+        if not weights:
+            return []
+
+        # Very common terms have postings in most documents. Score the documents that
+        # contain a selective term first; if the k-th best of those already beats the
+        # most the common terms alone could add up to, no other document can rank
+        # higher and the full scan is skipped.
+        selective = [w for w in weights if w[1] >= COMMON_TERM_IDF]
+        common = [w for w in weights if w[1] < COMMON_TERM_IDF]
+        ranked = None
+        if selective and common:
+            ranked = self._score(weights, average_length, limit, feature, selective)
+            bound = sum(idf * (K1 + 1) for _, idf in common)
+            if len(ranked) < limit or ranked[-1][1] < bound:
+                ranked = None
+        if ranked is None:
+            ranked = self._score(weights, average_length, limit, feature)
+
+        hits = []
+        for doc_id, score in ranked:
+            path, feature_name, kind, title = self.db.execute(
+                "SELECT path, feature, kind, title FROM docs WHERE doc_id = ?", (doc_id,)
+            ).fetchone()
+            try:
+                _, text = self.read_document(path)
+                snippet = make_snippet(text, terms)
+            except (OSError, ValueError):
+                snippet = ""
+            hits.append(
+                {
+                    "feature": feature_name,
+                    "path": path,
+                    "kind": kind,
+                    "title": title,
+                    "score": round(score, 4),
+                    "snippet": snippet,
+                }
+            )
+        return hits
@@ -0,0 +1,181 @@
+"""Where feature folders live inside the specs folder (CWAI_SPECS_LAYOUT)."""
+
+import os
+import re
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+from utils.helpers_py import extract_feature_id, padd_feature_id
+
+LAYOUTS = ("flat", "sharded")
+
+# Sharded layout: specs/<id / 10000>/<id / 100 % 100>/<id>-<slug>, so a leaf folder
+# never holds more than 100 features and the top level grows by one every 10000
+TOP_SHARD = re.compile(r"^\d{2,}$")
+LEAF_SHARD = re.compile(r"^\d{2}$")
+FEATURE_FOLDER = re.compile(r"^\d{5,}-")
+
+
+def get_specs_layout() -> str:
+    """Get the layout new feature folders are created in: `flat` (default) or `sharded`."""
+    layout = os.environ.get("CWAI_SPECS_LAYOUT", "flat").lower()
+    if layout not in LAYOUTS:
+        raise ValueError(f"CWAI_SPECS_LAYOUT must be one of {', '.join(LAYOUTS)}, got {layout!r}")
+    return layout
+
+
+def shard_of(feature_id: int) -> str:
+    """Get the shard folder (relative to the specs folder) of a feature ID."""
+    return f"{feature_id // 10000:02d}/{feature_id // 100 % 100:02d}"
+
+
+def feature_relpath(feature_name: str, layout: Optional[str] = None) -> str:
+    """Get the path of a feature folder relative to the specs folder."""
+    layout = layout or get_specs_layout()
+    feature_id = extract_feature_id(feature_name)
+    if layout == "flat" or not feature_id:
+        return feature_name
+    return f"{shard_of(feature_id)}/{feature_name}"
+
+
+def feature_path(specs_dir: Path, feature_name: str, layout: Optional[str] = None) -> Path:
+    """Get where a feature folder belongs under the given (default: configured) layout."""
+    return Path(specs_dir) / feature_relpath(feature_name, layout)
+
+
+def resolve_feature_dir(specs_dir: Path, feature_name: str) -> Path:
+    """
+    Find an existing feature folder by name with at most two stats, whichever layout
+    it was created in. Returns where it belongs in the configured layout if absent.
+    """
+    preferred = get_specs_layout()
+    path = feature_path(specs_dir, feature_name, preferred)
+    if path.is_dir():
+        return path
+    other = feature_path(specs_dir, feature_name, "flat" if preferred == "sharded" else "sharded")
+    return other if other.is_dir() else path
+
+
+def locate_feature(specs_dir: Path, feature_id: int) -> Optional[Path]:
+    """
+    Find a feature folder by ID alone. Sharded folders are found by listing their
+    shard (at most 100 entries); flat ones through the issue index when one has
+    been built, and by listing the specs folder otherwise.
+    """
+    specs_dir = Path(specs_dir)
+    prefix = f"{padd_feature_id(feature_id)}-"
+    shard = specs_dir / shard_of(feature_id)
+    if shard.is_dir():
+        with os.scandir(shard) as entries:
+            for entry in entries:
+                if entry.name.startswith(prefix) and entry.is_dir():
+                    return Path(entry.path)
+
+    from utils.issue_index_py import lookup_folder
+
+    folder = lookup_folder(specs_dir, feature_id)
+    if folder and (specs_dir / folder).is_dir():
+        return specs_dir / folder
+    if specs_dir.is_dir():
+        with os.scandir(specs_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith(prefix) and entry.is_dir():
+                    return Path(entry.path)
+    return None
+
+
+def specs_dir_of(feature_dir: Path) -> Path:
+    """Get the specs folder a feature folder belongs to."""
+    parent = Path(feature_dir).parent
+    if LEAF_SHARD.match(parent.name) and TOP_SHARD.match(parent.parent.name):
+        return parent.parent.parent
+    return parent
+
+
+def iter_feature_dirs(specs_dir: Path) -> Iterator[Tuple[str, os.DirEntry]]:
+    """
+    Yield (path relative to the specs folder, entry) for every feature folder, in
+    either layout; a specs folder half way through a migration lists completely.
+    """
+    specs_dir = Path(specs_dir)
+    if not specs_dir.is_dir():
+        return
+    with os.scandir(specs_dir) as entries:
+        for entry in entries:
+            if entry.name.startswith(".") or not entry.is_dir():
+                continue
+            if not TOP_SHARD.match(entry.name):
+                yield entry.name, entry
+                continue
+            with os.scandir(entry.path) as leaves:
+                for leaf in leaves:
+                    if not LEAF_SHARD.match(leaf.name) or not leaf.is_dir():
+                        continue
+                    with os.scandir(leaf.path) as features:
+                        for feature in features:
+                            if not feature.name.startswith(".") and feature.is_dir():
+                                yield f"{entry.name}/{leaf.name}/{feature.name}", feature
+
+
+def _mtime_ns(path) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except (FileNotFoundError, NotADirectoryError):
+        return 0
+
+
+def specs_signature(specs_dir: Path) -> str:
+    """
+    Value that changes whenever a feature folder is added or removed.
+    Flat layouts use the specs folder's mtime alone; sharded ones also stat every
+    shard folder (one per 100 features), which stays far cheaper than a listing.
+    """
+    specs_mtime = _mtime_ns(specs_dir)
+    if get_specs_layout() == "flat":
+        return str(specs_mtime)
+    latest, count = specs_mtime, 0
+    if specs_mtime:
+        with os.scandir(specs_dir) as entries:
+            for entry in entries:
+                if not TOP_SHARD.match(entry.name) or not entry.is_dir():
+                    continue
+                latest = max(latest, entry.stat().st_mtime_ns)
+                with os.scandir(entry.path) as leaves:
+                    for leaf in leaves:
+                        if LEAF_SHARD.match(leaf.name):
+                            latest = max(latest, leaf.stat().st_mtime_ns)
+                            count += 1
+    return f"{specs_mtime}:{latest}:{count}"
+
+
+def migrate_specs_layout(specs_dir: Path, layout: str) -> int:
+    """
+    Move every NNNNN-slug feature folder to where layout puts it and remove shard
+    folders left empty. Returns the number of folders moved.
+    """
+    specs_dir = Path(specs_dir)
+    moved = 0
+    for relative, entry in list(iter_feature_dirs(specs_dir)):
+        if not FEATURE_FOLDER.match(entry.name):
+            continue
+        target = feature_path(specs_dir, entry.name, layout)
+        if target == specs_dir / relative or target.exists():
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.rename(entry.path, target)
+        moved += 1
+
+    with os.scandir(specs_dir) as entries:
+        shards = [Path(e.path) for e in entries if TOP_SHARD.match(e.name) and e.is_dir()]
+    for shard in shards:
+        for leaf in shard.iterdir():
+            if LEAF_SHARD.match(leaf.name):
+                try:
+                    leaf.rmdir()
+                except OSError:
+                    pass
+        try:
+            shard.rmdir()
+        except OSError:
+            pass
+    return moved
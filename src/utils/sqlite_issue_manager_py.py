@@ -0,0 +1,427 @@
+"""SQLite issue manager: every local issue of a specs folder in one transactional file."""
+
+import json
+import os
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from utils.fs_py import STATE_DIR_NAME, atomic_write_text, specs_state_dir
+from utils.helpers_py import concatenate_arrays, padd_feature_id
+from utils.id_allocator_py import FeatureIdAllocator
+from utils.issue_manager_py import (
+    COMMENTS_JOURNAL,
+    LocalFSIssueManager,
+    _record_description,
+    _update_index,
+    load_issue,
+)
+from utils.logger_py import log_debug, log_info
+from utils.specs_layout_py import feature_path, iter_feature_dirs, specs_dir_of, specs_signature
+
+STORE_FILE_NAME = "issues.sqlite"
+
+SCHEMA_VERSION = 2
+
+# Fields issue.json always has; anything else (e.g. "plan", "url") is kept in extra
+ISSUE_FIELDS = ("id", "author", "title", "description", "labels", "created_at", "updated_at")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    id INTEGER PRIMARY KEY,
+    folder TEXT,
+    author TEXT,
+    title TEXT,
+    description TEXT,
+    labels TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    extra TEXT,
+    revision INTEGER DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS comments (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    issue INTEGER,
+    author TEXT,
+    comment TEXT,
+    created_at TEXT
+);
+CREATE INDEX IF NOT EXISTS comments_issue ON comments (issue, seq);
+CREATE INDEX IF NOT EXISTS issues_folder ON issues (folder);
+"""
+
+ISSUE_COLUMNS = "folder, id, author, title, description, labels, created_at, updated_at, extra"
+
+
+def snapshots_enabled() -> bool:
+    """
+    Check whether issue.json snapshots are written (CWAI_SQLITE_SNAPSHOTS, on by
+    default). The store sits in the untracked state folder, so without snapshots
+    issues never reach git.
+    """
+    return os.environ.get("CWAI_SQLITE_SNAPSHOTS", "on").lower() in ("1", "on", "true", "yes")
+
+
+class IssueStore:
+    """
+    Issues and their comments, in specs/.cwai-state/issues.sqlite.
+    The file is local to the checkout; issue.json snapshots are what gets shared.
+
+    Creating or updating an issue is one short write transaction in WAL mode,
+    so concurrent writers queue on SQLite's lock instead of rewriting JSON files,
+    and readers never block them. Issues come out in the shape issue.json has.
+    Every write bumps the issue's revision, which the indexes use the way they
+    use issue.json mtimes to notice changes.
+    """
+
+    def __init__(self, specs_dir: Path):
+        self.specs_dir = Path(specs_dir)
+        self.path = specs_state_dir(self.specs_dir) / STORE_FILE_NAME
+        self._db: Optional[sqlite3.Connection] = None
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        if self._db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            version = db.execute("PRAGMA user_version").fetchone()[0]
+            if version not in (0, 1, SCHEMA_VERSION):
+                db.close()
+                raise RuntimeError(f"{self.path} has unknown schema version {version}")
+            if version == 1:
+                db.execute("ALTER TABLE issues ADD COLUMN revision INTEGER DEFAULT 0")
+            db.executescript(SCHEMA)
+            db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            self._db = db
+        return self._db
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def insert(self, folder: str, issue: dict) -> None:
+        """Store an issue with its comments, replacing one with the same ID."""
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            self._replace(folder, issue)
+
+    def _replace(self, folder: str, issue: dict) -> None:
+        extra = {k: v for k, v in issue.items() if k not in ISSUE_FIELDS and k != "comments"}
+        self.db.execute("DELETE FROM comments WHERE issue = ?", (issue["id"],))
+        self.db.execute(
+            "INSERT OR REPLACE INTO issues "
+            "(id, folder, author, title, description, labels, created_at, updated_at, extra, "
+            "revision) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, "
+            "COALESCE((SELECT revision FROM issues WHERE id = ?), 0) + 1)",
+            (
+                issue["id"],
+                folder,
+                issue.get("author"),
+                issue.get("title"),
+                issue.get("description"),
+                json.dumps(issue.get("labels", [])),
+                issue.get("created_at"),
+                issue.get("updated_at"),
+                json.dumps(extra) if extra else None,
+                issue["id"],
+            ),
+        )
+        self.db.executemany(
+            "INSERT INTO comments (issue, author, comment, created_at) VALUES (?, ?, ?, ?)",
+            [
+                (issue["id"], c.get("author"), c.get("comment"), c.get("created_at"))
+                for c in issue.get("comments", [])
+            ],
+        )
+
+    def add_update(self, feature_id: int, entry: dict) -> None:
+        """Apply one update: append the comment and merge the label changes."""
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            row = self.db.execute(
+                "SELECT labels FROM issues WHERE id = ?", (feature_id,)
+            ).fetchone()
+            if row is None:
+                raise LookupError(f"No issue #{feature_id} in {self.path}")
+            labels = concatenate_arrays(
+                ",".join(json.loads(row[0])), ",".join(entry.get("labels", []))
+            )
+            self.db.execute(
+                "UPDATE issues SET labels = ?, updated_at = ?, revision = revision + 1 "
+                "WHERE id = ?",
+                (
+                    json.dumps([label for label in labels.split(",") if label]),
+                    entry["created_at"],
+                    feature_id,
+                ),
+            )
+            self.db.execute(
+                "INSERT INTO comments (issue, author, comment, created_at) VALUES (?, ?, ?, ?)",
+                (feature_id, entry["author"], entry["comment"], entry["created_at"]),
+            )
+
+    def patch(self, folder: str, fields: dict) -> None:
+        """Set top-level fields of a feature folder's issue, e.g. links to other issues."""
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            row = self.db.execute(
+                f"SELECT {ISSUE_COLUMNS} FROM issues WHERE folder = ?", (folder,)
+            ).fetchone()
+            if row is None:
+                raise LookupError(f"No issue for {folder} in {self.path}")
+            issue = self._issue(row)
+            issue.update(fields)
+            self._replace(folder, issue)
+
+    def get(self, feature_id: int) -> Optional[dict]:
+        """Get an issue in issue.json shape, or None if it is not stored."""
+        row = self.db.execute(
+            f"SELECT {ISSUE_COLUMNS} FROM issues WHERE id = ?", (feature_id,)
+        ).fetchone()
+        return self._issue(row) if row else None
+
+    def get_folder(self, folder: str) -> Optional[dict]:
+        """Get the issue of a feature folder (relative to the specs folder), if stored."""
+        row = self.db.execute(
+            f"SELECT {ISSUE_COLUMNS} FROM issues WHERE folder = ?", (folder,)
+        ).fetchone()
+        return self._issue(row) if row else None
+
+    def revision(self, feature_id: int) -> int:
+        """Get how many times an issue has been written, 0 if it is not stored."""
+        row = self.db.execute("SELECT revision FROM issues WHERE id = ?", (feature_id,)).fetchone()
+        return row[0] if row else 0
+
+    def revisions(self) -> Dict[str, int]:
+        """Get the revision of every stored issue, by folder."""
+        return dict(self.db.execute("SELECT folder, revision FROM issues"))
+
+    def folder(self, feature_id: int) -> Optional[str]:
+        """Get the feature folder (relative to the specs folder) of an issue."""
+        row = self.db.execute("SELECT folder FROM issues WHERE id = ?", (feature_id,)).fetchone()
+        return row[0] if row else None
+
+    def issues(self) -> Iterator[Tuple[str, dict]]:
+        """Yield (folder, issue) for every stored issue, by ID."""
+        rows = self.db.execute(f"SELECT {ISSUE_COLUMNS} FROM issues ORDER BY id").fetchall()
+        for row in rows:
+            yield row[0], self._issue(row)
+
+    def count(self) -> int:
+        """Count stored issues."""
+        return self.db.execute("SELECT COUNT(*) FROM issues").fetchone()[0]
+
+    def _issue(self, row) -> dict:
+        _, feature_id, author, title, description, labels, created_at, updated_at, extra = row
+        issue = {
+            "author": author,
+            "id": feature_id,
+            "title": title,
+            "description": description,
+            "labels": json.loads(labels),
+            "created_at": created_at,
+            "updated_at": updated_at,
+            "comments": [
+                {"author": a, "comment": c, "created_at": t}
+                for a, c, t in self.db.execute(
+                    "SELECT author, comment, created_at FROM comments WHERE issue = ? "
+                    "ORDER BY seq",
+                    (feature_id,),
+                )
+            ],
+        }
+        if extra:
+            issue.update(json.loads(extra))
+        return issue
+
+    def write_snapshot(self, feature_id: int) -> None:
+        """Write an issue's issue.json into its feature folder, folding away any journal."""
+        folder = self.folder(feature_id)
+        if folder is None:
+            return
+        feature_dir = self.specs_dir / folder
+        feature_dir.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(feature_dir / "issue.json", json.dumps(self.get(feature_id), indent=2))
+        journal = feature_dir / COMMENTS_JOURNAL
+        if journal.exists():
+            journal.unlink()
+
+
+_stores: Dict[Path, IssueStore] = {}
+
+
+def get_issue_store(specs_dir: Path, create: bool = True) -> Optional[IssueStore]:
+    """
+    Get the issue store of a specs folder, shared by everything in this process.
+    Without create, None is returned when the specs folder has no store yet.
+    """
+    specs_dir = Path(specs_dir)
+    if specs_dir not in _stores:
+        if not create and not (specs_dir / STATE_DIR_NAME / STORE_FILE_NAME).exists():
+            return None
+        _stores[specs_dir] = IssueStore(specs_dir)
+    return _stores[specs_dir]
+
+
+def stored_issue_revisions(specs_dir: Path) -> Dict[str, int]:
+    """Get the revision of every issue in a specs folder's store, by folder ({} if none)."""
+    store = get_issue_store(specs_dir, create=False)
+    return store.revisions() if store else {}
+
+
+class SQLiteIssueManager(LocalFSIssueManager):
+    """
+    Issue manager keeping issues in an IssueStore instead of issue.json files.
+
+    Feature folders and branches are created exactly as with `localfs`, and IDs
+    come from the same allocator, so a specs folder can switch between the two
+    with `cwai-create-feature --import-issues` / `--export-issues`.
+    """
+
+    def store(self, specs_dir: Path) -> IssueStore:
+        """Get the issue store of a specs folder."""
+        return get_issue_store(specs_dir)
+
+    async def create_issue(
+        self,
+        feature_slug: str,
+        feature_title: str,
+        feature_parent_dir: Path,
+        feature_labels: List[str],
+        feature_body: str,
+        feature_id: Optional[int] = None,
+    ) -> int:
+        """Create a new issue in the store, optionally with an ID assigned elsewhere."""
+        allocator = FeatureIdAllocator(feature_parent_dir)
+        if feature_id is None and os.environ.get("LOCALFS_FEATURE_ID"):
+            feature_id = int(os.environ["LOCALFS_FEATURE_ID"])
+        if feature_id is not None:
+            allocator.observe(feature_id)
+        else:
+            feature_id = allocator.allocate()
+
+        feature_name = f"{padd_feature_id(feature_id)}-{feature_slug}"
+        feature_dir = feature_path(feature_parent_dir, feature_name)
+        specs_mtime = specs_signature(feature_parent_dir)
+        feature_dir.mkdir(parents=True, exist_ok=True)
+        allocator.record_created(specs_mtime)
+        folder = feature_dir.relative_to(feature_parent_dir).as_posix()
+
+        now = datetime.utcnow().isoformat() + "Z"
+        issue_data = {
+            "author": await self.get_author(),
+            "id": feature_id,
+            "title": feature_title,
+            "description": feature_body,
+            "labels": feature_labels,
+            "created_at": now,
+            "updated_at": now,
+            "comments": [],
+        }
+        store = self.store(feature_parent_dir)
+        store.insert(folder, issue_data)
+        if snapshots_enabled():
+            store.write_snapshot(feature_id)
+        revision = store.revision(feature_id)
+        _update_index(
+            feature_parent_dir,
+            lambda index: index.record_created(feature_dir, issue_data, revision),
+        )
+        _record_description(feature_parent_dir, folder, feature_body, specs_mtime)
+
+        log_info(f"✅ Created SQLite issue (#{feature_id}) {feature_title}")
+
+        return feature_id
+
+    async def update_issue(
+        self,
+        feature_id: int,
+        feature_name: str,
+        feature_dir: Path,
+        feature_labels: List[str],
+        feature_comment: str,
+    ) -> None:
+        """
+        Append a comment and label changes to an issue in the store.
+
+        An existing issue.json is what git tracks, so the update starts from it: issues
+        created by localfs, pulled from others or patched in place are (re)imported
+        first, and the file is rewritten afterwards.
+        """
+        specs_dir = specs_dir_of(feature_dir)
+        store = self.store(specs_dir)
+        has_snapshot = (feature_dir / "issue.json").exists()
+        if has_snapshot:
+            folder = Path(feature_dir).relative_to(specs_dir).as_posix()
+            store.insert(folder, load_issue(feature_dir))
+        elif store.get(feature_id) is None:
+            raise LookupError(
+                f"No issue #{feature_id}: {feature_dir} has no issue.json and {store.path} "
+                "does not have it either"
+            )
+        entry = {
+            "author": await self.get_author(),
+            "comment": feature_comment.replace(feature_name, "").strip(),
+            "created_at": datetime.utcnow().isoformat() + "Z",
+            "labels": [label for label in feature_labels if label],
+        }
+        store.add_update(feature_id, entry)
+        if has_snapshot or snapshots_enabled():
+            store.write_snapshot(feature_id)
+        _update_index(
+            specs_dir,
+            lambda index: index.record_replaced(
+                feature_dir, store.get(feature_id), store.revision(feature_id)
+            ),
+        )
+
+        log_info(f"💬 Updated SQLite issue (#{feature_id}) {feature_name}")
+
+
+def import_localfs_issues(specs_dir: Path) -> int:
+    """
+    Copy every feature's issue.json (with its journal replayed) into the store.
+    Issues already stored are replaced, so importing twice is harmless.
+    Returns the number of issues imported.
+    """
+    store = IssueStore(specs_dir)
+    imported = 0
+    try:
+        for folder, entry in iter_feature_dirs(specs_dir):
+            try:
+                issue = load_issue(Path(entry.path))
+            except (OSError, ValueError) as error:
+                log_debug(f"Skipping {folder}: {error}")
+                continue
+            if not isinstance(issue.get("id"), int):
+                log_debug(f"Skipping {folder}: issue.json has no numeric id")
+                continue
+            store.insert(folder, issue)
+            imported += 1
+    finally:
+        store.close()
+    return imported
+
+
+def export_localfs_issues(specs_dir: Path) -> int:
+    """
+    Write every stored issue back as a localfs issue.json, folding away any
+    comments.jsonl left from earlier localfs use. Returns the number written.
+    """
+    store = IssueStore(specs_dir)
+    exported = 0
+    try:
+        for folder, issue in store.issues():
+            feature_dir = Path(specs_dir) / folder
+            feature_dir.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(feature_dir / "issue.json", json.dumps(issue, indent=2))
+            journal = feature_dir / COMMENTS_JOURNAL
+            if journal.exists():
+                journal.unlink()
+            exported += 1
+    finally:
+        store.close()
+    return exported
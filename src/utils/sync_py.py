@@ -0,0 +1,243 @@
+"""Incremental, manifest-based file sync used by cwai-install."""
+
+import hashlib
+import json
+import os
+import shutil
+import stat
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from utils.fs_py import atomic_write_text
+from utils.helpers_py import get_cache_dir
+from utils.logger_py import log_debug, log_warn
+
+# Written into destination folders by earlier versions; migrated and removed on sync
+MANIFEST_NAME = ".cwai-manifest.json"
+
+# Write permission bits cleared on hardlinked files
+WRITE_BITS = stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH
+
+# Linux ioctl cloning a whole file (copy-on-write) on btrfs, XFS, bcachefs, ...
+FICLONE = 0x40049409
+
+
+@dataclass
+class SyncStats:
+    """What a sync did to the destination."""
+
+    added: int = 0
+    changed: int = 0
+    removed: int = 0
+    unchanged: int = 0
+
+    def __iadd__(self, other: "SyncStats") -> "SyncStats":
+        self.added += other.added
+        self.changed += other.changed
+        self.removed += other.removed
+        self.unchanged += other.unchanged
+        return self
+
+    def __str__(self) -> str:
+        return (
+            f"{self.added} added, {self.changed} changed, {self.removed} removed, "
+            f"{self.unchanged} unchanged"
+        )
+
+
+def file_hash(path: Path) -> str:
+    """Get the sha256 of a file's content."""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def get_link_mode() -> str:
+    """
+    How installed files are created (CWAI_INSTALL_LINK):
+    `auto` reflinks where the filesystem supports it and copies otherwise,
+    `hardlink` shares the cached file itself (read-only), `copy` always copies.
+    """
+    return os.environ.get("CWAI_INSTALL_LINK", "auto")
+
+
+def _reflink(source: Path, destination: Path) -> bool:
+    if not sys.platform.startswith("linux"):
+        return False
+    import fcntl
+
+    try:
+        with open(source, "rb") as src, open(destination, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    except OSError:
+        destination.unlink(missing_ok=True)
+        return False
+    shutil.copystat(source, destination)
+    return True
+
+
+def place_file(source: Path, destination: Path, link_mode: str) -> None:
+    """
+    Create destination with the content of source. The file is prepared next to
+    the destination and renamed over it, so readers never see a partial file and
+    replacing a hardlinked file never writes through to the cache.
+
+    Hardlinks share the cached file's inode, so they are made read-only: an edit
+    in the destination cannot change the cache. Copies are always user-writable.
+    """
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(
+        prefix=f".{destination.name}.", suffix=".tmp", dir=destination.parent
+    )
+    os.close(fd)
+    tmp = Path(tmp_name)
+    try:
+        placed = False
+        if link_mode == "hardlink":
+            tmp.unlink()
+            try:
+                os.link(source, tmp)
+                os.chmod(tmp, stat.S_IMODE(os.stat(tmp).st_mode) & ~WRITE_BITS)
+                placed = True
+            except OSError as error:
+                tmp.unlink(missing_ok=True)
+                log_debug(f"Hardlink {source} -> {destination} failed, copying: {error}")
+        elif link_mode == "auto":
+            placed = _reflink(source, tmp)
+        if not placed:
+            shutil.copy2(source, tmp)
+            # The cache may be read-only after a hardlink install
+            os.chmod(tmp, stat.S_IMODE(os.stat(tmp).st_mode) | stat.S_IWUSR)
+        os.replace(tmp, destination)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def manifest_path(dest_dir: Path) -> Path:
+    """Get where the manifest of syncs into dest_dir is kept, outside of dest_dir."""
+    digest = hashlib.sha1(str(Path(dest_dir).resolve()).encode()).hexdigest()[:16]
+    return get_cache_dir() / "install-manifests" / f"{digest}.json"
+
+
+def load_manifest(dest_dir: Path) -> Dict[str, dict]:
+    """Read the manifest of a previous sync into dest_dir (empty if there is none)."""
+    for path in (manifest_path(dest_dir), dest_dir / MANIFEST_NAME):
+        try:
+            with open(path, "r") as f:
+                return json.load(f).get("files", {})
+        except (OSError, ValueError):
+            continue
+    return {}
+
+
+def _stat_key(stat: os.stat_result) -> Tuple[int, int]:
+    return stat.st_size, stat.st_mtime_ns
+
+
+def sync_files(
+    files: Iterable[Tuple[str, Path]],
+    dest_dir: Path,
+    owned: bool = False,
+    link_mode: Optional[str] = None,
+) -> SyncStats:
+    """
+    Make dest_dir hold the given (relative destination path, source file) pairs.
+
+    Only files whose content differs from the source are written, and only files
+    the previous sync installed are deleted when they are no longer part of the
+    set. With owned set, dest_dir belongs to CwAI entirely and any other file in
+    it is deleted as well. A manifest of content hashes and stat data is kept in
+    the per-user cache, keyed by dest_dir, so unchanged files are recognised from
+    a stat alone.
+    """
+    link_mode = link_mode or get_link_mode()
+    previous = load_manifest(dest_dir)
+    manifest: Dict[str, dict] = {}
+    stats = SyncStats()
+
+    wanted = dict(files)
+    for relative, source in sorted(wanted.items()):
+        destination = dest_dir / relative
+        source_hash = file_hash(source)
+        try:
+            dest_stat = os.stat(destination)
+        except FileNotFoundError:
+            dest_stat = None
+
+        if dest_stat is not None:
+            known = previous.get(relative)
+            if (
+                known
+                and known["hash"] != source_hash
+                and os.path.samestat(dest_stat, os.stat(source))
+            ):
+                # Still linked to the cache, whose content changed since the install
+                log_warn(
+                    f"Cached {source} was modified through {destination}; "
+                    "run cwai-install --refresh to restore it"
+                )
+            recorded = {"hash": source_hash, "stat": list(_stat_key(dest_stat))}
+            if known == recorded:
+                manifest[relative] = known
+                stats.unchanged += 1
+                continue
+            # Not recorded, or touched since: compare content before rewriting
+            if file_hash(destination) == source_hash:
+                manifest[relative] = recorded
+                stats.unchanged += 1
+                continue
+
+        place_file(source, destination, link_mode)
+        manifest[relative] = {
+            "hash": source_hash,
+            "stat": list(_stat_key(os.stat(destination))),
+        }
+        if dest_stat is None:
+            stats.added += 1
+        else:
+            stats.changed += 1
+
+    stale = set(previous) - set(wanted)
+    if owned and dest_dir.is_dir():
+        for path in dest_dir.rglob("*"):
+            relative = path.relative_to(dest_dir).as_posix()
+            if path.is_file() and relative != MANIFEST_NAME and relative not in wanted:
+                stale.add(relative)
+    for relative in sorted(stale):
+        try:
+            (dest_dir / relative).unlink()
+            stats.removed += 1
+        except FileNotFoundError:
+            pass
+    if owned:
+        _remove_empty_dirs(dest_dir)
+
+    if manifest or previous:
+        path = manifest_path(dest_dir)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(path, json.dumps({"files": manifest}, indent=2, sort_keys=True))
+    (dest_dir / MANIFEST_NAME).unlink(missing_ok=True)
+    return stats
+
+
+def sync_tree(source_dir: Path, dest_dir: Path, link_mode: Optional[str] = None) -> SyncStats:
+    """Mirror source_dir into dest_dir, which CwAI owns entirely."""
+    files = [
+        (path.relative_to(source_dir).as_posix(), path)
+        for path in source_dir.rglob("*")
+        if path.is_file() and path.name != MANIFEST_NAME
+    ]
+    return sync_files(files, dest_dir, owned=True, link_mode=link_mode)
+
+
+def _remove_empty_dirs(root: Path) -> None:
+    if not root.is_dir():
+        return
+    for path in sorted((p for p in root.rglob("*") if p.is_dir()), reverse=True):
+        try:
+            path.rmdir()
+        except OSError:
+            pass
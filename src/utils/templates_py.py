@@ -0,0 +1,117 @@
+"""Registry of outline templates, compiled once and rendered with feature variables."""
+
+import os
+import re
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Tuple
+
+# {{TITLE}}-style placeholders; unknown names are left in place for the AI to fill
+PLACEHOLDER = re.compile(r"\{\{\s*([A-Z][A-Z0-9_]*)\s*\}\}")
+TEMPLATE_VARIABLES = ("FEATURE_NAME", "ISSUE_NUMBER", "TITLE", "REQUIREMENT", "DATE")
+
+
+class CompiledTemplate:
+    """A template split into literal text and variable slots."""
+
+    def __init__(self, path: Path, text: str, signature: Tuple[int, int]):
+        self.path = path
+        self.name = path.name
+        self.signature = signature
+        self.parts: List[Tuple[str, Optional[str]]] = []
+        position = 0
+        for match in PLACEHOLDER.finditer(text):
+            if match.group(1) in TEMPLATE_VARIABLES:
+                self.parts.append((text[position : match.start()], match.group(1)))
+                position = match.end()
+        self.parts.append((text[position:], None))
+
+    def render(self, variables: Mapping[str, str]) -> str:
+        """Fill the variable slots; variables without a value keep their placeholder."""
+        out = []
+        for literal, name in self.parts:
+            out.append(literal)
+            if name is not None:
+                value = variables.get(name)
+                out.append("{{" + name + "}}" if value is None else str(value))
+        return "".join(out)
+
+
+class TemplateRegistry:
+    """
+    Name to compiled template map for one templates folder.
+
+    The folder is listed again only when its mtime changes, and a template is
+    re-read only when its own mtime or size changes, so a resident process (the
+    daemon, a batch run) reads each template once.
+    """
+
+    def __init__(self, templates_dir: Path):
+        self.templates_dir = Path(templates_dir)
+        self._dir_mtime: Optional[int] = None
+        self._paths: Dict[str, Path] = {}
+        self._compiled: Dict[Path, CompiledTemplate] = {}
+
+    def _scan(self) -> None:
+        try:
+            dir_mtime = os.stat(self.templates_dir).st_mtime_ns
+        except FileNotFoundError:
+            self._dir_mtime, self._paths = None, {}
+            return
+        if dir_mtime == self._dir_mtime:
+            return
+        paths = {}
+        with os.scandir(self.templates_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and not entry.name.startswith("."):
+                    path = Path(entry.path)
+                    paths[entry.name] = path
+                    if entry.name.endswith(".md"):
+                        paths.setdefault(entry.name[: -len(".md")], path)
+        self._dir_mtime, self._paths = dir_mtime, paths
+
+    def names(self) -> List[str]:
+        """Get the file names of all templates."""
+        self._scan()
+        return sorted({path.name for path in self._paths.values()})
+
+    def get(self, name: str) -> Optional[CompiledTemplate]:
+        """Look up a template by file name, with or without the .md extension."""
+        self._scan()
+        path = self._paths.get(name)
+        if path is None:
+            return None
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        signature = (stat.st_mtime_ns, stat.st_size)
+        compiled = self._compiled.get(path)
+        if compiled is None or compiled.signature != signature:
+            compiled = CompiledTemplate(path, path.read_text(encoding="utf-8"), signature)
+            self._compiled[path] = compiled
+        return compiled
+
+
+_registries: Dict[Path, TemplateRegistry] = {}
+
+
+def get_template_registry(templates_dir: Path) -> TemplateRegistry:
+    """Get the process-wide registry for a templates folder."""
+    templates_dir = Path(templates_dir)
+    if templates_dir not in _registries:
+        _registries[templates_dir] = TemplateRegistry(templates_dir)
+    return _registries[templates_dir]
+
+
+def feature_variables(
+    feature_name: str, issue_number, title: str, requirement: str
+) -> Dict[str, str]:
+    """Build the variables templates are rendered with."""
+    return {
+        "FEATURE_NAME": feature_name,
+        "ISSUE_NUMBER": str(issue_number),
+        "TITLE": title,
+        "REQUIREMENT": requirement,
+        "DATE": date.today().isoformat(),
+    }
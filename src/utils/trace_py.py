@@ -0,0 +1,160 @@
+"""Lightweight tracing of command phases and subprocess calls.
+
+Spans are only recorded while a Tracer is active in the current context, so the
+instrumentation costs a context variable lookup otherwise. The tracer travels with
+asyncio tasks and asyncio.to_thread calls, which lets the daemon trace each
+request on its own.
+"""
+
+import asyncio
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+REDACTED = "***"
+
+# Values after these options, KEY=VALUE pairs with secret-looking keys, GitHub
+# tokens and credentials embedded in URLs are never written to a trace
+SECRET_OPTIONS = ("--token", "--password", "--secret", "--auth")
+SECRET_KEY = re.compile(r"^([\w.-]*(?:token|secret|password|passwd|auth|header)[\w.-]*)=", re.I)
+SECRET_VALUE = re.compile(r"\b(gh[pousr]_[A-Za-z0-9]{20,}|github_pat_[A-Za-z0-9_]{20,})\b")
+URL_CREDENTIALS = re.compile(r"(://)[^/@\s]+@")
+
+# Long arguments (issue bodies, comments) are cut to keep traces small
+MAX_ARG_LENGTH = 200
+
+_current: ContextVar[Optional["Tracer"]] = ContextVar("cwai_tracer", default=None)
+
+
+def redact_argv(argv: Sequence[str]) -> List[str]:
+    """Copy argv with secrets masked and long values shortened."""
+    redacted = []
+    hide_next = False
+    for arg in argv:
+        arg = str(arg)
+        if hide_next:
+            redacted.append(REDACTED)
+            hide_next = False
+            continue
+        if arg in SECRET_OPTIONS:
+            hide_next = True
+        elif arg.startswith(tuple(f"{option}=" for option in SECRET_OPTIONS)):
+            arg = arg.split("=", 1)[0] + "=" + REDACTED
+        else:
+            match = SECRET_KEY.match(arg)
+            if match:
+                arg = match.group(1) + "=" + REDACTED
+            arg = SECRET_VALUE.sub(REDACTED, arg)
+            arg = URL_CREDENTIALS.sub(r"\1" + REDACTED + "@", arg)
+        if len(arg) > MAX_ARG_LENGTH:
+            arg = arg[:MAX_ARG_LENGTH] + "…"
+        redacted.append(arg)
+    return redacted
+
+
+class Tracer:
+    """Collects completed spans as Chrome trace "complete" (ph=X) events."""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.events: List[dict] = []
+        self._lanes: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def _lane(self) -> int:
+        """Give each asyncio task (or thread) its own row in the trace viewer."""
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        key = id(task) if task is not None else threading.get_ident()
+        with self._lock:
+            return self._lanes.setdefault(key, len(self._lanes) + 1)
+
+    def add(self, name: str, category: str, start: float, end: float, args: dict) -> None:
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": round((start - self.origin) * 1e6, 1),
+            "dur": round((end - start) * 1e6, 1),
+            "pid": os.getpid(),
+            "tid": self._lane(),
+            "args": args,
+        }
+        with self._lock:
+            self.events.append(event)
+
+    def summary(self) -> List[dict]:
+        """Total time and count per span name and category, slowest first."""
+        totals: Dict[Tuple[str, str], dict] = {}
+        for event in self.events:
+            entry = totals.setdefault(
+                (event["name"], event["cat"]),
+                {"name": event["name"], "cat": event["cat"], "count": 0, "ms": 0.0},
+            )
+            entry["count"] += 1
+            entry["ms"] += event["dur"] / 1000
+        for entry in totals.values():
+            entry["ms"] = round(entry["ms"], 2)
+        return sorted(totals.values(), key=lambda entry: -entry["ms"])
+
+    def chrome_trace(self) -> dict:
+        """Events in the Chrome trace-event format (chrome://tracing, Perfetto)."""
+        return {"traceEvents": self.events, "displayTimeUnit": "ms"}
+
+    def write(self, path: Path) -> None:
+        """Write the trace-event JSON to path."""
+        Path(path).write_text(json.dumps(self.chrome_trace()), encoding="utf-8")
+
+
+def span_name(argv: Sequence[str]) -> str:
+    """Short name of a command for its span: the program and its subcommands."""
+    words = [os.path.basename(str(argv[0]))] if argv else []
+    for arg in argv[1:3]:
+        if str(arg).startswith("-"):
+            break
+        words.append(str(arg))
+    return " ".join(words)
+
+
+def current_tracer() -> Optional[Tracer]:
+    """Get the tracer active in this context, if any."""
+    return _current.get()
+
+
+@contextmanager
+def tracing(tracer: Optional[Tracer] = None) -> Iterator[Tracer]:
+    """Record spans into tracer (a new one by default) for the duration of the block."""
+    tracer = tracer or Tracer()
+    token = _current.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def span(name: str, category: str = "phase", **args) -> Iterator[dict]:
+    """
+    Time the block as a span. The yielded dict becomes the span's args, so callers
+    can attach results such as an exit code. Exceptions are recorded as `error`.
+    """
+    tracer = _current.get()
+    if tracer is None:
+        yield args
+        return
+    start = time.perf_counter()
+    try:
+        yield args
+    except BaseException as error:
+        args["error"] = type(error).__name__
+        raise
+    finally:
+        tracer.add(name, category, start, time.perf_counter(), args)
@@ -0,0 +1,78 @@
+"""Shared pytest fixtures."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+
+@pytest.fixture
+def git_repo(tmp_path, monkeypatch):
+    """Create an empty git repository with one commit and chdir into it."""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    for args in (
+        ["git", "init", "-q", "-b", "main"],
+        ["git", "config", "user.name", "Test User"],
+        ["git", "config", "user.email", "test@example.com"],
+        ["git", "commit", "-q", "--allow-empty", "-m", "init"],
+    ):
+        subprocess.run(args, cwd=repo, check=True, capture_output=True)
+    monkeypatch.chdir(repo)
+    monkeypatch.delenv("CWAI_SPECS_FOLDER", raising=False)
+    monkeypatch.delenv("CWAI_ISSUE_MANAGER", raising=False)
+    monkeypatch.delenv("CWAI_DUPLICATE_THRESHOLD", raising=False)
+    monkeypatch.delenv("CWAI_SPECS_LAYOUT", raising=False)
+    monkeypatch.delenv("CWAI_WORKTREE", raising=False)
+    monkeypatch.delenv("CWAI_WORKTREE_DIR", raising=False)
+    return repo
+
+
+@pytest.fixture
+def fake_gh(tmp_path, monkeypatch):
+    """Put the gh stand-in on PATH and return its state directory."""
+    state = tmp_path / "gh-state"
+    state.mkdir()
+    stubs = Path(__file__).parent / "stubs"
+    monkeypatch.setenv("PATH", f"{stubs}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("FAKE_GH_STATE", str(state))
+    monkeypatch.setenv("CWAI_CACHE_DIR", str(tmp_path / "cache"))
+    from utils import github_issue_manager_py
+
+    monkeypatch.setattr(github_issue_manager_py, "_label_caches", {})
+    return state
+
+
+@pytest.fixture
+def gh_calls(fake_gh):
+    """Put the gh stand-in on PATH and return a function listing the argv it recorded."""
+
+    def read() -> list:
+        calls_file = fake_gh / "calls.jsonl"
+        if not calls_file.exists():
+            return []
+        return [json.loads(line) for line in calls_file.read_text().splitlines()]
+
+    return read
+
+
+@pytest.fixture
+def fake_github_api(tmp_path, monkeypatch):
+    """Start the GitHub REST API stand-in and point the github-api backend at it."""
+    from tests.fake_github_api import FakeGitHubAPI
+    from utils import github_issue_manager_py
+
+    server = FakeGitHubAPI().start()
+    monkeypatch.setenv("CWAI_GITHUB_API_URL", server.url)
+    monkeypatch.setenv("GH_TOKEN", "test-token")
+    monkeypatch.setenv("GH_REPO", "owner/repo")
+    monkeypatch.setenv("CWAI_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(github_issue_manager_py, "_label_caches", {})
+    yield server
+    server.stop()
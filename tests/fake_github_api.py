@@ -0,0 +1,151 @@
+"""In-process stand-in for the GitHub REST API, used by tests and benchmarks."""
+
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+
+class FakeGitHubAPI(ThreadingHTTPServer):
+    """
+    Keep-alive HTTP/1.1 server implementing the handful of endpoints cwai uses.
+
+    Records every request as (method, path) in `calls` and counts accepted TCP
+    connections in `connections`, so tests can check that connections are reused.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, latency: float = 0.0):
+        super().__init__(("127.0.0.1", 0), FakeGitHubHandler)
+        self.latency = latency
+        self.labels = {}
+        self.issues = {}
+        self.calls = []
+        self.connections = 0
+        # The next this many POSTs are refused with a secondary rate limit
+        self.rate_limited = 0
+        # The next this many requests are read, then the connection is dropped unanswered
+        self.dropped = 0
+        self.lock = threading.Lock()
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self) -> "FakeGitHubAPI":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def process_request(self, request, client_address):
+        with self.lock:
+            self.connections += 1
+        super().process_request(request, client_address)
+
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; don't let Nagle delay the body
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def reply(self, status: int, payload=None, headers=None) -> None:
+        body = json.dumps(payload).encode() if payload is not None else b""
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def handle_any(self) -> None:
+        server = self.server
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = json.loads(self.rfile.read(length)) if length else None
+        path = urlsplit(self.path).path
+
+        if server.latency:
+            threading.Event().wait(server.latency)
+        if not self.headers.get("Authorization", "").startswith("Bearer "):
+            return self.reply(401, {"message": "Requires authentication"})
+
+        with server.lock:
+            server.calls.append((self.command, path))
+            if server.dropped:
+                server.dropped -= 1
+                self.close_connection = True
+                return
+            if self.command == "POST" and server.rate_limited:
+                server.rate_limited -= 1
+                message = "You have exceeded a secondary rate limit."
+                return self.reply(403, {"message": message}, {"Retry-After": "0"})
+            status, result = self.route(server, self.command, path, payload)
+        self.reply(status, result)
+
+    def do_GET(self) -> None:  # noqa: N802 - named by BaseHTTPRequestHandler
+        self.handle_any()
+
+    def do_POST(self) -> None:  # noqa: N802
+        self.handle_any()
+
+    def do_DELETE(self) -> None:  # noqa: N802
+        self.handle_any()
+
+    def route(self, server, method, path, payload):
+        match = re.fullmatch(r"/repos/[^/]+/[^/]+(/.*)", path)
+        if not match:
+            return 404, {"message": "Not Found"}
+        rest = match.group(1)
+
+        if rest == "/labels" and method == "GET":
+            query = dict(part.split("=") for part in urlsplit(self.path).query.split("&") if part)
+            per_page, page = int(query.get("per_page", 30)), int(query.get("page", 1))
+            names = sorted(server.labels)[(page - 1) * per_page : page * per_page]
+            return 200, [{"name": name} for name in names]
+        if rest == "/labels" and method == "POST":
+            if payload["name"] in server.labels:
+                return 422, {
+                    "message": "Validation Failed",
+                    "errors": [{"resource": "Label", "code": "already_exists", "field": "name"}],
+                }
+            server.labels[payload["name"]] = payload
+            return 201, payload
+        if rest == "/issues" and method == "GET":
+            # Newest first, like GitHub's default sort
+            return 200, [
+                {**issue, "html_url": f"https://github.com/o/r/issues/{number}"}
+                for number, issue in sorted(server.issues.items(), reverse=True)
+            ]
+        if rest == "/issues" and method == "POST":
+            number = len(server.issues) + 1
+            for label in payload.get("labels", []):
+                server.labels.setdefault(label, {"name": label})
+            server.issues[number] = {**payload, "number": number, "comments": []}
+            return 201, {"number": number, "html_url": f"https://github.com/o/r/issues/{number}"}
+
+        issue_match = re.fullmatch(r"/issues/(\d+)/(labels|comments)(?:/(.+))?", rest)
+        if not issue_match or int(issue_match.group(1)) not in server.issues:
+            return 404, {"message": "Not Found"}
+        issue = server.issues[int(issue_match.group(1))]
+        if issue_match.group(2) == "comments" and method == "POST":
+            issue["comments"].append(payload["body"])
+            return 201, {"body": payload["body"]}
+        if method == "POST":
+            issue["labels"] = issue.get("labels", []) + payload["labels"]
+            return 200, [{"name": name} for name in issue["labels"]]
+        if method == "DELETE" and issue_match.group(3):
+            label = unquote(issue_match.group(3))
+            if label not in issue.get("labels", []):
+                return 404, {"message": "Label does not exist"}
+            issue["labels"].remove(label)
+            return 200, [{"name": name} for name in issue["labels"]]
+        return 404, {"message": "Not Found"}
@@ -0,0 +1,90 @@
+"""Tests for asset_cache_py module."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils import asset_cache_py
+from utils.asset_cache_py import AssetCache
+
+
+def git(*args, cwd):
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+def commit_prompt(upstream: Path, text: str) -> str:
+    prompts = upstream / ".cwai" / "prompts"
+    prompts.mkdir(parents=True, exist_ok=True)
+    (prompts / "outline.md").write_text(text)
+    git("add", "-A", cwd=upstream)
+    git("commit", "-q", "-m", text, cwd=upstream)
+    return git("rev-parse", "HEAD", cwd=upstream)
+
+
+@pytest.fixture
+def upstream(tmp_path, monkeypatch):
+    """A local repository standing in for the code-with-ai remote."""
+    repo = tmp_path / "upstream"
+    repo.mkdir()
+    git("init", "-q", "-b", "main", cwd=repo)
+    git("config", "user.name", "Test User", cwd=repo)
+    git("config", "user.email", "test@example.com", cwd=repo)
+    (repo / "README.md").write_text("not an asset\n")
+    monkeypatch.setenv("CWAI_ASSETS_URL", repo.as_uri())
+    monkeypatch.setenv("CWAI_CACHE_DIR", str(tmp_path / "cache"))
+    return repo
+
+
+def test_assets_are_fetched_once_per_commit(upstream, monkeypatch):
+    """Test that repeated installs reuse the snapshot and upgrades fetch a new one."""
+    first = commit_prompt(upstream, "v1")
+    cache = AssetCache()
+    assets = cache.resolve()
+    assert assets == cache.root / first / ".cwai"
+    assert (assets / "prompts" / "outline.md").read_text() == "v1"
+    assert not (assets.parent / "README.md").exists()
+
+    fetches = []
+    original_fetch = AssetCache.fetch
+    monkeypatch.setattr(
+        AssetCache,
+        "fetch",
+        lambda self, *a, **k: fetches.append(1) or original_fetch(self, *a, **k),
+    )
+    assert cache.resolve() == assets
+    assert fetches == []
+
+    second = commit_prompt(upstream, "v2")
+    upgraded = cache.resolve()
+    assert upgraded == cache.root / second / ".cwai"
+    assert (upgraded / "prompts" / "outline.md").read_text() == "v2"
+    assert len(fetches) == 1
+
+
+def test_offline_uses_latest_snapshot(upstream, monkeypatch):
+    """Test that offline installs (and unreachable remotes) never clone."""
+    commit = commit_prompt(upstream, "v1")
+    cache = AssetCache()
+    cache.resolve()
+
+    monkeypatch.setenv("CWAI_ASSETS_URL", (upstream.parent / "missing").as_uri())
+    assert cache.resolve(offline=True) == cache.root / commit / ".cwai"
+    assert cache.resolve() == cache.root / commit / ".cwai"
+
+
+def test_offline_without_cache_uses_packaged_assets(upstream, tmp_path, monkeypatch):
+    """Test the fallback to the .cwai folder shipped with the package."""
+    shipped = asset_cache_py.packaged_assets()
+    assert shipped is not None and (shipped / "prompts").is_dir()
+    assert AssetCache().resolve(offline=True) == shipped
+
+    monkeypatch.setattr(asset_cache_py, "packaged_assets", lambda: None)
+    with pytest.raises(SystemExit):
+        AssetCache().resolve(offline=True)
@@ -0,0 +1,126 @@
+"""Tests for create_feature_py module."""
+
+import asyncio
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from commands.create_feature_py import create_features_batch, parse_batch_record
+from utils.issue_manager_py import load_issue
+
+
+def test_parse_batch_record():
+    """Test parsing batch records with string and list fields."""
+    record = parse_batch_record('{"requirement": "Add login", "labels": "ui, auth"}')
+    assert record == {
+        "requirement": "Add login",
+        "title": "",
+        "labels": ["ui", "auth"],
+        "templates": [],
+    }
+
+    record = parse_batch_record(
+        '{"requirement": "Add login", "title": "Login", "labels": ["ui"], "templates": "prd"}'
+    )
+    assert record["title"] == "Login"
+    assert record["labels"] == ["ui"]
+    assert record["templates"] == ["prd"]
+
+
+def test_parse_batch_record_requires_requirement():
+    """Test that records without a requirement are rejected."""
+    with pytest.raises(ValueError):
+        parse_batch_record('{"title": "No requirement"}')
+
+
+def test_create_features_batch(git_repo, capsys):
+    """Test creating and updating features from one batch stream."""
+    lines = [
+        '{"requirement": "Add login page", "labels": "ui"}\n',
+        "\n",
+        "not json\n",
+        '{"requirement": "Update 00001-add-login-page please", "labels": "-ui,auth"}\n',
+    ]
+
+    failures = asyncio.run(create_features_batch(lines, concurrency=4))
+
+    assert failures == 1
+    results = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [r["LINE"] for r in results] == [1, 3, 4]
+    assert results[0]["BRANCH_NAME"] == "00001-add-login-page"
+    assert "ERROR" in results[1]
+
+    issue = load_issue(git_repo / "specs/00001-add-login-page")
+    assert issue["author"] == "Test User <test@example.com>"
+    assert issue["labels"] == ["auth"]
+    assert len(issue["comments"]) == 1
+
+
+def test_create_features_batch_reads_lines_as_it_goes(git_repo, capsys):
+    """Test that the input is read only as fast as the worker pool takes records."""
+    created_when_read = []
+
+    def lines():
+        for number in range(1, 5):
+            created_when_read.append(len(list((git_repo / "specs").glob("0*"))))
+            yield f'{{"requirement": "Add feature number {number}"}}\n'
+
+    assert asyncio.run(create_features_batch(lines(), concurrency=4)) == 0
+    assert len(capsys.readouterr().out.splitlines()) == 4
+    # One localfs worker plus one queued record: line 4 waits for line 1 to finish
+    assert created_when_read[3] >= 1
+
+
+def test_create_features_in_worktrees(git_repo, tmp_path, monkeypatch, capsys):
+    """Test that worktree mode leaves the main checkout alone and reuses worktrees."""
+    monkeypatch.setenv("CWAI_WORKTREE_DIR", str(tmp_path / "trees"))
+    lines = [
+        '{"requirement": "Add login page"}\n',
+        '{"requirement": "Update 00001-add-login-page please"}\n',
+    ]
+
+    assert asyncio.run(create_features_batch(lines, concurrency=1, worktree=True)) == 0
+
+    results = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    worktree = tmp_path / "trees" / "00001-add-login-page"
+    assert [r["WORKTREE"] for r in results] == [str(worktree)] * 2
+    assert results[1]["FEATURE_FOLDER"] == str(worktree / "specs/00001-add-login-page")
+
+    def branch(path):
+        return subprocess.run(
+            ["git", "branch", "--show-current"], cwd=path, capture_output=True, text=True
+        ).stdout.strip()
+
+    assert branch(git_repo) == "main"
+    assert branch(worktree) == "00001-add-login-page"
+    assert len(load_issue(git_repo / "specs/00001-add-login-page")["comments"]) == 1
+
+
+def test_worktree_mode_from_inside_a_worktree(git_repo, tmp_path, monkeypatch, capsys):
+    """Test that a feature worktree updates and allocates IDs in the main checkout's specs."""
+    monkeypatch.setenv("CWAI_WORKTREE", "on")
+    monkeypatch.setenv("CWAI_WORKTREE_DIR", str(tmp_path / "trees"))
+    lines = ['{"requirement": "Add login page"}\n']
+    assert asyncio.run(create_features_batch(lines, concurrency=1)) == 0
+    capsys.readouterr()
+
+    worktree = tmp_path / "trees" / "00001-add-login-page"
+    monkeypatch.chdir(worktree)
+    lines = [
+        '{"requirement": "Update 00001-add-login-page please", "labels": "auth"}\n',
+        '{"requirement": "Add logout button"}\n',
+    ]
+    assert asyncio.run(create_features_batch(lines, concurrency=1)) == 0
+
+    results = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert results[0]["WORKTREE"] == str(worktree)
+    assert results[1]["BRANCH_NAME"] == "00002-add-logout-button"
+    assert load_issue(git_repo / "specs/00001-add-login-page")["labels"] == ["auth"]
+    assert (git_repo / "specs/00002-add-logout-button").is_dir()
+    assert not (worktree / "specs/.cwai-state").exists()
@@ -0,0 +1,133 @@
+"""Tests for create_feature_daemon_py module."""
+
+import asyncio
+import json
+import os
+import socket
+import stat
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from commands.create_feature_daemon_py import (
+    CreateFeatureDaemon,
+    daemon_socket_path,
+    forward_to_daemon,
+    is_own_socket,
+    make_private_dir,
+)
+from utils.repo_context_py import RepoContext
+
+
+@pytest.fixture
+def daemon(git_repo, tmp_path, monkeypatch):
+    """Run a daemon for git_repo in a background thread."""
+    monkeypatch.setenv("CWAI_CACHE_DIR", str(tmp_path / "cache"))
+    context = RepoContext.discover(git_repo)
+    loop = asyncio.new_event_loop()
+    server = CreateFeatureDaemon(context)
+    task = loop.create_task(server.serve())
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    path = daemon_socket_path(context)
+    for _ in range(100):
+        if path.exists():
+            break
+        time.sleep(0.01)
+    yield context
+
+    loop.call_soon_threadsafe(task.cancel)
+    time.sleep(0.05)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
+
+
+def test_forward_creates_feature(daemon, git_repo):
+    """Test that a forwarded request is served by the warm daemon."""
+    reply = forward_to_daemon({"requirement": "Add login page", "labels": ["ui"]}, daemon)
+
+    assert reply["exit_code"] == 0
+    assert reply["results"]["BRANCH_NAME"] == "00001-add-login-page"
+    assert "Created Local issue" in reply["log"]
+    issue = json.loads((git_repo / "specs/00001-add-login-page/issue.json").read_text())
+    assert issue["labels"] == ["ui"]
+
+
+def test_forward_reports_errors(daemon):
+    """Test that log_error inside the daemon becomes an exit code for the client."""
+    reply = forward_to_daemon({"requirement": "Update 00009-missing-feature"}, daemon)
+
+    assert reply["exit_code"] == 1
+    assert "not found" in reply["log"]
+
+
+def test_forward_falls_back_on_settings_mismatch(daemon, monkeypatch):
+    """Test that clients with different settings run in-process."""
+    monkeypatch.setenv("CWAI_ISSUE_MANAGER", "github")
+    assert forward_to_daemon({"requirement": "Add login page"}, daemon) is None
+
+
+def test_forward_without_daemon(git_repo, tmp_path, monkeypatch):
+    """Test that no running daemon means in-process execution."""
+    monkeypatch.setenv("CWAI_CACHE_DIR", str(tmp_path / "cache"))
+    assert forward_to_daemon({"requirement": "x"}, RepoContext.discover(git_repo)) is None
+
+
+@pytest.mark.parametrize("reply", [b"", b'{"exit_code": 0, "res', b"[]\n", b'{"exit_code": 0}\n'])
+def test_forward_ignores_unusable_replies(git_repo, tmp_path, monkeypatch, reply):
+    """Test that a broken or outdated daemon means in-process execution."""
+    monkeypatch.setenv("CWAI_CACHE_DIR", str(tmp_path / "cache"))
+    context = RepoContext.discover(git_repo)
+    path = daemon_socket_path(context)
+    make_private_dir(path.parent)
+
+    def serve_once(server):
+        connection, _ = server.accept()
+        with connection:
+            connection.makefile("rb").readline()
+            connection.sendall(reply)
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(str(path))
+        server.listen()
+        thread = threading.Thread(target=serve_once, args=(server,), daemon=True)
+        thread.start()
+        assert forward_to_daemon({"requirement": "x"}, context) is None
+        thread.join(timeout=5)
+
+
+def test_socket_is_private(daemon):
+    """Test that the socket is created 0600 in a 0700 directory."""
+    path = daemon_socket_path(daemon)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert stat.S_IMODE(os.stat(path.parent).st_mode) == 0o700
+    assert is_own_socket(path)
+
+
+def test_long_cache_paths_use_a_per_user_temp_folder(git_repo, tmp_path, monkeypatch):
+    """Test the fallback for cache paths too long for a Unix socket."""
+    monkeypatch.setenv("CWAI_CACHE_DIR", str(tmp_path / ("x" * 100)))
+    path = daemon_socket_path(RepoContext.discover(git_repo))
+    assert path.parent.name == f"cwai-{os.getuid()}"
+
+
+def test_sockets_in_shared_folders_are_not_trusted(tmp_path):
+    """Test that a socket is only used from a folder other users cannot write to."""
+    folder = tmp_path / "shared"
+    folder.mkdir(mode=0o700)
+    path = folder / "daemon.sock"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(str(path))
+        assert is_own_socket(path)
+        os.chmod(folder, 0o1777)
+        assert not is_own_socket(path)
+    (folder / "plain").write_text("")
+    os.chmod(folder, 0o700)
+    assert not is_own_socket(folder / "plain")
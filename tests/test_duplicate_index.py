@@ -0,0 +1,85 @@
+"""Tests for duplicate_index_py module."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from commands.create_feature_py import create_feature_command_async, find_duplicate_features
+from utils.duplicate_index_py import DuplicateIndex, minhash, similarity
+from utils.issue_manager_py import LocalFSIssueManager
+
+
+def create(specs, slug, description):
+    manager = LocalFSIssueManager()
+    return asyncio.run(manager.create_issue(slug, slug, specs, [], description))
+
+
+def test_minhash_similarity_tracks_jaccard():
+    """Test that signatures of reworded texts agree far more than unrelated ones."""
+    base = minhash("Add a login page with email and password authentication")
+    reworded = minhash("Add login page with email/password authentication for users")
+    unrelated = minhash("Export monthly invoices to CSV from the billing dashboard")
+    assert similarity(base, reworded) > 0.5
+    assert similarity(base, unrelated) < 0.2
+    assert minhash("a the of") is None
+
+
+def test_find_duplicates_builds_and_follows_specs(git_repo):
+    """Test lookups against existing features, including ones created afterwards."""
+    specs = git_repo / "specs"
+    create(specs, "login", "Add a login page with email and password authentication")
+    create(specs, "billing", "Export monthly invoices to CSV from the billing dashboard")
+
+    index = DuplicateIndex(specs)
+    assert index.refresh() == 2
+    matches = index.find_duplicates("Add login page with email and password authentication")
+    assert [folder for folder, _ in matches] == ["00001-login"]
+
+    # Created through the manager while the index exists: recorded without a rescan
+    create(specs, "search", "Full text search over invoices and billing history")
+    assert index.refresh() == 0
+    assert index.find_duplicates("Full text search over billing history and invoices")[0][0] == (
+        "00003-search"
+    )
+
+
+def test_create_feature_warns_or_refuses_duplicates(git_repo, capsys):
+    """Test the warning on create and the refusal behind the flag."""
+    requirement = "Add a login page with email and password authentication"
+    asyncio.run(create_feature_command_async(requirement, True, "", [], []))
+    asyncio.run(create_feature_command_async(requirement + " please", True, "", [], []))
+    assert '"POSSIBLE_DUPLICATES": [\n    "00001-add-a-login-page' in capsys.readouterr().out
+
+    with pytest.raises(SystemExit):
+        asyncio.run(
+            create_feature_command_async(requirement, True, "", [], [], refuse_duplicates=True)
+        )
+    assert not any(path.name.startswith("00003") for path in (git_repo / "specs").iterdir())
+
+
+def test_duplicate_check_can_be_disabled(git_repo, monkeypatch):
+    """Test that a threshold above 1 turns the check off."""
+    specs = git_repo / "specs"
+    create(specs, "login", "Add a login page")
+    monkeypatch.setenv("CWAI_DUPLICATE_THRESHOLD", "1.1")
+    assert find_duplicate_features("Add a login page", specs) == []
+
+
+def test_duplicate_check_failures_do_not_block_creation(git_repo, monkeypatch):
+    """Test that any error in the advisory check just skips it."""
+    specs = git_repo / "specs"
+    create(specs, "login", "Add a login page")
+
+    def broken_refresh(self):
+        raise UnicodeDecodeError("utf-8", b"\xff", 0, 1, "invalid start byte")
+
+    monkeypatch.setattr(DuplicateIndex, "refresh", broken_refresh)
+    assert find_duplicate_features("Add a login page", specs) == []
+
+    monkeypatch.setenv("CWAI_DUPLICATE_THRESHOLD", "high")
+    assert find_duplicate_features("Add a login page", specs) == []
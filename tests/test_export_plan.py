@@ -0,0 +1,141 @@
+"""Tests for plan_py and export_plan_py modules."""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from commands.export_plan_py import ExportJournal, export_plan
+from utils.issue_manager_py import LocalFSIssueManager
+from utils.plan_py import PlanError, dependency_levels, load_plan
+
+PLAN_MD = """# Config — Delivery Plan
+
+## EPIC E-001: Configuration Service
+
+- Description: Provide centralized configuration.
+- Priority: HIGH
+- Dependencies (optional):
+  - Blocked By: [`E-002`]
+
+### Story S-001-01: Fetch config by key
+
+- Description: Clients retrieve config via GET /config/{key}.
+- Dependencies: [E-001]
+- Acceptance Criteria:
+  - Given a valid key, then a 200 response returns the value.
+  - Given an unknown key, then a 404 is returned.
+
+  - Task T-001-01a: Define OpenAPI spec
+    - Effort: S
+    - Dependencies: []
+    - Acceptance Criteria:
+      - OpenAPI includes endpoint and errors.
+
+  - Task T-001-01b: Implement handler
+    - Dependencies: [T-001-01a]
+
+## EPIC `E-002`: `Storage`
+
+- Description: Persist values.
+- Dependencies (optional):
+  - Blocking: [S-001-01]
+"""
+
+
+def write_plan(tmp_path: Path, text: str = PLAN_MD, name: str = "config.plan.md") -> Path:
+    path = tmp_path / name
+    path.write_text(text)
+    return path
+
+
+def test_load_plan_markdown_links_and_levels(tmp_path):
+    """Test that the markdown plan yields the hierarchy, dependencies and creation levels."""
+    items = {item.id: item for item in load_plan(write_plan(tmp_path))}
+
+    assert list(items) == ["E-001", "S-001-01", "T-001-01a", "T-001-01b", "E-002"]
+    assert items["E-002"].title == "Storage"
+    story = items["S-001-01"]
+    assert (story.type, story.parent, story.blocked_by) == ("story", "E-001", ["E-002"])
+    assert story.acceptance[1] == "Given an unknown key, then a 404 is returned."
+    assert story.children == ["T-001-01a", "T-001-01b"]
+    assert items["T-001-01a"].acceptance == ["OpenAPI includes endpoint and errors."]
+    assert items["E-002"].blocking == ["E-001", "S-001-01"]
+
+    levels = [[item.id for item in level] for level in dependency_levels(list(items.values()))]
+    assert levels == [["E-002"], ["E-001"], ["S-001-01"], ["T-001-01a"], ["T-001-01b"]]
+
+
+def test_load_plan_json_and_cycles(tmp_path):
+    """Test that JSON plans flatten children and dependency cycles are refused."""
+    plan = {
+        "items": [
+            {
+                "id": "E-1",
+                "type": "EPIC",
+                "title": "Epic",
+                "children": [
+                    {"id": "S-1", "type": "STORY", "title": "One"},
+                    {
+                        "id": "S-2",
+                        "type": "STORY",
+                        "title": "Two",
+                        "dependencies": {"blockedBy": ["S-1"]},
+                    },
+                ],
+            }
+        ]
+    }
+    items = load_plan(write_plan(tmp_path, json.dumps(plan), "x.plan.json"))
+    assert [(item.id, item.parent) for item in items] == [
+        ("E-1", None),
+        ("S-1", "E-1"),
+        ("S-2", "E-1"),
+    ]
+    assert [len(level) for level in dependency_levels(items)] == [1, 1, 1]
+
+    plan["items"][0]["children"][0]["dependencies"] = {"blockedBy": ["S-2"]}
+    items = load_plan(write_plan(tmp_path, json.dumps(plan), "x.plan.json"))
+    with pytest.raises(PlanError, match="S-1, S-2"):
+        dependency_levels(items)
+
+
+def test_export_plan_links_issues_and_resumes(git_repo, tmp_path):
+    """Test that export links issues in issue.json and a rerun creates no duplicates."""
+    plan_path = write_plan(tmp_path)
+    items = load_plan(plan_path)
+    specs = git_repo / "specs"
+    manager = LocalFSIssueManager()
+
+    results = asyncio.run(export_plan(plan_path, items, specs, manager, 4, ["plan"]))
+
+    numbers = {result["id"]: result["issue"] for result in results}
+    assert numbers == {"E-002": 1, "E-001": 2, "S-001-01": 3, "T-001-01a": 4, "T-001-01b": 5}
+    story = json.loads((specs / "00003-fetch-config-by-key/issue.json").read_text())
+    assert story["labels"] == ["plan", "story"]
+    assert "Plan item: S-001-01 (config.plan.md)" in story["description"]
+    assert story["plan"] == {
+        "file": "config.plan.md",
+        "id": "S-001-01",
+        "type": "story",
+        "parent": 2,
+        "children": [4, 5],
+        "blocked_by": [1],
+        "blocking": [],
+    }
+
+    # A crash right after creating T-001-01b but before recording it
+    journal = ExportJournal(specs, plan_path)
+    lines = journal.path.read_text().splitlines()
+    journal.path.write_text("\n".join(lines[:-1]) + "\n")
+    results = asyncio.run(export_plan(plan_path, items, specs, manager, 4, ["plan"]))
+
+    assert {result["status"] for result in results} == {"existing"}
+    assert sorted(path.name for path in specs.iterdir() if path.name[0].isdigit())[-1] == (
+        "00005-implement-handler"
+    )
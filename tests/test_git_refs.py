@@ -0,0 +1,79 @@
+"""Tests for git_refs_py module."""
+
+import asyncio
+import subprocess
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils.git_refs_py import get_ref_store, is_valid_branch_name
+from utils.helpers_py import git_checkout
+from utils.repo_context_py import RepoContext
+
+
+def git(repo: Path, *args: str) -> str:
+    result = subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True, text=True)
+    return result.stdout.strip()
+
+
+def test_branch_exists_loose_packed_and_remote(git_repo):
+    """Test branch lookup across loose refs, packed-refs and origin remotes."""
+    git(git_repo, "branch", "packed-branch")
+    git(git_repo, "pack-refs", "--all")
+    git(git_repo, "branch", "loose-branch")
+    git(git_repo, "update-ref", "refs/remotes/origin/remote-branch", "HEAD")
+
+    store = get_ref_store(RepoContext.discover(git_repo))
+
+    assert store.branch_exists("main")
+    assert store.branch_exists("packed-branch")
+    assert store.branch_exists("loose-branch")
+    assert store.branch_exists("remote-branch")
+    assert not store.branch_exists("missing")
+
+    # Deleting a packed branch rewrites packed-refs, which is picked up by mtime
+    git(git_repo, "branch", "-D", "packed-branch")
+    assert not store.branch_exists("packed-branch")
+
+
+def test_ref_only_checkout_creates_branch(git_repo, monkeypatch):
+    """Test the ref-only fast path against git's own view of the repository."""
+    monkeypatch.setenv("CWAI_GIT_REF_ONLY", "1")
+    (git_repo / "dirty.txt").write_text("local change")
+    head = git(git_repo, "rev-parse", "HEAD")
+
+    asyncio.run(git_checkout("00001-feature", create=True, context=RepoContext.discover(git_repo)))
+
+    assert git(git_repo, "rev-parse", "--abbrev-ref", "HEAD") == "00001-feature"
+    assert git(git_repo, "rev-parse", "00001-feature") == head
+    assert git(git_repo, "status", "--porcelain") == "?? dirty.txt"
+    assert "checkout: moving from main to 00001-feature" in git(git_repo, "reflog", "-1")
+
+    # Switching back to a branch at the same commit is also ref-only
+    asyncio.run(git_checkout("main", context=RepoContext.discover(git_repo)))
+    assert git(git_repo, "rev-parse", "--abbrev-ref", "HEAD") == "main"
+
+
+def test_ref_only_checkout_falls_back_during_merge(git_repo, monkeypatch):
+    """Test that in-progress operations are left to git."""
+    monkeypatch.setenv("CWAI_GIT_REF_ONLY", "1")
+    (git_repo / ".git" / "MERGE_HEAD").write_text(git(git_repo, "rev-parse", "HEAD"))
+    calls = []
+
+    async def fake_run_command(cmd, **kwargs):
+        calls.append(cmd)
+
+    monkeypatch.setattr("utils.helpers_py.run_command", fake_run_command)
+    asyncio.run(git_checkout("00002-feature", create=True, context=RepoContext.discover(git_repo)))
+
+    assert calls == [["git", "checkout", "-b", "00002-feature"]]
+
+
+def test_is_valid_branch_name():
+    """Test branch name validation."""
+    assert is_valid_branch_name("00001-my-feature")
+    assert is_valid_branch_name("feature/x")
+    for name in ("", "-x", "a..b", "a.lock", "a b", "a~1", ".hidden", "a/", "a@{1}"):
+        assert not is_valid_branch_name(name)
@@ -0,0 +1,112 @@
+"""Tests for github_api_issue_manager_py module."""
+
+import asyncio
+import http.client
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils.github_api_issue_manager_py import (
+    GitHubAPIClient,
+    GitHubAPIConfigError,
+    GitHubAPIIssueManager,
+    resolve_repo_slug,
+)
+from utils.issue_manager_py import get_issue_manager
+from utils.repo_context_py import RepoContext
+
+
+def test_github_api_create_issue_mirrors_locally(git_repo, fake_github_api):
+    """Test that the API backend returns the GitHub number and mirrors to localfs."""
+    manager = get_issue_manager("github-api")
+    assert isinstance(manager, GitHubAPIIssueManager)
+    specs = git_repo / "specs"
+
+    feature_id = asyncio.run(manager.create_issue("slug", "Title", specs, ["ui"], "Body"))
+
+    assert feature_id == 1
+    assert sorted(fake_github_api.labels) == ["auto-generated", "task", "ui"]
+    assert fake_github_api.issues[1]["labels"] == ["task", "auto-generated", "ui"]
+    issue = json.loads((specs / "00001-slug/issue.json").read_text())
+    assert issue["id"] == 1
+    assert issue["author"] == "Test User <test@example.com>"
+
+
+def test_github_api_reuses_connections(git_repo, fake_github_api):
+    """Test that a whole create/update round trip stays on pooled connections."""
+    manager = get_issue_manager("github-api")
+    specs = git_repo / "specs"
+
+    async def scenario():
+        feature_id = await manager.create_issue("slug", "Title", specs, ["ui"], "Body")
+        await manager.update_issue(
+            feature_id, "00001-slug", specs / "00001-slug", ["api", "-ui"], "More"
+        )
+
+    asyncio.run(scenario())
+
+    assert len(fake_github_api.calls) >= 7
+    # Parallel label creates may open a few connections, but never one per request
+    assert fake_github_api.connections <= 4
+    issue = fake_github_api.issues[1]
+    assert issue["labels"] == ["task", "auto-generated", "api"]
+    assert issue["comments"] == ["More"]
+
+
+def test_github_api_label_conflict_invalidates_cache(git_repo, fake_github_api):
+    """Test that a 422 already_exists answer drops the stale label cache."""
+    manager = get_issue_manager("github-api")
+    asyncio.run(manager.labels.get())
+    fake_github_api.labels["ui"] = {"name": "ui"}
+
+    asyncio.run(manager.create_label("ui"))
+
+    assert manager.labels._labels is None
+
+
+def test_github_api_requires_token(git_repo, fake_github_api, monkeypatch):
+    """Test that a missing token is reported instead of failing on first request."""
+    monkeypatch.delenv("GH_TOKEN")
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+    with pytest.raises(GitHubAPIConfigError, match="GH_TOKEN"):
+        GitHubAPIIssueManager()
+    # Commands get a plain error message rather than a traceback
+    with pytest.raises(SystemExit):
+        get_issue_manager("github-api")
+
+
+def test_github_api_retries_only_safe_requests(fake_github_api):
+    """Test that a dropped keep-alive connection is retried for GETs but not POSTs."""
+    client = GitHubAPIClient(fake_github_api.url, "test-token")
+    client.request_sync("GET", "/repos/o/r/labels")
+
+    fake_github_api.dropped = 1
+    assert client.request_sync("GET", "/repos/o/r/labels") == []
+    assert fake_github_api.calls.count(("GET", "/repos/o/r/labels")) == 3
+
+    # The server may have created the issue before hanging up, so don't send it twice
+    fake_github_api.dropped = 1
+    with pytest.raises(http.client.RemoteDisconnected):
+        client.request_sync("POST", "/repos/o/r/issues", {"title": "T", "body": "B"})
+    assert fake_github_api.calls.count(("POST", "/repos/o/r/issues")) == 1
+    client.close()
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "git@github.com:owner/repo.git",
+        "https://github.com/owner/repo",
+        "ssh://git@github.com/owner/repo.git/",
+    ],
+)
+def test_resolve_repo_slug_from_origin(url, monkeypatch):
+    """Test parsing owner/repo from common remote URL forms."""
+    monkeypatch.delenv("GH_REPO", raising=False)
+    context = RepoContext(root=Path("."), config={"remote.origin.url": url})
+    assert resolve_repo_slug(context) == "owner/repo"
@@ -0,0 +1,97 @@
+"""Tests for github_issue_manager_py module."""
+
+import asyncio
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils import github_issue_manager_py
+from utils.github_issue_manager_py import GitHubIssueManager
+
+
+def create_issue(manager, specs, labels):
+    return asyncio.run(manager.create_issue("slug", "Title", specs, labels, "Body"))
+
+
+def test_github_create_issue_lists_labels_once(git_repo, gh_calls):
+    """Test that labels are listed once and missing ones are created."""
+    specs = git_repo / "specs"
+    feature_id = create_issue(GitHubIssueManager(), specs, ["ui", "auth"])
+
+    calls = gh_calls()
+    assert [c[:2] for c in calls].count(["label", "list"]) == 1
+    created = sorted(c[2] for c in calls if c[:2] == ["label", "create"])
+    assert created == ["auth", "auto-generated", "task", "ui"]
+
+    issue = json.loads((specs / f"0000{feature_id}-slug/issue.json").read_text())
+    assert issue["labels"] == ["ui", "auth"]
+
+
+def test_github_label_cache_is_shared_and_persisted(git_repo, gh_calls, monkeypatch):
+    """Test that later managers and later processes reuse the label set."""
+    specs = git_repo / "specs"
+    create_issue(GitHubIssueManager(), specs, ["ui"])
+    create_issue(GitHubIssueManager(), specs, ["ui"])
+
+    # Simulate a new process: the in-memory caches are gone, the disk copy is not
+    monkeypatch.setattr(github_issue_manager_py, "_label_caches", {})
+    create_issue(GitHubIssueManager(), specs, ["ui"])
+
+    calls = gh_calls()
+    assert [c[:2] for c in calls].count(["label", "list"]) == 1
+    assert [c[:2] for c in calls].count(["label", "create"]) == 3
+
+
+def test_github_label_cache_ttl_zero_disables_persistence(git_repo, gh_calls, monkeypatch):
+    """Test that a zero TTL keeps the cache in memory only."""
+    monkeypatch.setenv("CWAI_LABEL_CACHE_TTL", "0")
+    specs = git_repo / "specs"
+    create_issue(GitHubIssueManager(), specs, [])
+    monkeypatch.setattr(github_issue_manager_py, "_label_caches", {})
+    create_issue(GitHubIssueManager(), specs, [])
+
+    calls = gh_calls()
+    assert [c[:2] for c in calls].count(["label", "list"]) == 2
+
+
+def test_github_label_already_exists_invalidates_cache(git_repo, fake_gh, gh_calls):
+    """Test that a concurrent creation by someone else drops the stale cache."""
+    manager = GitHubIssueManager()
+    create_issue(manager, git_repo / "specs", [])
+    (fake_gh / "labels.txt").write_text("task\nauto-generated\nui\n")
+
+    asyncio.run(manager.create_label("ui"))
+
+    assert not manager.labels.cache_path.exists()
+    asyncio.run(manager.create_label("ui"))
+    calls = gh_calls()
+    assert [c[:2] for c in calls].count(["label", "list"]) == 2
+
+
+def test_github_create_issue_retries_after_deleted_label(git_repo, fake_gh):
+    """Test recovery when a cached label was deleted on GitHub."""
+    manager = GitHubIssueManager()
+    create_issue(manager, git_repo / "specs", ["ui"])
+    (fake_gh / "labels.txt").write_text("task\nauto-generated\n")
+
+    feature_id = create_issue(manager, git_repo / "specs", ["ui"])
+
+    assert feature_id == 2
+    assert "ui" in (fake_gh / "labels.txt").read_text().split()
+
+
+def test_github_only_unknown_labels_count_as_missing(git_repo):
+    """Test that other 'not found' failures are not mistaken for a deleted label."""
+    manager = GitHubIssueManager()
+
+    def failure(stderr):
+        return subprocess.CalledProcessError(1, ["gh", "issue", "create"], stderr=stderr)
+
+    assert manager.is_missing_label(failure("could not add label: 'ui' not found\n"))
+    assert not manager.is_missing_label(failure("GraphQL: Could not resolve to a Repository\n"))
+    assert not manager.is_missing_label(failure("HTTP 404: Not Found (repos/o/r/issues)\n"))
+    assert not manager.is_missing_label(failure("milestone 'v2' not found\n"))
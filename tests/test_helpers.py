@@ -51,12 +51,14 @@ def test_padd_feature_id():
     assert padd_feature_id(1) == "00001"
     assert padd_feature_id(42) == "00042"
     assert padd_feature_id(12345) == "12345"
+    assert padd_feature_id(123456) == "123456"
 
 
 def test_extract_feature_id():
     """Test extracting feature ID from name."""
     assert extract_feature_id("00001-my-feature") == 1
     assert extract_feature_id("00042-test-feature") == 42
+    assert extract_feature_id("100000-big-backlog") == 100000
     assert extract_feature_id("invalid") == 0
 
 
@@ -64,6 +66,10 @@ def test_detect_feature_name():
     """Test detecting feature name in requirement."""
     requirement = "Update 00001-my-feature with new changes"
     assert detect_feature_name(requirement) == "00001-my-feature"
+    assert detect_feature_name("Update 1234567-wide-id now") == "1234567-wide-id"
+    # Names glued to a prefix are still found, as before IDs could grow wider
+    assert detect_feature_name("Update x_00001-foo") == "00001-foo"
+    assert detect_feature_name("see feat/00042-login") == "00042-login"
     
     requirement_no_feature = "Create a new feature"
     assert detect_feature_name(requirement_no_feature) is None
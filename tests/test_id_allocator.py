@@ -0,0 +1,99 @@
+"""Tests for id_allocator_py module."""
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils.id_allocator_py import FeatureIdAllocator
+from utils.specs_layout_py import specs_signature
+
+
+def test_allocate_starts_at_one(tmp_path):
+    """Test allocation in an empty specs folder."""
+    allocator = FeatureIdAllocator(tmp_path / "specs")
+    assert allocator.allocate() == 1
+    assert allocator.allocate() == 2
+
+
+def test_allocate_seeds_from_existing_features(tmp_path):
+    """Test one-time migration from existing NNNNN-slug folders."""
+    specs = tmp_path / "specs"
+    (specs / "00001-first").mkdir(parents=True)
+    (specs / "00007-seventh").mkdir()
+    (specs / "notes").mkdir()
+    (specs / "00042-a-file.md").write_text("not a folder")
+
+    allocator = FeatureIdAllocator(specs)
+    assert allocator.allocate() == 8
+
+    # Counter is persisted; allocating again does not need the folders
+    assert FeatureIdAllocator(specs).allocate() == 9
+
+
+def test_allocate_skips_folders_a_pull_brought_in(tmp_path):
+    """Test that folders the counter never handed out (git pull, merge) are not reused."""
+    specs = tmp_path / "specs"
+    (specs / "00001-first").mkdir(parents=True)
+    allocator = FeatureIdAllocator(specs)
+    assert allocator.allocate() == 2
+
+    (specs / "00002-pulled").mkdir()
+    (specs / "00005-pulled").mkdir()
+    assert allocator.allocate() == 6
+    assert allocator.allocate() == 7
+
+
+def test_own_folders_do_not_trigger_a_rescan(tmp_path, monkeypatch):
+    """Test that creating the folder of an allocated ID keeps allocation O(1)."""
+    specs = tmp_path / "specs"
+    allocator = FeatureIdAllocator(specs)
+    for _ in range(3):
+        before = specs_signature(specs)
+        (specs / f"{allocator.allocate():05d}-feature").mkdir()
+        allocator.record_created(before)
+
+    def rescan(self):
+        raise AssertionError("specs folder scanned")
+
+    monkeypatch.setattr(FeatureIdAllocator, "_highest_in_specs", rescan)
+    assert allocator.allocate() == 4
+
+
+def test_allocate_reseeds_corrupt_counter(tmp_path):
+    """Test recovery from an unreadable counter file."""
+    specs = tmp_path / "specs"
+    (specs / "00003-third").mkdir(parents=True)
+    allocator = FeatureIdAllocator(specs)
+    allocator.counter_path.write_text("garbage")
+    assert allocator.allocate() == 4
+
+
+def test_observe_skips_external_ids(tmp_path):
+    """Test that externally assigned IDs are never handed out again."""
+    allocator = FeatureIdAllocator(tmp_path / "specs")
+    allocator.observe(10)
+    assert allocator.allocate() == 11
+    allocator.observe(3)
+    assert allocator.allocate() == 12
+
+
+def test_allocate_concurrent_ids_are_unique(tmp_path):
+    """Test that concurrent allocations never return duplicates."""
+    specs = tmp_path / "specs"
+
+    def allocate(_):
+        return FeatureIdAllocator(specs).allocate()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        ids = list(pool.map(allocate, range(64)))
+
+    assert sorted(ids) == list(range(1, 65))
+
+
+def test_state_dir_is_ignored_by_git(tmp_path):
+    """Test that the allocator state folder is excluded from version control."""
+    allocator = FeatureIdAllocator(tmp_path / "specs")
+    assert (allocator.state_dir / ".gitignore").read_text() == "*\n"
@@ -0,0 +1,87 @@
+"""Tests for install_py module."""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from commands.install_py import install_command, load_fleet_manifest, plan_fleet_install
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(tmp_path, monkeypatch):
+    """Install offline from the assets shipped in this checkout."""
+    monkeypatch.setenv("CWAI_CACHE_DIR", str(tmp_path / "cache"))
+
+
+def test_load_fleet_manifest(tmp_path):
+    """Test defaults, per-target clients and paths relative to the manifest."""
+    manifest = tmp_path / "fleet.yaml"
+    manifest.write_text(
+        "clients: [vscode, claude]\n"
+        "targets:\n"
+        "  - app\n"
+        "  - path: /srv/api\n"
+        "    clients: gemini\n"
+    )
+    assert load_fleet_manifest(manifest) == [
+        (tmp_path / "app", ["vscode", "claude"]),
+        (Path("/srv/api"), ["gemini"]),
+    ]
+
+    manifest.write_text("targets:\n  - app\n")
+    with pytest.raises(Exception, match="needs clients"):
+        load_fleet_manifest(manifest)
+
+
+def test_plan_merges_repeated_targets(tmp_path):
+    """Test that flags and manifest entries for one target are installed together."""
+    manifest = tmp_path / "fleet.json"
+    manifest.write_text(json.dumps({"targets": [{"path": "app", "clients": ["gemini"]}]}))
+    plan = plan_fleet_install((str(tmp_path / "app"),), ("vscode",), False, str(manifest))
+    assert plan == [(tmp_path / "app", ["vscode", "gemini"])]
+
+
+def test_fleet_install(tmp_path):
+    """Test a non-interactive install into several targets with a JSON summary."""
+    targets = [tmp_path / f"repo-{i}" for i in range(3)]
+    for target in targets:
+        target.mkdir()
+    args = ["--offline", "--json", "-j", "2", "-c", "vscode", "-c", "claude"]
+    for target in [*targets, tmp_path / "missing"]:
+        args += ["-t", str(target)]
+
+    result = CliRunner().invoke(install_command, args)
+    assert result.exit_code == 1
+    summary = json.loads(result.stdout)
+    assert (summary["installed"], summary["failed"]) == (3, 1)
+    assert summary["targets"][3]["status"] == "error"
+    for target in targets:
+        assert (target / ".github" / "prompts" / "outline.prompt.md").exists()
+        assert (target / "prompts" / "outline.md").exists()
+        assert (target / ".cwai" / "templates" / "plan.md").exists()
+
+    # Re-running rewrites nothing
+    args = ["--offline", "--json", "-c", "vscode", "-c", "claude", "-t", str(targets[0])]
+    result = CliRunner().invoke(install_command, args)
+    assert result.exit_code == 0
+    files = json.loads(result.stdout)["files"]
+    assert (files["added"], files["changed"], files["removed"]) == (0, 0, 0)
+
+
+def test_fleet_install_creates_global_folder(tmp_path, monkeypatch):
+    """Test that --global installs into a client folder that does not exist yet."""
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+
+    result = CliRunner().invoke(
+        install_command, ["--offline", "--json", "--global", "-c", "claude"]
+    )
+    assert result.exit_code == 0, result.output
+    global_dir = tmp_path / "home" / ".config" / "claude"
+    assert (global_dir / "prompts" / "outline.md").exists()
+    assert (global_dir / ".cwai" / "templates" / "plan.md").exists()
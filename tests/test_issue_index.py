@@ -0,0 +1,93 @@
+"""Tests for issue_index_py module."""
+
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from commands.query_py import parse_time
+from utils.issue_index_py import IssueIndex
+from utils.issue_manager_py import LocalFSIssueManager
+
+
+def create(manager, specs, slug, labels):
+    return asyncio.run(manager.create_issue(slug, slug.title(), specs, labels, "Body"))
+
+
+def test_index_builds_and_queries(git_repo):
+    """Test a fresh index picks up existing features and filters by label and date."""
+    specs = git_repo / "specs"
+    manager = LocalFSIssueManager()
+    create(manager, specs, "login", ["ui", "auth"])
+    create(manager, specs, "api", ["backend"])
+
+    index = IssueIndex(specs)
+    assert index.refresh() == 2
+    assert [m["folder"] for m in index.query(["ui"])] == ["00001-login"]
+    assert [m["folder"] for m in index.query(["ui", "backend"])] == []
+    assert len(index.query(since="2000-01-01")) == 2
+    assert index.query(until="2000-01-01") == []
+    assert index.refresh() == 0
+
+
+def test_index_follows_manager_writes(git_repo):
+    """Test that creates and updates keep an existing index current without a rescan."""
+    specs = git_repo / "specs"
+    manager = LocalFSIssueManager()
+    create(manager, specs, "login", ["ui"])
+    index = IssueIndex(specs)
+    index.refresh()
+
+    create(manager, specs, "api", ["backend"])
+    asyncio.run(manager.update_issue(1, "00001-login", specs / "00001-login", ["-ui", "auth"], "x"))
+
+    assert not index.is_stale()
+    login = index.query(["auth"])[0]
+    assert login["folder"] == "00001-login"
+    assert login["comments"] == 1
+    assert index.query(["ui"]) == []
+    assert [m["folder"] for m in index.query(["backend"])] == ["00002-api"]
+
+
+def test_index_notices_external_edits(git_repo):
+    """Test that removed folders and hand edits are picked up without a full refresh."""
+    specs = git_repo / "specs"
+    manager = LocalFSIssueManager()
+    create(manager, specs, "login", ["ui"])
+    create(manager, specs, "api", ["backend"])
+    index = IssueIndex(specs)
+    index.refresh()
+
+    issue_path = specs / "00001-login/issue.json"
+    issue = json.loads(issue_path.read_text())
+    issue["labels"] = ["edited"]
+    issue_path.write_text(json.dumps(issue))
+    os.utime(issue_path, ns=(1, 1))
+    (specs / "00002-api/issue.json").unlink()
+
+    assert index.is_stale()
+    assert index.refresh() == 1
+    assert [m["folder"] for m in index.query()] == ["00001-login"]
+    assert index.query(["edited"])[0]["id"] == 1
+
+    # A journal line appended behind the index's back, as a pull would bring in
+    with open(specs / "00001-login/comments.jsonl", "a") as journal:
+        entry = {"author": "a", "comment": "c", "created_at": "2030-01-01", "labels": ["pulled"]}
+        journal.write(json.dumps(entry) + "\n")
+    assert index.refresh() == 1
+    assert index.query(["pulled"])[0]["comments"] == 1
+    assert index.refresh() == 0
+    assert index.refresh(full=True) == 1
+
+
+def test_parse_time_relative():
+    """Test relative ages become ISO timestamps."""
+    now = datetime(2024, 5, 10, 12, 0, 0)
+    assert parse_time("7d", now) == "2024-05-03T12:00:00Z"
+    assert parse_time("2024-05-01", now) == "2024-05-01"
+    assert parse_time(None, now) is None
@@ -0,0 +1,64 @@
+"""Tests for issue_manager_py module."""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils.issue_manager_py import COMMENTS_JOURNAL, LocalFSIssueManager, compact_issue, load_issue
+
+
+def make_issue(specs, labels):
+    manager = LocalFSIssueManager()
+    feature_id = asyncio.run(manager.create_issue("slug", "Title", specs, labels, "Body"))
+    return manager, feature_id, specs / "00001-slug"
+
+
+def test_update_issue_appends_without_rewriting(git_repo):
+    """Test that updates go to the journal and leave issue.json untouched."""
+    manager, feature_id, feature_dir = make_issue(git_repo / "specs", ["ui", "draft"])
+    before = (feature_dir / "issue.json").read_text()
+
+    asyncio.run(manager.update_issue(feature_id, "00001-slug", feature_dir, ["api"], "First"))
+    asyncio.run(manager.update_issue(feature_id, "00001-slug", feature_dir, ["-draft"], "Second"))
+
+    assert (feature_dir / "issue.json").read_text() == before
+    assert len((feature_dir / COMMENTS_JOURNAL).read_text().splitlines()) == 2
+
+    issue = load_issue(feature_dir)
+    assert [c["comment"] for c in issue["comments"]] == ["First", "Second"]
+    assert issue["comments"][0]["author"] == "Test User <test@example.com>"
+    assert issue["labels"] == ["ui", "api"]
+    assert issue["updated_at"] == issue["comments"][-1]["created_at"]
+
+
+def test_load_issue_skips_torn_line(git_repo):
+    """Test that a partially written last line does not break reading."""
+    manager, feature_id, feature_dir = make_issue(git_repo / "specs", [])
+    asyncio.run(manager.update_issue(feature_id, "00001-slug", feature_dir, [], "Done"))
+    with open(feature_dir / COMMENTS_JOURNAL, "a") as f:
+        f.write('{"author": "x", "comm')
+
+    assert [c["comment"] for c in load_issue(feature_dir)["comments"]] == ["Done"]
+
+    # The next update starts on a fresh line instead of being glued to the torn one
+    asyncio.run(manager.update_issue(feature_id, "00001-slug", feature_dir, [], "After"))
+    with open(feature_dir / COMMENTS_JOURNAL, "a") as f:
+        f.write('{"comment": "no timestamp"}\n')
+    assert [c["comment"] for c in load_issue(feature_dir)["comments"]] == ["Done", "After"]
+
+
+def test_compact_issue_folds_journal(git_repo):
+    """Test that compaction keeps the merged view and removes the journal."""
+    manager, feature_id, feature_dir = make_issue(git_repo / "specs", ["ui"])
+    asyncio.run(manager.update_issue(feature_id, "00001-slug", feature_dir, ["api"], "Note"))
+    merged = load_issue(feature_dir)
+
+    assert compact_issue(feature_dir)
+    assert not (feature_dir / COMMENTS_JOURNAL).exists()
+    assert json.loads((feature_dir / "issue.json").read_text()) == merged
+    assert load_issue(feature_dir) == merged
+    assert not compact_issue(feature_dir)
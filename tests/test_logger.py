@@ -1,9 +1,14 @@
 """Tests for logger_py module."""
 
 from io import StringIO
+import json
+import os
+import subprocess
 import sys
 from pathlib import Path
 
+import pytest
+
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
@@ -29,3 +34,55 @@ def test_log_warn(capsys):
     log_warn("Test warning message")
     captured = capsys.readouterr()
     assert "Test warning message" in captured.err
+
+
+def test_log_level_filters_debug(capsys, monkeypatch):
+    """Test that debug messages only show at CWAI_LOG_LEVEL=debug and warn hides info."""
+    from utils.logger_py import log_debug
+
+    monkeypatch.delenv("CWAI_LOG_LEVEL", raising=False)
+    log_debug("hidden")
+    monkeypatch.setenv("CWAI_LOG_LEVEL", "debug")
+    log_debug("shown")
+    monkeypatch.setenv("CWAI_LOG_LEVEL", "warn")
+    log_info("quiet")
+    log_warn("loud")
+
+    err = capsys.readouterr().err
+    assert "hidden" not in err and "quiet" not in err
+    assert "🔍 shown" in err and "loud" in err
+
+
+def test_json_lines_buffered_and_log_error_flushes(capsys, monkeypatch):
+    """Test JSON-lines output through the background writer, flushed by log_error."""
+    from utils.logger_py import log_error
+
+    monkeypatch.setenv("CWAI_LOG_FORMAT", "json")
+    monkeypatch.setenv("CWAI_LOG_BUFFER", "on")
+    log_info("first [not markup]")
+    with pytest.raises(SystemExit) as error:
+        log_error("boom", exit_code=3)
+
+    assert error.value.code == 3
+    lines = [json.loads(line) for line in capsys.readouterr().err.splitlines()]
+    assert [(record["level"], record["message"]) for record in lines] == [
+        ("info", "first [not markup]"),
+        ("error", "boom"),
+    ]
+
+
+def test_rich_not_imported_without_tty():
+    """Test that logging to a pipe never loads rich."""
+    code = (
+        "import sys; sys.path.insert(0, 'src'); from utils.logger_py import log_info; "
+        "log_info('x'); print('rich' in sys.modules)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).parent.parent,
+        capture_output=True,
+        text=True,
+        env={k: v for k, v in os.environ.items() if not k.startswith("CWAI_LOG")},
+    )
+    assert result.stdout.strip() == "False"
+    assert result.stderr == "ℹ️  x\n"
@@ -0,0 +1,176 @@
+"""Tests for outbox_py module."""
+
+import asyncio
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from click.testing import CliRunner
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from commands.sync_py import sync_command
+from utils.issue_manager_py import get_issue_manager
+from utils.outbox_py import Outbox, OutboxIssueManager
+
+
+def test_outbox_queues_and_reconciles_provisional_ids(git_repo, fake_github_api, monkeypatch):
+    """Test that offline creates get a provisional ID that sync turns into the issue number."""
+    monkeypatch.setenv("CWAI_OUTBOX", "on")
+    manager = get_issue_manager("github-api")
+    assert isinstance(manager, OutboxIssueManager)
+    specs = git_repo / "specs"
+    # Issues created elsewhere take the first numbers on GitHub
+    fake_github_api.issues.update({1: {"comments": []}, 2: {"comments": []}})
+
+    async def offline():
+        feature_id = await manager.create_issue("slug", "Title", specs, ["ui"], "Body")
+        await manager.update_issue(
+            feature_id, "00001-slug", specs / "00001-slug", ["api", "-ui"], "More"
+        )
+        return feature_id
+
+    assert asyncio.run(offline()) == 1
+    assert fake_github_api.calls == []
+    subprocess.run(["git", "branch", "00001-slug"], cwd=git_repo, check=True)
+    assert [op["kind"] for op in manager.outbox(specs).pending()] == ["issue", "labels", "comment"]
+
+    stats = asyncio.run(manager.flush(specs))
+
+    assert (stats.sent, stats.remaining, stats.reconciled) == (3, 0, {1: 3})
+    assert fake_github_api.issues[3]["labels"] == ["task", "auto-generated", "api"]
+    assert fake_github_api.issues[3]["comments"] == ["More"]
+    assert not (specs / "00001-slug").exists()
+    issue = json.loads((specs / "00003-slug/issue.json").read_text())
+    assert (issue["id"], issue["provisional_id"]) == (3, 1)
+    branches = subprocess.run(
+        ["git", "branch", "--list", "0000*"], cwd=git_repo, capture_output=True, text=True
+    ).stdout
+    assert branches.split() == ["00003-slug"]
+    # Later local features never reuse the issue number
+    local_id = asyncio.run(manager.create_issue("next", "Next", specs, [], "Body"))
+    assert local_id == 4
+
+
+def test_outbox_backs_off_on_secondary_rate_limit(git_repo, fake_github_api, monkeypatch):
+    """Test that rate-limited sends are retried when waiting and kept queued otherwise."""
+    monkeypatch.setenv("CWAI_OUTBOX", "on")
+    manager = get_issue_manager("github-api")
+    specs = git_repo / "specs"
+    asyncio.run(manager.create_issue("slug", "Title", specs, [], "Body"))
+    fake_github_api.labels.update({"task": {}, "auto-generated": {}})
+
+    fake_github_api.rate_limited = 1
+    stats = asyncio.run(manager.flush(specs, wait=False))
+    assert (stats.sent, stats.failed, stats.remaining) == (0, 1, 1)
+    assert "secondary rate limit" in manager.outbox(specs).pending()[0]["last_error"]
+
+    fake_github_api.rate_limited = 2
+    stats = asyncio.run(manager.flush(specs))
+    assert (stats.sent, stats.remaining) == (1, 0)
+    assert len(fake_github_api.issues) == 1
+
+
+def test_sync_command_reports_status_and_flushes(git_repo, fake_github_api, monkeypatch):
+    """Test that cwai-sync lists queued operations and sends them."""
+    monkeypatch.setenv("CWAI_OUTBOX", "on")
+    monkeypatch.setenv("CWAI_ISSUE_MANAGER", "github-api")
+    manager = get_issue_manager("github-api")
+    specs = git_repo / "specs"
+    asyncio.run(manager.create_issue("slug", "Title", specs, [], "Body"))
+    manager.outbox(specs).close()
+    runner = CliRunner()
+
+    result = runner.invoke(sync_command, ["--status", "--json"])
+    assert result.exit_code == 0
+    assert [op["kind"] for op in json.loads(result.stdout)] == ["issue"]
+
+    result = runner.invoke(sync_command, ["--json"])
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.stdout)["sent"] == 1
+    assert Outbox(specs).count() == 0
+
+
+def test_outbox_resend_finds_issue_created_before_a_crash(
+    git_repo, fake_github_api, monkeypatch, tmp_path
+):
+    """Test that a create interrupted after GitHub accepted it is not sent twice."""
+    monkeypatch.setenv("CWAI_OUTBOX", "on")
+    manager = get_issue_manager("github-api")
+    specs = git_repo / "specs"
+    asyncio.run(manager.create_issue("slug", "Title", specs, [], "Body"))
+    subprocess.run(["git", "branch", "00001-slug"], cwd=git_repo, check=True)
+    subprocess.run(
+        ["git", "worktree", "add", "-q", str(tmp_path / "wt"), "00001-slug"],
+        cwd=git_repo,
+        check=True,
+    )
+    fake_github_api.issues.update({1: {"comments": []}})
+
+    def crash(*args):
+        raise RuntimeError("killed")
+
+    with monkeypatch.context() as patched:
+        patched.setattr(Outbox, "complete_issue", crash)
+        assert asyncio.run(manager.flush(specs)).remaining == 1
+
+    stats = asyncio.run(manager.flush(specs))
+
+    assert (stats.sent, stats.remaining, stats.reconciled) == (1, 0, {1: 2})
+    assert sorted(fake_github_api.issues) == [1, 2]
+    assert "<!-- cwai-outbox:1-" in fake_github_api.issues[2]["body"]
+    assert json.loads((specs / "00002-slug/issue.json").read_text())["id"] == 2
+    # Checked out in another worktree, so the branch keeps its name
+    branches = subprocess.run(
+        ["git", "branch", "--list", "0000*"], cwd=git_repo, capture_output=True, text=True
+    ).stdout
+    assert "00001-slug" in branches and "00002-slug" not in branches
+
+
+def test_outbox_when_github_numbers_run_ahead_of_local_ids(git_repo, fake_github_api, monkeypatch):
+    """Test that provisional IDs never get mixed up with the issue numbers they collide with."""
+    monkeypatch.setenv("CWAI_OUTBOX", "on")
+    manager = get_issue_manager("github-api")
+    specs = git_repo / "specs"
+    fake_github_api.labels.update({"task": {}, "auto-generated": {}})
+
+    async def offline():
+        for slug in ("first", "second"):
+            feature_id = await manager.create_issue(slug, slug.title(), specs, [], "Body")
+            folder = f"0000{feature_id}-{slug}"
+            await manager.update_issue(feature_id, folder, specs / folder, [], f"On {slug}")
+
+    asyncio.run(offline())
+    # A pull request takes #1 first, so provisional 1 becomes #2 and provisional 2 #3
+    fake_github_api.issues.update({1: {"comments": []}})
+    create = manager.remote.create_remote_feature_issue
+
+    async def create_once(*args):
+        if len(fake_github_api.issues) > 1:
+            raise RuntimeError("connection lost")
+        return await create(*args)
+
+    with monkeypatch.context() as patched:
+        patched.setattr(manager.remote, "create_remote_feature_issue", create_once)
+        stats = asyncio.run(manager.flush(specs, jobs=1))
+    assert (stats.sent, stats.remaining, stats.reconciled) == (2, 2, {1: 2})
+    # 00002-second still has the ID, so 00001-first waits for its new name
+    assert sorted(path.name for path in specs.glob("0*")) == ["00001-first", "00002-second"]
+    assert json.loads((specs / "00001-first/issue.json").read_text())["id"] == 2
+    asyncio.run(manager.update_issue(1, "00001-first", specs / "00001-first", [], "Waiting"))
+
+    stats = asyncio.run(manager.flush(specs))
+
+    assert (stats.sent, stats.remaining, stats.reconciled) == (3, 0, {2: 3})
+    assert fake_github_api.issues[1]["comments"] == []
+    assert fake_github_api.issues[2]["comments"] == ["On first", "Waiting"]
+    assert fake_github_api.issues[3]["comments"] == ["On second"]
+    assert sorted(path.name for path in specs.glob("0*")) == ["00002-first", "00003-second"]
+    assert json.loads((specs / "00002-first/issue.json").read_text())["provisional_id"] == 1
+
+    # Updates made after the sync go to the issue the folder now carries
+    asyncio.run(manager.update_issue(2, "00002-first", specs / "00002-first", [], "Later"))
+    asyncio.run(manager.flush(specs))
+    assert fake_github_api.issues[2]["comments"] == ["On first", "Waiting", "Later"]
@@ -0,0 +1,60 @@
+"""Tests for process_py module."""
+
+import asyncio
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils.process_py import run_command
+
+
+def python(code: str) -> list:
+    return [sys.executable, "-c", code]
+
+
+def test_run_command_captures_output_and_timing():
+    """Test output capture and duration measurement."""
+    result = asyncio.run(run_command(python("print('hello')")))
+    assert result.returncode == 0
+    assert result.stdout.strip() == "hello"
+    assert result.duration > 0
+
+
+def test_run_command_raises_on_failure():
+    """Test that a non-zero exit raises CalledProcessError with stderr."""
+    with pytest.raises(subprocess.CalledProcessError) as error:
+        asyncio.run(run_command(python("import sys; sys.stderr.write('boom'); sys.exit(3)")))
+    assert error.value.returncode == 3
+    assert error.value.stderr == "boom"
+
+    result = asyncio.run(run_command(python("import sys; sys.exit(3)"), check=False))
+    assert result.returncode == 3
+
+
+def test_run_command_timeout():
+    """Test that slow commands are killed."""
+    with pytest.raises(subprocess.TimeoutExpired):
+        asyncio.run(run_command(python("import time; time.sleep(5)"), timeout=0.2))
+
+
+def test_run_command_runs_concurrently(monkeypatch):
+    """Test that independent commands overlap, bounded by CWAI_MAX_PROCESSES."""
+
+    async def run_batch():
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(run_command(python("import time; time.sleep(0.3)")) for _ in range(4))
+        )
+        return time.perf_counter() - start
+
+    monkeypatch.setenv("CWAI_MAX_PROCESSES", "4")
+    assert asyncio.run(run_batch()) < 1.0
+
+    monkeypatch.setenv("CWAI_MAX_PROCESSES", "1")
+    assert asyncio.run(run_batch()) >= 1.2
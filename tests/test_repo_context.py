@@ -0,0 +1,111 @@
+"""Tests for repo_context_py module."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils.repo_context_py import GitConfigError, RepoContext, parse_git_config
+
+
+@pytest.fixture
+def isolated_home(tmp_path, monkeypatch):
+    """Point HOME and XDG_CONFIG_HOME to an empty folder."""
+    home = tmp_path / "home"
+    home.mkdir()
+    monkeypatch.setenv("HOME", str(home))
+    monkeypatch.delenv("XDG_CONFIG_HOME", raising=False)
+    monkeypatch.delenv("GIT_CONFIG_GLOBAL", raising=False)
+    monkeypatch.setenv("GIT_CONFIG_NOSYSTEM", "1")
+    return home
+
+
+def test_parse_git_config():
+    """Test parsing sections, subsections, quoting, escapes and comments."""
+    text = """
+# comment
+[User]
+    Name = "Jane  Doe"   ; trailing comment
+    email = jane@example.com # another
+[remote "origin"]
+    url = git@github.com:owner/repo.git
+[core]
+    bare
+    editor = vim \\
+        -u NONE
+    path = "C:\\\\tools\\\\bin"
+"""
+    entries = dict(parse_git_config(text))
+    assert entries["user.name"] == "Jane  Doe"
+    assert entries["user.email"] == "jane@example.com"
+    assert entries["remote.origin.url"] == "git@github.com:owner/repo.git"
+    assert entries["core.bare"] == "true"
+    assert entries["core.editor"] == "vim " + " " * 8 + "-u NONE"
+    assert entries["core.path"] == "C:\\tools\\bin"
+
+
+def test_parse_git_config_rejects_garbage():
+    """Test that malformed files raise GitConfigError."""
+    with pytest.raises(GitConfigError):
+        parse_git_config("name = outside")
+
+
+def test_discover_from_subdirectory(git_repo, isolated_home):
+    """Test walking up to the repository root and reading the identity."""
+    nested = git_repo / "a" / "b"
+    nested.mkdir(parents=True)
+
+    context = RepoContext.discover(nested)
+
+    assert context.root == git_repo.resolve()
+    assert context.git_dir == git_repo.resolve() / ".git"
+    assert context.user_name == "Test User"
+    assert context.user_email == "test@example.com"
+    assert not context.exotic
+
+
+def test_discover_global_identity_precedence(git_repo, isolated_home):
+    """Test that repository config overrides XDG and global config."""
+    (isolated_home / ".config" / "git").mkdir(parents=True)
+    (isolated_home / ".config" / "git" / "config").write_text("[user]\n name = Xdg\n email = x@x\n")
+    (isolated_home / ".gitconfig").write_text("[user]\n email = global@example.com\n")
+    subprocess.run(["git", "config", "--unset", "user.email"], cwd=git_repo, check=True)
+
+    context = RepoContext.discover(git_repo)
+
+    assert context.user_name == "Test User"
+    assert context.user_email == "global@example.com"
+
+
+def test_discover_linked_worktree(git_repo, isolated_home, tmp_path):
+    """Test following the .git file and commondir of a linked worktree."""
+    worktree = tmp_path / "wt"
+    subprocess.run(
+        ["git", "worktree", "add", "-q", "-b", "feature", str(worktree)],
+        cwd=git_repo,
+        check=True,
+    )
+
+    context = RepoContext.discover(worktree)
+
+    assert context.root == worktree.resolve()
+    assert context.git_dir == git_repo.resolve() / ".git" / "worktrees" / "wt"
+    assert context.common_dir == git_repo.resolve() / ".git"
+    assert context.user_name == "Test User"
+
+
+def test_discover_outside_repository(tmp_path, isolated_home):
+    """Test falling back to the start folder outside of git."""
+    context = RepoContext.discover(tmp_path)
+    assert context.root == tmp_path.resolve()
+    assert context.git_dir is None
+
+
+def test_discover_include_is_exotic(git_repo, isolated_home):
+    """Test that config includes defer identity lookups to git."""
+    (isolated_home / ".gitconfig").write_text("[include]\n path = other\n")
+    assert RepoContext.discover(git_repo).exotic
@@ -0,0 +1,128 @@
+"""Tests for search_index_py module."""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils.issue_manager_py import LocalFSIssueManager
+from utils.search_index_py import SearchIndex, make_snippet, tokenize
+
+
+def make_feature(specs, slug, body, docs):
+    manager = LocalFSIssueManager()
+    feature_id = asyncio.run(manager.create_issue(slug, slug.title(), specs, [], body))
+    folder = next(specs.glob(f"*-{slug}"))
+    for name, text in docs.items():
+        (folder / name).write_text(text)
+    return manager, feature_id, folder
+
+
+def test_tokenize():
+    """Test lowercasing, stopwords and one-letter tokens."""
+    assert tokenize("The Login-Page is a_b OK!") == ["login", "page", "ok"]
+
+
+def test_search_ranks_documents_and_issues(git_repo):
+    """Test that docs and issue bodies are searchable and ranked by relevance."""
+    specs = git_repo / "specs"
+    login_design = "# Login design\n\nPassword hashing with argon2. Password reset by email."
+    billing_design = "# Billing design\n\nInvoices are emailed; a password is never stored."
+    make_feature(
+        specs, "login", "Users log in with a password", {"high-level-design.md": login_design}
+    )
+    make_feature(specs, "billing", "Monthly invoices", {"high-level-design.md": billing_design})
+
+    index = SearchIndex(specs)
+    assert index.refresh() == 4
+
+    hits = index.search("password reset")
+    assert hits[0]["path"] == "00001-login/high-level-design.md"
+    assert hits[0]["title"] == "Login design"
+    assert "Password reset" in hits[0]["snippet"]
+    assert {hit["feature"] for hit in hits} == {"00001-login", "00002-billing"}
+
+    issue_hits = index.search("monthly invoices")
+    assert issue_hits[0] == {**issue_hits[0], "kind": "issue", "feature": "00002-billing"}
+    assert [h["feature"] for h in index.search("password", feature="00002-billing")] == [
+        "00002-billing"
+    ]
+    assert index.search("nonexistentword") == []
+
+
+def test_refresh_is_incremental(git_repo):
+    """Test that only changed documents are re-indexed and deletions are dropped."""
+    specs = git_repo / "specs"
+    manager, feature_id, folder = make_feature(
+        specs, "login", "Body", {"a.md": "alpha", "b.md": "beta"}
+    )
+    index = SearchIndex(specs)
+    index.refresh()
+    assert index.refresh() == 0
+
+    # Rewriting identical content only updates the stored signature
+    (folder / "a.md").write_text("alpha again")
+    (folder / "b.md").unlink()
+    asyncio.run(manager.update_issue(feature_id, folder.name, folder, [], "gamma comment"))
+    assert index.refresh() == 2
+
+    assert index.search("beta") == []
+    assert index.search("again")[0]["path"].endswith("a.md")
+    assert index.search("gamma")[0]["kind"] == "issue"
+
+    (folder / "a.md").write_text("alpha again")
+    assert index.refresh() == 0
+
+
+def test_make_snippet_centers_on_match():
+    """Test snippets start near the first matching term."""
+    text = "intro " * 100 + "the needle is here"
+    snippet = make_snippet(text, ["needle"])
+    assert snippet.startswith("…") and "needle is here" in snippet
+
+
+def test_common_term_shortcut_matches_full_scoring(git_repo, monkeypatch):
+    """Test that skipping the full scan for common terms does not change the ranking."""
+    from utils import search_index_py
+
+    specs = git_repo / "specs"
+    folder = specs / "00001-corpus"
+    folder.mkdir(parents=True)
+    for i in range(30):
+        rare = " invoice" * (i % 3 == 0) * (1 + i % 4)
+        (folder / f"doc{i}.md").write_text("system " * (1 + i % 5) + f"filler{i}" + rare)
+    index = SearchIndex(specs)
+    index.refresh()
+
+    shortcut = [h["path"] for h in index.search("system invoice", limit=3)]
+    monkeypatch.setattr(search_index_py, "COMMON_TERM_IDF", float("-inf"))
+    assert [h["path"] for h in index.search("system invoice", limit=3)] == shortcut
+
+
+def test_refresh_picks_up_documents_edited_in_place(git_repo):
+    """Test that a plain refresh re-reads edited files and a full one re-reads all."""
+    specs = git_repo / "specs"
+    manager, feature_id, folder = make_feature(specs, "login", "Body", {"a.md": "alpha"})
+    index = SearchIndex(specs)
+    assert index.refresh() == 2
+
+    (folder / "a.md").write_text("omega")
+    assert index.refresh() == 1
+    assert index.search("omega")[0]["path"] == "00001-login/a.md"
+
+    # An edit that keeps size and mtime is only seen when every document is re-read
+    stat = (folder / "a.md").stat()
+    (folder / "a.md").write_text("sigma")
+    os.utime(folder / "a.md", ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert index.refresh() == 0
+    assert index.refresh(full=True) == 1
+    assert index.search("sigma")[0]["path"] == "00001-login/a.md"
+
+    asyncio.run(manager.update_issue(feature_id, folder.name, folder, [], "delta comment"))
+    assert index.refresh() == 1
+    make_feature(specs, "billing", "Invoices", {})
+    assert index.refresh() == 1
+    assert index.search("invoices")[0]["feature"] == "00002-billing"
@@ -0,0 +1,89 @@
+"""Tests for specs_layout_py module."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils.issue_index_py import IssueIndex
+from utils.issue_manager_py import LocalFSIssueManager, load_issue
+from utils.specs_layout_py import (
+    feature_relpath,
+    get_specs_layout,
+    iter_feature_dirs,
+    locate_feature,
+    migrate_specs_layout,
+    resolve_feature_dir,
+    specs_dir_of,
+)
+
+
+def create(manager, specs, slug, feature_id=None):
+    return asyncio.run(manager.create_issue(slug, slug.title(), specs, [], "Body", feature_id))
+
+
+def test_feature_relpath_shards_by_id(monkeypatch):
+    """Test shard paths, wide IDs and the layout setting."""
+    assert feature_relpath("00042-x", "flat") == "00042-x"
+    assert feature_relpath("00042-x", "sharded") == "00/00/00042-x"
+    assert feature_relpath("12345-x", "sharded") == "01/23/12345-x"
+    assert feature_relpath("1234567-x", "sharded") == "123/45/1234567-x"
+    assert specs_dir_of(Path("specs/123/45/1234567-x")) == Path("specs")
+    assert specs_dir_of(Path("specs/00042-x")) == Path("specs")
+
+    monkeypatch.setenv("CWAI_SPECS_LAYOUT", "nested")
+    with pytest.raises(ValueError, match="flat, sharded"):
+        get_specs_layout()
+
+
+def test_sharded_layout_creates_updates_and_indexes(git_repo, monkeypatch):
+    """Test that the issue manager and index work the same on a sharded specs folder."""
+    monkeypatch.setenv("CWAI_SPECS_LAYOUT", "sharded")
+    specs = git_repo / "specs"
+    manager = LocalFSIssueManager()
+    create(manager, specs, "login")
+    index = IssueIndex(specs)
+    assert index.refresh() == 1
+
+    create(manager, specs, "wide", feature_id=123456)
+    feature_dir = resolve_feature_dir(specs, "123456-wide")
+    assert feature_dir == specs / "12/34/123456-wide"
+    asyncio.run(manager.update_issue(123456, "123456-wide", feature_dir, ["api"], "More"))
+
+    assert not index.is_stale()
+    assert [m["folder"] for m in index.query(["api"])] == ["12/34/123456-wide"]
+    assert locate_feature(specs, 1) == specs / "00/00/00001-login"
+    assert locate_feature(specs, 7) is None
+    assert create(manager, specs, "next") == 123457
+
+
+def test_migrate_specs_layout_round_trip(git_repo, monkeypatch):
+    """Test migrating flat folders to shards and back, keeping lookups working."""
+    specs = git_repo / "specs"
+    manager = LocalFSIssueManager()
+    for slug in ("one", "two"):
+        create(manager, specs, slug)
+    create(manager, specs, "far", feature_id=250)
+
+    assert migrate_specs_layout(specs, "sharded") == 3
+    assert sorted(relative for relative, _ in iter_feature_dirs(specs)) == [
+        "00/00/00001-one",
+        "00/00/00002-two",
+        "00/02/00250-far",
+    ]
+    # Still found while CWAI_SPECS_LAYOUT says flat
+    assert load_issue(resolve_feature_dir(specs, "00250-far"))["id"] == 250
+
+    monkeypatch.setenv("CWAI_SPECS_LAYOUT", "sharded")
+    assert create(manager, specs, "three") == 251
+    assert migrate_specs_layout(specs, "flat") == 4
+    assert sorted(p.name for p in specs.iterdir() if not p.name.startswith(".")) == [
+        "00001-one",
+        "00002-two",
+        "00250-far",
+        "00251-three",
+    ]
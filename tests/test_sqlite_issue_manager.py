@@ -0,0 +1,160 @@
+"""Tests for sqlite_issue_manager_py module."""
+
+import asyncio
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from commands.create_feature_py import create_features_batch
+from commands.export_plan_py import ExportJournal, export_plan
+from utils.duplicate_index_py import DuplicateIndex
+from utils.issue_index_py import IssueIndex
+from utils.issue_manager_py import (
+    COMMENTS_JOURNAL,
+    LocalFSIssueManager,
+    get_issue_manager,
+    load_issue,
+    patch_issue,
+)
+from utils.plan_py import load_plan
+from utils.search_index_py import SearchIndex
+from utils.sqlite_issue_manager_py import (
+    IssueStore,
+    SQLiteIssueManager,
+    export_localfs_issues,
+    import_localfs_issues,
+)
+
+
+def test_sqlite_manager_creates_and_updates(git_repo, monkeypatch):
+    """Test label merging, label removal and comments without any issue.json."""
+    monkeypatch.setenv("CWAI_SQLITE_SNAPSHOTS", "off")
+    manager = get_issue_manager("sqlite")
+    assert isinstance(manager, SQLiteIssueManager)
+    specs = git_repo / "specs"
+    feature_dir = specs / "00001-slug"
+
+    feature_id = asyncio.run(manager.create_issue("slug", "Title", specs, ["ui", "draft"], "Body"))
+    name = "00001-slug"
+    asyncio.run(manager.update_issue(feature_id, name, feature_dir, ["api"], f"{name} x"))
+    asyncio.run(manager.update_issue(feature_id, name, feature_dir, ["-draft"], "Second"))
+
+    assert feature_dir.is_dir() and not (feature_dir / "issue.json").exists()
+    issue = manager.store(specs).get(feature_id)
+    assert issue["labels"] == ["ui", "api"]
+    assert [c["comment"] for c in issue["comments"]] == ["x", "Second"]
+    assert issue["comments"][0]["author"] == "Test User <test@example.com>"
+    assert issue["updated_at"] == issue["comments"][-1]["created_at"]
+    with pytest.raises(LookupError):
+        asyncio.run(manager.update_issue(9, "00009-none", specs / "00009-none", [], "x"))
+
+
+def test_sqlite_manager_writes_snapshots(git_repo, monkeypatch):
+    """Test that snapshots are on by default and match what localfs would have written."""
+    monkeypatch.delenv("CWAI_SQLITE_SNAPSHOTS", raising=False)
+    manager = SQLiteIssueManager()
+    specs = git_repo / "specs"
+    feature_id = asyncio.run(manager.create_issue("slug", "Title", specs, ["ui"], "Body"))
+    asyncio.run(manager.update_issue(feature_id, "00001-slug", specs / "00001-slug", ["-ui"], "x"))
+
+    snapshot = json.loads((specs / "00001-slug/issue.json").read_text())
+    assert snapshot == manager.store(specs).get(feature_id)
+    assert snapshot["labels"] == [] and len(snapshot["comments"]) == 1
+
+
+def test_sqlite_manager_updates_issues_it_did_not_create(git_repo, monkeypatch):
+    """Test that localfs-created and pulled issue.json files are imported on update."""
+    monkeypatch.setenv("CWAI_SQLITE_SNAPSHOTS", "off")
+    specs = git_repo / "specs"
+    feature_dir = specs / "00001-one"
+    asyncio.run(LocalFSIssueManager().create_issue("one", "One", specs, ["ui"], "Body"))
+    asyncio.run(LocalFSIssueManager().update_issue(1, "00001-one", feature_dir, [], "Local"))
+    manager = SQLiteIssueManager()
+
+    asyncio.run(manager.update_issue(1, "00001-one", feature_dir, ["api"], "In sqlite"))
+    # A teammate's change arrives with a pull
+    pulled = json.loads((feature_dir / "issue.json").read_text())
+    pulled["plan"] = {"id": "E-1"}
+    (feature_dir / "issue.json").write_text(json.dumps(pulled))
+    asyncio.run(manager.update_issue(1, "00001-one", feature_dir, [], "Again"))
+
+    issue = load_issue(feature_dir)
+    assert issue == manager.store(specs).get(1)
+    assert [c["comment"] for c in issue["comments"]] == ["Local", "In sqlite", "Again"]
+    assert issue["labels"] == ["ui", "api"] and issue["plan"] == {"id": "E-1"}
+    assert not (feature_dir / COMMENTS_JOURNAL).exists()
+
+
+def test_import_and_export_localfs_issues(git_repo):
+    """Test that a localfs tree round-trips through the store, journals and extra fields too."""
+    specs = git_repo / "specs"
+    localfs = LocalFSIssueManager()
+    asyncio.run(localfs.create_issue("one", "One", specs, ["ui"], "Body"))
+    asyncio.run(localfs.update_issue(1, "00001-one", specs / "00001-one", ["api"], "Later"))
+    patch_issue(specs / "00001-one", {"plan": {"id": "E-1"}})
+    asyncio.run(localfs.create_issue("two", "Two", specs, [], "Body"))
+    before = load_issue(specs / "00001-one")
+
+    assert import_localfs_issues(specs) == 2
+    assert import_localfs_issues(specs) == 2
+    assert IssueStore(specs).count() == 2
+    assert IssueStore(specs).get(1) == before
+
+    manager = SQLiteIssueManager()
+    assert asyncio.run(manager.create_issue("three", "Three", specs, [], "Body")) == 3
+    asyncio.run(manager.update_issue(1, "00001-one", specs / "00001-one", [], "In sqlite"))
+
+    assert export_localfs_issues(specs) == 3
+    assert not (specs / "00001-one" / COMMENTS_JOURNAL).exists()
+    exported = load_issue(specs / "00001-one")
+    assert [c["comment"] for c in exported["comments"]] == ["Later", "In sqlite"]
+    assert exported["plan"] == {"id": "E-1"}
+    assert load_issue(specs / "00003-three")["title"] == "Three"
+
+
+def test_sqlite_issues_without_snapshots_work_everywhere(git_repo, tmp_path, monkeypatch, capsys):
+    """Test export-plan, updates and the indexes reading issues kept only in the store."""
+    monkeypatch.setenv("CWAI_ISSUE_MANAGER", "sqlite")
+    monkeypatch.setenv("CWAI_SQLITE_SNAPSHOTS", "off")
+    specs = git_repo / "specs"
+    plan_path = tmp_path / "login.plan.md"
+    plan_path.write_text(
+        "# Plan\n\n## EPIC E-1: Login page\n\n- Description: Let users sign in.\n\n"
+        "### Story S-1: Password reset\n\n- Description: Reset forgotten passwords.\n"
+    )
+    items = load_plan(plan_path)
+    manager = get_issue_manager("sqlite")
+    asyncio.run(export_plan(plan_path, items, specs, manager, 2, []))
+
+    assert not list(specs.glob("*/issue.json"))
+    assert load_issue(specs / "00002-password-reset")["plan"]["parent"] == 1
+    # A crash right after creating S-1 but before recording it
+    journal = ExportJournal(specs, plan_path)
+    lines = journal.path.read_text().splitlines()
+    journal.path.write_text("\n".join(lines[:-1]) + "\n")
+    results = asyncio.run(export_plan(plan_path, items, specs, manager, 2, []))
+    assert [r["status"] for r in results] == ["existing", "existing"]
+
+    # Plan export creates issues only; the update switches to the feature branch
+    subprocess.run(["git", "branch", "00002-password-reset"], cwd=git_repo, check=True)
+    lines = ['{"requirement": "Update 00002-password-reset with email links", "labels": "auth"}\n']
+    assert asyncio.run(create_features_batch(lines, concurrency=1)) == 0
+    assert json.loads(capsys.readouterr().out)["TITLE"] == "Password reset"
+
+    index = IssueIndex(specs)
+    assert index.refresh() == 2
+    assert [m["folder"] for m in index.query(["auth"])] == ["00002-password-reset"]
+    search = SearchIndex(specs)
+    search.refresh()
+    assert search.search("email links")[0]["path"] == "00002-password-reset/issue.json"
+    duplicates = DuplicateIndex(specs)
+    duplicates.db.executescript("DELETE FROM signatures; DELETE FROM buckets; DELETE FROM meta;")
+    assert duplicates.refresh() == 2
+    description = load_issue(specs / "00002-password-reset")["description"]
+    assert duplicates.find_duplicates(description)[0][0] == "00002-password-reset"
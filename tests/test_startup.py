@@ -0,0 +1,35 @@
+"""Tests for the cwai-create-feature import graph."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).parent.parent / "src"
+
+
+def loaded_modules(statement: str) -> set:
+    """Run statement in a fresh interpreter and return the top-level modules it loaded."""
+    code = (
+        f"import sys; sys.path.insert(0, {str(SRC)!r}); {statement}; "
+        "print('\\n'.join(sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return set(result.stdout.split())
+
+
+def test_create_feature_import_is_lazy():
+    """Test that rich, dotenv and the GitHub backend are not loaded at import time."""
+    modules = loaded_modules("import commands.create_feature_py")
+    assert "commands.create_feature_py" in modules
+    for lazy in ("rich", "dotenv", "questionary", "utils.github_issue_manager_py"):
+        assert lazy not in modules
+
+
+def test_github_manager_loads_on_demand():
+    """Test that the factory still provides the GitHub backend."""
+    modules = loaded_modules(
+        "from utils.issue_manager_py import GitHubIssueManager; import rich.console"
+    )
+    assert "utils.github_issue_manager_py" in modules
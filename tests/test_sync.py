@@ -0,0 +1,119 @@
+"""Tests for sync_py module."""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils.sync_py import MANIFEST_NAME, SyncStats, manifest_path, sync_files, sync_tree
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Keep manifests in a per-test cache."""
+    monkeypatch.setenv("CWAI_CACHE_DIR", str(tmp_path / "cache"))
+
+
+def write(path: Path, text: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return path
+
+
+def test_sync_tree_only_touches_what_changed(tmp_path):
+    """Test added/changed/removed/unchanged accounting and untouched mtimes."""
+    source, dest = tmp_path / "source", tmp_path / "dest"
+    write(source / "prompts" / "outline.md", "outline")
+    write(source / "templates" / "plan.md", "plan")
+    write(source / "templates" / "old.md", "old")
+
+    assert sync_tree(source, dest) == SyncStats(added=3)
+    assert (dest / "templates" / "plan.md").read_text() == "plan"
+    assert manifest_path(dest).exists()
+    assert not (dest / MANIFEST_NAME).exists()
+    before = os.stat(dest / "prompts" / "outline.md").st_mtime_ns
+
+    write(source / "templates" / "plan.md", "plan v2")
+    (source / "templates" / "old.md").unlink()
+    write(dest / "stray.md", "left behind by an older install")
+
+    assert sync_tree(source, dest) == SyncStats(changed=1, removed=2, unchanged=1)
+    assert (dest / "templates" / "plan.md").read_text() == "plan v2"
+    assert not (dest / "stray.md").exists()
+    assert os.stat(dest / "prompts" / "outline.md").st_mtime_ns == before
+
+    assert sync_tree(source, dest) == SyncStats(unchanged=2)
+
+
+def test_sync_files_restores_edits_and_keeps_foreign_files(tmp_path):
+    """Test that shared folders only lose files a previous sync installed."""
+    source, dest = tmp_path / "source", tmp_path / "prompts"
+    outline = write(source / "outline.md", "outline")
+    clarify = write(source / "clarify.md", "clarify")
+    write(dest / "mine.prompt.md", "user prompt")
+
+    files = [("outline.prompt.md", outline), ("clarify.prompt.md", clarify)]
+    assert sync_files(files, dest) == SyncStats(added=2)
+
+    write(dest / "outline.prompt.md", "edited by hand")
+    assert sync_files(files[:1], dest) == SyncStats(changed=1, removed=1)
+    assert (dest / "outline.prompt.md").read_text() == "outline"
+    assert (dest / "mine.prompt.md").exists()
+
+
+def test_existing_identical_files_are_adopted(tmp_path):
+    """Test that an install without a manifest does not rewrite identical files."""
+    source, dest = tmp_path / "source", tmp_path / "dest"
+    write(source / "plan.md", "plan")
+    write(dest / "plan.md", "plan")
+    before = os.stat(dest / "plan.md").st_mtime_ns
+
+    assert sync_tree(source, dest) == SyncStats(unchanged=1)
+    assert os.stat(dest / "plan.md").st_mtime_ns == before
+
+
+def test_hardlink_mode_shares_the_source_file(tmp_path):
+    """Test opt-in hardlinks, and that replacing them never writes through."""
+    source, dest = tmp_path / "source", tmp_path / "dest"
+    plan = write(source / "plan.md", "plan")
+
+    sync_tree(source, dest, link_mode="hardlink")
+    assert os.stat(dest / "plan.md").st_ino == os.stat(plan).st_ino
+
+    write(dest / "plan.md.new", "x").rename(dest / "plan.md")
+    sync_tree(source, dest, link_mode="hardlink")
+    assert plan.read_text() == "plan"
+
+
+def test_manifest_in_destination_is_migrated(tmp_path):
+    """Test that a manifest an older version wrote into dest is read and removed."""
+    source, dest = tmp_path / "source", tmp_path / "prompts"
+    outline = write(source / "outline.md", "outline")
+    clarify = write(source / "clarify.md", "clarify")
+    files = [("outline.prompt.md", outline), ("clarify.prompt.md", clarify)]
+    sync_files(files, dest)
+    manifest_path(dest).rename(dest / MANIFEST_NAME)
+
+    assert sync_files(files[:1], dest) == SyncStats(removed=1, unchanged=1)
+    assert not (dest / MANIFEST_NAME).exists()
+    assert manifest_path(dest).exists()
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX permissions")
+def test_hardlinks_are_read_only(tmp_path):
+    """Test that an installed hardlink cannot be edited into the cache."""
+    source, dest = tmp_path / "source", tmp_path / "dest"
+    plan = write(source / "plan.md", "plan")
+
+    sync_tree(source, dest, link_mode="hardlink")
+    assert os.path.samefile(dest / "plan.md", plan)
+    assert not os.access(dest / "plan.md", os.W_OK) or os.geteuid() == 0
+    assert not os.stat(plan).st_mode & 0o222
+
+    # Copies made from a read-only cache stay editable
+    sync_tree(source, tmp_path / "copy", link_mode="copy")
+    assert os.stat(tmp_path / "copy" / "plan.md").st_mode & 0o200
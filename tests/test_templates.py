@@ -0,0 +1,78 @@
+"""Tests for templates_py module."""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from commands.create_feature_py import copy_templates, create_feature_command_async
+from utils.templates_py import CompiledTemplate, TemplateRegistry
+
+
+def test_render_fills_known_variables_only():
+    """Test substitution, missing values and unknown placeholders."""
+    template = CompiledTemplate(
+        Path("t.md"), "# {{TITLE}} ({{ ISSUE_NUMBER }}) {{OWNER}} {{DATE}}", (0, 0)
+    )
+    assert template.render({"TITLE": "Login", "ISSUE_NUMBER": "7"}) == (
+        "# Login (7) {{OWNER}} {{DATE}}"
+    )
+
+
+def test_registry_follows_template_changes(tmp_path):
+    """Test lookups by name with and without .md, and reloading edited templates."""
+    (tmp_path / "prd.md").write_text("v1 {{TITLE}}")
+    registry = TemplateRegistry(tmp_path)
+    assert registry.get("prd") is registry.get("prd.md")
+    assert registry.get("missing") is None
+
+    (tmp_path / "prd.md").write_text("version 2 {{TITLE}}")
+    os.utime(tmp_path / "prd.md", ns=(1, 1))
+    assert registry.get("prd").render({"TITLE": "x"}) == "version 2 x"
+
+    (tmp_path / "hld.md").write_text("hld")
+    os.utime(tmp_path, ns=(2, 2))
+    assert registry.names() == ["hld.md", "prd.md"]
+
+
+def test_copy_templates_renders_and_never_overwrites(tmp_path):
+    """Test that existing files in the feature folder are kept."""
+    templates = tmp_path / ".cwai" / "templates" / "outline"
+    templates.mkdir(parents=True)
+    (templates / "prd.md").write_text("# {{TITLE}}\n")
+    (templates / "hld.md").write_text("# HLD {{ISSUE_NUMBER}}\n")
+    feature_dir = tmp_path / "specs" / "00001-login"
+    feature_dir.mkdir(parents=True)
+    (feature_dir / "hld.md").write_text("edited\n")
+
+    copied = asyncio.run(
+        copy_templates(feature_dir, ["prd", "hld", "nope"], tmp_path, {"TITLE": "Login"})
+    )
+    assert copied == "prd.md"
+    assert (feature_dir / "prd.md").read_text() == "# Login\n"
+    assert (feature_dir / "hld.md").read_text() == "edited\n"
+
+
+def test_create_feature_prefills_shipped_templates(git_repo, capsys):
+    """Test the bundled outline templates are rendered with the feature's details."""
+    repo_templates = Path(__file__).parent.parent / ".cwai" / "templates" / "outline"
+    target = git_repo / ".cwai" / "templates" / "outline"
+    target.mkdir(parents=True)
+    for name in ("product-requirement.md", "specs-document.md"):
+        (target / name).write_text((repo_templates / name).read_text())
+
+    asyncio.run(
+        create_feature_command_async(
+            "Add a login page", True, "Login", ["product-requirement", "specs-document"], []
+        )
+    )
+    feature_dir = git_repo / "specs" / "00001-login"
+    prd = (feature_dir / "product-requirement.md").read_text()
+    assert prd.startswith("# Product Requirements Document (PRD): Login\n")
+    assert "**PRD ID**: PRD-1 • **Feature**: `00001-login`" in prd
+    spec = (feature_dir / "specs-document.md").read_text()
+    assert "> Add a login page" in spec
+    assert "{{" not in prd + spec